@@ -0,0 +1,237 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pygame
+
+import jobs
+import perf
+from entities import CARD_SIZE, card_image_path, decode_card
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 크기 조절까지 끝난 픽셀 데이터를 저장해 두는 곳 (다음 실행에서는 PNG 를 풀지 않고 바로 읽음)
+CACHE_DIR = os.path.join(".cache", "sprites")
+# 저장 형식이 바뀌면 올립니다. (예전 캐시 파일은 자동으로 무시/정리됨)
+CACHE_VERSION = 1
+_HEADER = struct.Struct("<4sHII")   # 매직, 버전, 가로, 세로
+_MAGIC = b"DHSP"
+
+SCREEN_SIZE = (1280, 720)
+MAP_ICON_SIZE = (60, 60)
+BATTLE_MONSTER_SIZE = (300, 300)
+
+# ==========================================
+# 2. 에셋 목록 (Manifest)
+# ==========================================
+class Sprite(NamedTuple):
+    path: str
+    size: Optional[Tuple[int, int]]   # None 이면 원본 크기
+
+# 🌟 맵(월드) 번호별 배경, 몬스터 아이콘
+MAP_BACKGROUNDS = {
+    "1": "assets/map_bg01.png",
+    "2": "assets/map_bg02.png",
+}
+
+# 💡 [핵심] 노드 코드("11", "12")와 그에 맞는 파일 이름을 짝지어 줍니다.
+MONSTER_ICONS = {
+    "1": {
+        "11": "assets/monster_icon1-1.png",
+        "12": "assets/monster_icon1-2.png"
+        # 나중에 1-3 몬스터가 생기면 여기에 "13": "assets/..." 한 줄만 추가하면 끝납니다!
+    },
+    # 2번 맵에 해당하는 몬스터 이미지가 있다면 여기에 추가
+}
+
+# 전투 몬스터 그림이 있는 스테이지 (map.MAP_NODES 의 노드 코드)
+BATTLE_STAGES = ["11", "12", "13", "21", "22", "23"]
+BATTLE_BACKGROUND = "assets/battlemap_01.png"
+
+def battle_monster_path(stage_code) -> str:
+    # stage_code(예: "11")를 이용해서 파일 이름("assets/monster1-1.png")을 만듭니다.
+    return f"assets/monster{str(stage_code)[0]}-{str(stage_code)[1]}.png"
+
+def build_manifest() -> Dict[str, Sprite]:
+    """이름 -> Sprite(경로, 크기). 게임에서 쓰는 모든 이미지가 여기 있습니다."""
+    manifest = {
+        "ui/background": Sprite("assets/DH_bg.png", SCREEN_SIZE),   # 로그인 / 회원가입
+        "battle/background": Sprite(BATTLE_BACKGROUND, SCREEN_SIZE),
+    }
+    for world, path in MAP_BACKGROUNDS.items():
+        manifest[f"map/background/{world}"] = Sprite(path, SCREEN_SIZE)
+    for icons in MONSTER_ICONS.values():
+        for code, path in icons.items():
+            manifest[f"map/icon/{code}"] = Sprite(path, MAP_ICON_SIZE)
+    for code in BATTLE_STAGES:
+        manifest[f"battle/monster/{code}"] = Sprite(battle_monster_path(code), BATTLE_MONSTER_SIZE)
+    for code in range(52):
+        manifest[f"card/{code}"] = Sprite(card_image_path(*decode_card(code)), CARD_SIZE)
+    return manifest
+
+MANIFEST = build_manifest()
+
+def battle_sprites(stage_code) -> List[Sprite]:
+    """스테이지 전투에 쓰는 [배경, 몬스터]"""
+    return [MANIFEST["battle/background"],
+            MANIFEST.get(f"battle/monster/{stage_code}") or Sprite(battle_monster_path(stage_code), BATTLE_MONSTER_SIZE)]
+
+# ==========================================
+# 3. 크기 조절된 이미지 캐시 (메모리 + 디스크)
+# ==========================================
+class SpriteCache:
+    """
+    (경로, 크기) -> 크기 조절이 끝난 이미지.
+    - 메모리: 한 번 불러온 건 프로세스 안에서 다시 읽지 않음
+    - 디스크: 크기 조절된 RGBA 픽셀을 CACHE_DIR 에 저장. 파일 이름에 원본의 수정 시각/크기가 들어가서
+      PNG 가 바뀌면 자동으로 다시 만듭니다.
+    convert_alpha 전의 이미지를 돌려주므로 백그라운드 스레드에서 불러도 됩니다. (변환은 AssetContext 가 화면 스레드에서)
+    """
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.stats = {"memory": 0, "disk": 0, "decode": 0, "missing": 0}
+        self.timings = {"disk": 0.0, "decode": 0.0}   # 디스크 캐시 / PNG 읽기에 쓴 시간 합 (ms)
+        self._loaded: Dict[Sprite, Optional[pygame.Surface]] = {}
+        self._loading: Dict[Sprite, threading.Event] = {}   # 다른 스레드가 지금 읽고 있는 것 (같은 PNG 를 두 번 풀지 않음)
+        self._lock = threading.Lock()
+        self._preload_job = None
+
+    def _cache_file(self, sprite: Sprite) -> Optional[str]:
+        try:
+            st = os.stat(sprite.path)
+        except OSError:
+            return None
+        key = f"{CACHE_VERSION}|{sprite.path}|{sprite.size}|{st.st_mtime_ns}|{st.st_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".rgba")
+
+    def _read_cache(self, cache_file: str) -> Optional[pygame.Surface]:
+        try:
+            with open(cache_file, "rb") as f:
+                magic, version, width, height = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or version != CACHE_VERSION:
+                    return None
+                return pygame.image.frombytes(f.read(), (width, height), "RGBA")
+        except (OSError, struct.error, ValueError):
+            return None
+
+    def _write_cache(self, cache_file: str, image: pygame.Surface):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_file}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, CACHE_VERSION, *image.get_size()))
+                f.write(pygame.image.tobytes(image, "RGBA"))
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            print(f"⚠️ 이미지 캐시 저장 실패: {e}")
+
+    def load(self, path: str, size=None, quiet: bool = False) -> Optional[pygame.Surface]:
+        """크기 조절된 이미지 (메모리 -> 디스크 캐시 -> PNG 순서로 찾음). 실패하면 None (quiet 면 경고 없이)"""
+        sprite = Sprite(path, tuple(size) if size else None)
+        with self._lock:
+            if sprite in self._loaded:
+                self.stats["memory"] += 1
+                return self._loaded[sprite]
+            loading = self._loading.get(sprite)
+            if loading is None:
+                self._loading[sprite] = threading.Event()
+        if loading is not None:
+            # 미리 불러오기(preload)가 읽고 있는 중이면 끝나기를 기다렸다가 같은 결과를 씁니다.
+            loading.wait()
+            with self._lock:
+                self.stats["memory"] += 1
+                return self._loaded.get(sprite)
+
+        start = time.perf_counter()
+        try:
+            cache_file = self._cache_file(sprite)
+            image = self._read_cache(cache_file) if cache_file and os.path.exists(cache_file) else None
+            source = "disk"
+            if image is None:
+                source = "decode"
+                image = pygame.image.load(path)
+                if sprite.size:
+                    image = pygame.transform.scale(image, sprite.size)
+                if cache_file:
+                    self._write_cache(cache_file, image)
+        except Exception as e:
+            if not quiet:
+                print(f"⚠️ 이미지 로드 실패 ({path}): {e}")
+            image, source = None, "missing"
+
+        elapsed = (time.perf_counter() - start) * 1000
+        if source != "missing":
+            perf.record_io("asset", elapsed)
+        with self._lock:
+            self.stats[source] += 1
+            if source in self.timings:
+                self.timings[source] += elapsed
+            self._loaded[sprite] = image
+            self._loading.pop(sprite).set()
+        return image
+
+    def preload(self, sprites: Iterable[Sprite] = None) -> float:
+        """(백그라운드 스레드에서 실행) 목록의 이미지를 전부 불러 둡니다. 걸린 시간(ms) 반환"""
+        start = time.perf_counter()
+        everything = sprites is None
+        missing = [sprite.path for sprite in (MANIFEST.values() if everything else sprites)
+                   if self.load(*sprite, quiet=True) is None]
+        if missing:
+            print(f"⚠️ 불러오지 못한 이미지 {len(missing)}개 (예: {missing[0]})")
+        if everything:
+            self.prune()
+        return (time.perf_counter() - start) * 1000
+
+    def preload_async(self):
+        """로그인 화면이 떠 있는 동안 manifest 전체를 백그라운드에서 불러 둡니다. (한 번만)"""
+        if self._preload_job is None:
+            self._preload_job = jobs.submit(self.preload, name="asset_preload", timeout=None)
+        return self._preload_job
+
+    def prune(self):
+        """지금 manifest 에 해당하지 않는 (원본이 바뀌었거나 버전이 다른) 캐시 파일을 지웁니다."""
+        keep = {os.path.basename(f) for f in map(self._cache_file, MANIFEST.values()) if f}
+        try:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".rgba") and name not in keep:
+                    os.remove(os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._loaded.clear()
+
+# 게임 전체가 같이 쓰는 이미지 캐시
+sprites = SpriteCache()
+
+def load(path: str, size=None) -> Optional[pygame.Surface]:
+    return sprites.load(path, size)
+
+def preload_async():
+    return sprites.preload_async()
+
+# ==========================================
+# 4. 실행 테스트 코드 (처음 실행 / 캐시가 있을 때 시작 시간)
+# ==========================================
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+
+    cache_dir = tempfile.mkdtemp(prefix="dh_sprites_")
+    try:
+        print(f"=== 🖼️ 에셋 {len(MANIFEST)}개 불러오기 ===")
+        for label in ("처음 실행 (PNG 풀고 크기 조절)", "다음 실행 (디스크 캐시)"):
+            cache = SpriteCache(cache_dir)   # 새 프로세스처럼 메모리는 비운 상태
+            elapsed = cache.preload()
+            print(f" - {label}: {elapsed:.0f}ms | {cache.stats}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
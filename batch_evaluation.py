@@ -0,0 +1,175 @@
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from entities import Card
+from evaluation import HAND_NAMES, HAND_SCORES, HAND_IDS
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 족보 번호(HAND_IDS) -> 점수
+HAND_SCORE_ARRAY = np.array([HAND_SCORES[name] for name in HAND_NAMES], dtype=np.int32)
+
+# 한 번에 처리할 최대 패 수 (메모리 사용량 제한용)
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# ==========================================
+# 2. 인코딩 도우미
+# ==========================================
+def encode_hands(hands: List[List[Card]]) -> np.ndarray:
+    """Card 5장짜리 손패 리스트 -> (N, 5) 정수 배열 (entities.encode_card 규칙)"""
+    return np.array([[card.code for card in hand] for hand in hands], dtype=np.uint8).reshape(-1, 5)
+
+def random_hands(count: int, seed=None) -> np.ndarray:
+    """52장 중 중복 없이 5장씩 뽑은 랜덤 패 count개 -> (count, 5) 배열"""
+    rng = np.random.default_rng(seed)
+    hands = np.empty((count, 5), dtype=np.uint8)
+    for start in range(0, count, DEFAULT_CHUNK_SIZE):
+        stop = min(start + DEFAULT_CHUNK_SIZE, count)
+        # 카드마다 난수를 하나씩 붙이고 가장 작은 5개를 고르면 중복 없는 5장이 됩니다.
+        keys = rng.random((stop - start, 52), dtype=np.float32)
+        hands[start:stop] = np.argpartition(keys, 5, axis=1)[:, :5]
+    return hands
+
+# ==========================================
+# 3. 배치 족보 판정
+# ==========================================
+def _evaluate_chunk(codes: np.ndarray) -> np.ndarray:
+    count = len(codes)
+    ranks = codes // 4  # 0~12 (12 = 파워 13, 즉 '0'을 가장 높은 숫자로 보는 규칙이 인코딩에 이미 반영됨)
+    suits = codes % 4
+
+    # 1. 숫자 히스토그램 (패마다 13칸) - bincount 한 번으로 계산
+    flat = ranks.astype(np.int64) + 13 * np.arange(count, dtype=np.int64)[:, None]
+    hist = np.bincount(flat.ravel(), minlength=13 * count).reshape(count, 13)
+    sorted_counts = np.sort(hist, axis=1)
+    top = sorted_counts[:, -1]      # 가장 많이 나온 숫자의 개수
+    second = sorted_counts[:, -2]   # 두 번째로 많이 나온 숫자의 개수
+
+    # 2. 플러시(Type Set), 스트레이트(Sequence)
+    flush = (suits == suits[:, :1]).all(axis=1)
+    max_rank = ranks.max(axis=1)
+    distinct = (hist > 0).sum(axis=1)
+    sequence = (distinct == 5) & (max_rank - ranks.min(axis=1) == 4)
+
+    # 3. 족보 판별 (evaluation.classify_hand 와 같은 우선순위)
+    conditions = [
+        flush & sequence & (max_rank == 12),   # Serious Punch
+        flush & sequence,                      # Type and sequence
+        (top == 3) & (second == 2),            # Triple and Couple
+        flush,                                 # Type Set
+        sequence,                              # Sequence
+        (top == 4) & (second == 1),            # Family
+        (top == 3) & (second == 1),            # Triple
+        (top == 2) & (second == 2),            # Couple Set
+        (top == 2) & (second == 1),            # Couple
+    ]
+    choices = [HAND_IDS[name] for name in HAND_NAMES[:len(conditions)]]
+    return np.select(conditions, choices, default=HAND_IDS["Solo"]).astype(np.int8)
+
+def evaluate_batch(codes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (N, 5) 정수 배열(카드 code)을 받아 (족보 번호 배열, 점수 배열)을 반환합니다.
+    족보 번호는 evaluation.HAND_IDS / HAND_NAMES 와 같습니다.
+    """
+    codes = np.asarray(codes)
+    if codes.ndim != 2 or codes.shape[1] != 5:
+        raise ValueError(f"(N, 5) 모양의 배열이 필요합니다. (받은 모양: {codes.shape})")
+
+    hand_ids = np.empty(len(codes), dtype=np.int8)
+    for start in range(0, len(codes), chunk_size):
+        hand_ids[start:start + chunk_size] = _evaluate_chunk(codes[start:start + chunk_size])
+    return hand_ids, HAND_SCORE_ARRAY[hand_ids]
+
+# ==========================================
+# 4. 손패 전체(8장 이상)의 최고 점수 배치 계산
+# ==========================================
+# evaluation.best_score_of_suits 의 배열 버전: 문양별 13비트 숫자 마스크 배열 4개 -> 최고 족보 점수 배열
+POPCOUNT_13 = np.array([bin(i).count("1") for i in range(1 << 13)], dtype=np.int8)
+STRAIGHT_TOP_BIT = 1 << 8
+
+def _straight_starts(m: np.ndarray) -> np.ndarray:
+    return m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4)
+
+# 13비트 숫자 마스크 -> 연속 5개 여부 (비트 0: 연속 있음, 비트 1: 9~13 연속 있음). 시프트 연산 대신 표 한 번 찾기
+_starts_13 = _straight_starts(np.arange(1 << 13))
+STRAIGHT_13 = ((_starts_13 != 0).astype(np.int8) | ((_starts_13 & STRAIGHT_TOP_BIT) != 0).astype(np.int8) * 2)
+
+def best_score_of_suits_batch(s0, s1, s2, s3) -> np.ndarray:
+    """같은 모양의 정수 배열 4개(문양별 숫자 마스크) -> 최고 족보 점수 배열"""
+    suits = [np.asarray(s, dtype=np.int32) for s in (s0, s1, s2, s3)]
+    counts = [POPCOUNT_13[s] for s in suits]
+    total = counts[0] + counts[1] + counts[2] + counts[3]
+
+    # 1. 스티플 / 플러시
+    flush = np.zeros(total.shape, dtype=bool)
+    sequence_flush = np.zeros(total.shape, dtype=bool)
+    serious = np.zeros(total.shape, dtype=bool)
+    for s, count in zip(suits, counts):
+        straight = STRAIGHT_13[s]
+        flush |= count >= 5
+        sequence_flush |= straight != 0
+        serious |= straight >= 2
+
+    # 2. 같은 숫자 개수 (2장 이상 / 3장 이상 / 4장)
+    a, b, c, d = suits
+    pairs = (a & b) | (a & c) | (a & d) | (b & c) | (b & d) | (c & d)
+    trips = (a & b & c) | (a & b & d) | (a & c & d) | (b & c & d)
+    pair_count = POPCOUNT_13[pairs]
+
+    conditions = [
+        serious,                                # Serious Punch
+        sequence_flush,                         # Type and sequence
+        (trips != 0) & (pair_count >= 2),       # Triple and Couple
+        flush,                                  # Type Set
+        STRAIGHT_13[a | b | c | d] != 0,        # Sequence
+        (a & b & c & d) != 0,                   # Family
+        trips != 0,                             # Triple
+        pair_count >= 2,                        # Couple Set
+        pairs != 0,                             # Couple
+    ]
+    scores = np.select(conditions, HAND_SCORE_ARRAY[:len(conditions)], default=HAND_SCORES["Solo"])
+    scores[total < 5] = HAND_SCORES["Solo"]
+    return scores
+
+# ==========================================
+# 5. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    from evaluation import SAMPLE_HANDS, best_score_of_suits, evaluate_codes, evaluate_hand, suit_masks
+
+    print("=== 🧮 배치 족보 판정 테스트 ===")
+
+    # 1. evaluation.py 테스트 케이스와 결과가 완전히 같은지 확인
+    sample_hands = [[Card(value, suit) for value, suit in cards] for _, cards in SAMPLE_HANDS]
+    ids, scores = evaluate_batch(encode_hands(sample_hands))
+    success_cnt = 0
+    for hand, hand_id, score in zip(sample_hands, ids, scores):
+        expected = evaluate_hand(hand)
+        if (HAND_NAMES[hand_id], int(score)) == expected:
+            success_cnt += 1
+        else:
+            print(f"❌ [실패] {expected} != {(HAND_NAMES[hand_id], int(score))} | 패: {hand}")
+    print(f"테스트 케이스 {len(sample_hands)}개 중 {success_cnt}개 일치")
+
+    # 2. 랜덤 패로 룩업 테이블 판정과 교차 검증
+    check = random_hands(100_000, seed=0)
+    ids, scores = evaluate_batch(check)
+    mismatch = sum(HAND_NAMES[hand_id] != evaluate_codes(row.tolist())[0] for row, hand_id in zip(check, ids))
+    print(f"랜덤 100000패 교차 검증: 불일치 {mismatch}개")
+
+    # 3. 손패 전체 최고 점수가 evaluation.best_score_of_suits 와 같은지 확인
+    many = [suit_masks(random.sample(range(52), random.randint(5, 10))) for _ in range(50_000)]
+    batch_scores = best_score_of_suits_batch(*np.array(many).T)
+    mismatch = sum(int(score) != best_score_of_suits(*masks) for masks, score in zip(many, batch_scores))
+    print(f"랜덤 50000손패 최고 점수 교차 검증: 불일치 {mismatch}개")
+
+    # 4. 처리 속도
+    big = random_hands(2_000_000, seed=1)
+    start = time.perf_counter()
+    evaluate_batch(big)
+    elapsed = time.perf_counter() - start
+    print(f"200만 패 판정: {elapsed:.2f}초 ({len(big) / elapsed:,.0f} 패/초)")
@@ -0,0 +1,178 @@
+import pygame
+
+from card_atlas import get_card_atlas
+from entities import card_code
+from text_cache import blit_number, get_font
+
+# ==========================================
+# 1. 배틀 화면 배치
+# ==========================================
+SCREEN_SIZE = (1280, 720)
+BG_FALLBACK_COLOR = (50, 20, 20)
+
+# 몬스터 기준 좌표 (가로 중앙쯤 (1280 - 300) / 2, 위에서 살짝 떨어진 위치)
+MONSTER_POS = (490, 120)
+MONSTER_SIZE = (300, 300)
+STAT_OFFSET_Y = 250  # 몬스터 이미지 높이(300)보다 살짝 위쪽
+
+# 손패 배치 (그리기와 호버 판정이 같은 값을 씁니다)
+CARD_WIDTH = 100
+CARD_HEIGHT = 150
+CARD_SPACING = 20
+HAND_BASE_Y = 520
+HOVER_LIFT = 30
+
+def get_card_rects(hand_count: int):
+    """손패 카드들이 놓일 자리 (올라가기 전 위치)"""
+    total_width = hand_count * CARD_WIDTH + (hand_count - 1) * CARD_SPACING
+    start_x = (SCREEN_SIZE[0] - total_width) // 2
+    return [pygame.Rect(start_x + i * (CARD_WIDTH + CARD_SPACING), HAND_BASE_Y, CARD_WIDTH, CARD_HEIGHT)
+            for i in range(hand_count)]
+
+def get_slot_rect(card_rect: pygame.Rect) -> pygame.Rect:
+    """카드 한 장이 차지할 수 있는 전체 영역 (올라간 위치 + 노란 테두리까지)"""
+    return pygame.Rect(card_rect.x - 2, card_rect.y - HOVER_LIFT - 2, card_rect.w + 4, card_rect.h + HOVER_LIFT + 4)
+
+def get_hovered_index(card_rects, pos):
+    """마우스가 올라가 있는 카드 번호 (없으면 None)"""
+    for i, card_rect in enumerate(card_rects):
+        if card_rect.collidepoint(pos):
+            return i
+    return None
+
+def build_static_layer(size, bg_image=None, monster_image=None) -> pygame.Surface:
+    """배경 + 몬스터를 미리 합쳐 둔 한 장짜리 Surface"""
+    layer = pygame.Surface(size).convert()
+    if bg_image:
+        layer.blit(bg_image, (0, 0))
+    else:
+        layer.fill(BG_FALLBACK_COLOR)
+    if monster_image:
+        layer.blit(monster_image, MONSTER_POS)
+    return layer
+
+# ==========================================
+# 2. 바뀐 부분만 다시 그리는 렌더러 (Dirty Rect)
+# ==========================================
+class BattleRenderer:
+    """
+    배경 + 몬스터는 한 장의 정적 레이어로 미리 합쳐 두고,
+    지난 프레임과 달라진 영역(카드 슬롯, 스탯 글씨)만 정적 레이어로 지운 뒤 다시 그립니다.
+    카드는 카드 아틀라스(card_atlas.py)의 조각이라, 지우기 + 손패 그리기가 screen.blits() 한 번입니다.
+    render() 가 돌려주는 rect 목록을 pygame.display.update(rects) 로 넘기면 됩니다.
+    """
+    def __init__(self, screen, bg_image=None, monster_image=None, stat_font=None, static_layer=None):
+        self.screen = screen
+        self.monster_image = monster_image
+        self.stat_font = stat_font or get_font(35, bold=True)
+        self.atlas = get_card_atlas((CARD_WIDTH, CARD_HEIGHT))
+        # 같은 스테이지를 다시 열 때는 만들어 둔 정적 레이어를 넘겨받아 그대로 씁니다.
+        self.static_layer = static_layer or build_static_layer(screen.get_size(), bg_image, monster_image)
+
+        self._slots = None      # 지난 프레임의 카드 슬롯 상태 [(card code, 올라감 여부, 선택 여부), ...]
+        self._stats = None      # 지난 프레임의 (공격력, 체력)
+        self._stat_rects = []   # 지난 프레임에 스탯 글씨가 차지한 영역
+
+    def invalidate(self):
+        """다음 render() 때 화면 전체를 다시 그립니다. (다른 화면에서 돌아왔을 때 등)"""
+        self._slots = None
+        self._stats = None
+
+    def _restore(self, rect: pygame.Rect):
+        """해당 영역을 정적 레이어(배경 + 몬스터)로 되돌립니다."""
+        self.screen.blit(self.static_layer, rect.topleft, rect)
+
+    # ------------------------------------------
+    # 스탯 (공격력, 체력)
+    # ------------------------------------------
+    def _draw_stats(self, monster: dict):
+        monster_x, monster_y = MONSTER_POS
+        stat_y = monster_y + STAT_OFFSET_Y
+        # 숫자는 아틀라스에서 글자 조각만 이어 붙입니다. (HP가 바뀌어도 font.render 없음)
+        return [
+            blit_number(self.screen, self.stat_font, f" {monster['attack']}", (255, 80, 80), (monster_x, stat_y)),
+            blit_number(self.screen, self.stat_font, monster["hp"], (80, 255, 80),
+                        (monster_x + MONSTER_SIZE[0], stat_y), align="right"),  # 오른쪽 끝에 딱 맞추기
+        ]
+
+    # ------------------------------------------
+    # 손패
+    # ------------------------------------------
+    def _card_blits(self, card, card_rect: pygame.Rect, slot) -> list:
+        _, lifted, highlighted = slot
+        return self.atlas.card_blits(card, card_rect.topleft, lifted, highlighted, HOVER_LIFT)
+
+    def render(self, hand, hovered_index, monster: dict, selected=()):
+        """
+        지난 프레임과 비교해서 바뀐 곳만 그리고, 화면에 내보낼 rect 목록을 반환합니다.
+        (첫 프레임이나 손패 장수가 바뀌면 전체 화면 1개)
+        selected 에 있는 카드 번호는 선택 표시(반투명 덮개)를 씌웁니다.
+        hand 는 Card 리스트, code 리스트, Player(compact=True) 의 array('B') 모두 됩니다.
+        """
+        card_rects = get_card_rects(len(hand))
+        slots = [(card_code(card), i == hovered_index, i in selected) for i, card in enumerate(hand)]
+        stats = (monster["attack"], monster["hp"]) if self.monster_image else None
+
+        # [A] 전체 다시 그리기
+        if self._slots is None or len(slots) != len(self._slots):
+            self.screen.blit(self.static_layer, (0, 0))
+            self._stat_rects = self._draw_stats(monster) if stats else []
+            pieces = []
+            for card, card_rect, slot in zip(hand, card_rects, slots):
+                pieces += self._card_blits(card, card_rect, slot)
+            self.screen.blits(pieces, doreturn=False)
+            self._slots, self._stats = slots, stats
+            return [self.screen.get_rect()]
+
+        dirty = []
+
+        # [B] 스탯 글씨가 바뀌었으면 예전 글씨 자리를 지우고 새로 씀
+        if stats != self._stats:
+            for rect in self._stat_rects:
+                self._restore(rect)
+            dirty.extend(self._stat_rects)
+            self._stat_rects = self._draw_stats(monster) if stats else []
+            dirty.extend(self._stat_rects)
+            self._stats = stats
+
+        # [C] 카드 슬롯: 카드가 바뀌었거나 올라감/선택이 바뀐 슬롯만 (정적 레이어로 지우기 + 카드 조각)
+        pieces = []
+        for card, card_rect, slot, old_slot in zip(hand, card_rects, slots, self._slots):
+            if slot == old_slot:
+                continue
+            slot_rect = get_slot_rect(card_rect)
+            pieces.append((self.static_layer, slot_rect.topleft, slot_rect))
+            pieces += self._card_blits(card, card_rect, slot)
+            dirty.append(slot_rect)
+        if pieces:
+            self.screen.blits(pieces, doreturn=False)
+        self._slots = slots
+        return dirty
+
+# ==========================================
+# 3. 실행 테스트 코드 (Card 손패 vs compact 손패)
+# ==========================================
+if __name__ == "__main__":
+    import os
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    from entities import Deck, Player
+
+    monster = {"attack": 12, "hp": 80}
+    cards = Deck(seed=3).draw(8)
+    compact = Player(compact=True)
+    compact.hand.extend(card.code for card in cards)  # 같은 카드를 code 배열로
+
+    frames = []
+    for hand in (cards, compact.hand):
+        renderer = BattleRenderer(screen)
+        full = renderer.render(hand, None, monster)
+        dirty = renderer.render(hand, 2, monster, selected=(5,))
+        frames.append(pygame.image.tobytes(screen, "RGB"))
+        print(f" - {type(hand).__name__:5s} 손패: 첫 프레임 {len(full)}개 / 호버+선택 {len(dirty)}개 rect")
+
+    assert frames[0] == frames[1], "compact 손패가 Card 손패와 다르게 그려졌습니다"
+    print("✅ compact 손패도 Card 손패와 똑같이 그려집니다!")
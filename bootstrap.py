@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import db
+import map
+import monster_cache
+from entities import Insignia, Player
+from scenes import image_key, load_image
+
+# ==========================================
+# 1. 로그인 직후 한 번에 준비할 것들
+# ==========================================
+class Session:
+    """로그인한 유저의 게임 시작 준비물 (유저 정보, 인장이 채워진 플레이어, 미리 읽어 둔 맵 이미지)"""
+    def __init__(self, user_data: dict):
+        self.user_data = user_data
+        self.inventory: List[dict] = []
+        self.player = Player(max_hp=user_data.get("user_hp", 100))
+        self.images: Dict[tuple, object] = {}      # image_key -> convert 전 이미지 (AssetContext.adopt 로 넘김)
+        self.timings: Dict[str, float] = {}        # 준비 단계별 걸린 시간 (ms)
+
+def make_insignia(inventory: List[dict]) -> List[Insignia]:
+    """인벤토리 중 장착한 아이템을 인장으로 (아이템 정보가 없는 줄은 건너뜀)"""
+    insignia_list = []
+    for row in inventory:
+        item = row.get("items")
+        if row.get("is_equipped") and item:
+            insignia_list.append(Insignia(item.get("name", ""), item.get("description", ""),
+                                          item.get("effect_type", ""), item.get("value") or 0))
+    return insignia_list
+
+# ==========================================
+# 2. 준비 작업 (각각 다른 스레드에서 동시에)
+# ==========================================
+def load_inventory(user_data: dict) -> List[dict]:
+    user_id = user_data.get("id")  # inventory.user_id_int 와 짝인 숫자 id
+    if user_id is None or not db.is_configured():
+        return []
+    return db.fetch_inventory(user_id)
+
+def load_monsters():
+    """이번 세션의 몬스터 테이블 받기 (맵 화면의 prefetch 는 이미 받았으면 건너뜀)"""
+    if db.is_configured() and not monster_cache.monsters.refreshed:
+        monster_cache.monsters.refresh()
+
+def load_world_images(user_stage) -> dict:
+    return {image_key(path, size): load_image(path, size) for path, size in map.world_images(user_stage)}
+
+def bootstrap_session(user_data: dict) -> Session:
+    """
+    (백그라운드 스레드에서 실행) 인벤토리/인장, 몬스터 테이블, 맵 이미지를 동시에 준비합니다.
+    하나씩 하면 셋의 합만큼, 동시에 하면 가장 느린 하나만큼 걸립니다.
+    하나가 실패해도 나머지로 게임은 시작합니다. (인장 없이 / 스냅샷 몬스터로 / 이미지는 맵에서 다시)
+    """
+    session = Session(user_data)
+    start = time.perf_counter()
+
+    def timed(name, fn, *args):
+        task_start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            session.timings[name] = (time.perf_counter() - task_start) * 1000
+
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="bootstrap") as pool:
+        tasks = {
+            "inventory": pool.submit(timed, "inventory", load_inventory, user_data),
+            "monsters": pool.submit(timed, "monsters", load_monsters),
+            "images": pool.submit(timed, "images", load_world_images, user_data.get("current_stage", "11")),
+        }
+        for name, task in tasks.items():
+            try:
+                result = task.result()
+            except Exception as e:
+                print(f"⚠️ 게임 준비 중 {name} 실패: {e}")
+                continue
+            if name == "inventory":
+                session.inventory = result
+            elif name == "images":
+                session.images = result
+
+    session.player.insignia_list = make_insignia(session.inventory)
+    session.timings["total"] = (time.perf_counter() - start) * 1000
+    print("🚀 게임 준비 완료: " + ", ".join(f"{name} {ms:.0f}ms" for name, ms in session.timings.items()))
+    return session
+
+# ==========================================
+# 3. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    import os
+    import shutil
+    import tempfile
+
+    import pygame
+
+    import storage
+
+    # 로컬 SQLite 저장소에 가짜 유저/아이템을 넣고, DB 조회마다 0.2초 지연을 흉내 냅니다.
+    os.environ[db.STORAGE_ENV] = "sqlite"
+    os.environ[storage.SQLITE_PATH_ENV] = ":memory:"
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+
+    # 가짜 몬스터가 실제 스냅샷(.cache/monsters.json)에 저장되지 않도록 임시 폴더의 캐시를 씁니다.
+    snapshot_dir = tempfile.mkdtemp(prefix="dh_bootstrap_")
+    monster_cache.monsters = monster_cache.MonsterCache(os.path.join(snapshot_dir, "monsters.json"))
+
+    store = db.get_storage()
+    store.import_rows("users", [{"user_id": "demo", "password": "x", "nickname": "demo", "current_stage": "12"}])
+    store.import_rows("monsters", [{"stage_code": "11", "name": "Goblin", "hp": 80, "attack": 8}])
+    store.import_rows("items", [{"id": 1, "name": "수집가", "rarity": "희귀", "description": "시작 손패 +1",
+                                 "effect_type": "draw_plus", "value": 1}])
+    user = db.fetch_user("demo")
+    store.insert_inventory_rows([{"user_id_int": user["id"], "item_id": 1, "is_equipped": True}])
+
+    for method in ("fetch_inventory", "fetch_monsters"):
+        slow = getattr(store, method)
+        setattr(store, method, lambda *args, _slow=slow: (time.sleep(0.2), _slow(*args))[1])
+
+    try:
+        session = bootstrap_session(user)
+        print(f"인장: {session.player.insignia_list} | 이미지 {len(session.images)}장 | "
+              f"몬스터 {len(monster_cache.monsters.all())}마리")
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
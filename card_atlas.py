@@ -0,0 +1,134 @@
+from typing import Dict, Iterable, List, Tuple
+
+import pygame
+
+import assets
+from entities import CARD_SIZE, CARDS, card_code, card_image_path
+
+# ==========================================
+# 1. 설정
+# ==========================================
+ATLAS_COLUMNS = 13          # 한 줄에 카드 13장 (숫자 1~13)
+HOVER_BORDER = 3            # 마우스를 올린 카드의 노란 테두리 두께
+HOVER_MARGIN = 2            # 테두리가 카드 밖으로 나오는 폭
+HOVER_COLOR = (255, 255, 0)
+HIGHLIGHT_COLOR = (120, 200, 255, 90)   # 선택한 카드 위에 덮는 반투명 색
+
+# ==========================================
+# 2. 카드 아틀라스
+# ==========================================
+class CardAtlas:
+    """
+    카드 앞면 52장을 한 장의 Surface 에 모아 두고, (숫자, 문양) -> 아틀라스 안의 영역 표로 찾습니다.
+    변형(호버 테두리, 선택 표시, 이미지가 없는 카드 자리)도 같은 Surface 에 미리 그려 둡니다.
+    손패는 (아틀라스, 위치, 영역) 목록을 만들어 screen.blits() 한 번으로 그립니다.
+    """
+    def __init__(self, card_size=CARD_SIZE):
+        self.card_size = width, height = tuple(card_size)
+        frame_size = (width + HOVER_MARGIN * 2, height + HOVER_MARGIN * 2)
+        rows = (len(CARDS) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+        # 아래쪽 한 줄: [이미지 없는 카드 자리][선택 표시][호버 테두리]
+        self.surface = pygame.Surface((ATLAS_COLUMNS * frame_size[0], (rows + 1) * frame_size[1]), pygame.SRCALPHA)
+
+        variants_y = rows * frame_size[1]
+        self.placeholder_rect = pygame.Rect(0, variants_y, width, height)
+        pygame.draw.rect(self.surface, (255, 255, 255), self.placeholder_rect)
+        pygame.draw.rect(self.surface, (0, 0, 0), self.placeholder_rect, 2)
+
+        self.highlight_rect = pygame.Rect(frame_size[0], variants_y, width, height)
+        self.surface.fill(HIGHLIGHT_COLOR, self.highlight_rect)
+
+        self.hover_rect = pygame.Rect(frame_size[0] * 2, variants_y, *frame_size)
+        pygame.draw.rect(self.surface, HOVER_COLOR, self.hover_rect, HOVER_BORDER)
+
+        self.rects: Dict[Tuple[int, str], pygame.Rect] = {}  # (숫자, 문양) -> 아틀라스 안의 영역
+        self.missing = 0
+        for i, card in enumerate(CARDS):
+            image = assets.sprites.load(card_image_path(card.value, card.suit), self.card_size, quiet=True)
+            if image is None:
+                # 이미지가 없는 카드는 자리 표시 영역을 같이 씁니다. (픽셀을 복사하지 않음)
+                self.rects[(card.value, card.suit)] = self.placeholder_rect
+                self.missing += 1
+                continue
+            rect = pygame.Rect((i % ATLAS_COLUMNS) * frame_size[0], (i // ATLAS_COLUMNS) * frame_size[1], width, height)
+            self.surface.blit(image, rect)
+            self.rects[(card.value, card.suit)] = rect
+        # code(0~51) 순서로도 바로 찾을 수 있게 (손패가 정수 code 일 때)
+        self.code_rects = [self.rects[(card.value, card.suit)] for card in CARDS]
+
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()  # 화면 픽셀 형식에 맞춰 두면 blit 이 빨라짐
+
+    def rect(self, card) -> pygame.Rect:
+        """Card 또는 code -> 아틀라스 안의 영역"""
+        return self.code_rects[card_code(card)]
+
+    def card_blits(self, card, pos, lifted: bool = False, highlighted: bool = False, lift: int = 0) -> List[tuple]:
+        """카드 한 장을 그릴 (Surface, 위치, 영역) 조각들 (호버면 lift 만큼 올리고 테두리, 선택이면 반투명 덮개)"""
+        x, y = pos
+        if lifted:
+            y -= lift
+        pieces = []
+        if lifted:
+            pieces.append((self.surface, (x - HOVER_MARGIN, y - HOVER_MARGIN), self.hover_rect))
+        pieces.append((self.surface, (x, y), self.rect(card)))
+        if highlighted:
+            pieces.append((self.surface, (x, y), self.highlight_rect))
+        return pieces
+
+    def draw_hand(self, surface: pygame.Surface, hand: Iterable, positions: Iterable,
+                  hovered_index=None, highlighted=(), lift: int = 0):
+        """손패 전체를 blits 한 번으로 그립니다."""
+        pieces = []
+        for i, (card, pos) in enumerate(zip(hand, positions)):
+            pieces += self.card_blits(card, pos, i == hovered_index, i in highlighted, lift)
+        surface.blits(pieces, doreturn=False)
+
+_atlases: Dict[Tuple[int, int], CardAtlas] = {}
+
+def get_card_atlas(card_size=CARD_SIZE) -> CardAtlas:
+    key = tuple(card_size)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = CardAtlas(key)
+    return atlas
+
+def clear_card_atlas():
+    """아틀라스를 버립니다. (화면 모드를 바꿨을 때 다시 변환하고 싶을 때 사용)"""
+    _atlases.clear()
+
+# ==========================================
+# 3. 실행 테스트 코드 (카드마다 blit vs 아틀라스 blits)
+# ==========================================
+if __name__ == "__main__":
+    import os
+    import time
+
+    from entities import Deck
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode(assets.SCREEN_SIZE)
+    atlas = get_card_atlas()
+    print(f"아틀라스 {atlas.surface.get_size()} | 이미지 없는 카드 {atlas.missing}장")
+
+    frames = 2000
+    for hand_size in (8, 12, 16):
+        hand = Deck(seed=1).draw(hand_size)
+        positions = [(20 + i * 75, 520) for i in range(hand_size)]
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            for card, pos in zip(hand, positions):
+                if card.image:
+                    screen.blit(card.image, pos)
+                else:
+                    pygame.draw.rect(screen, (255, 255, 255), (*pos, *CARD_SIZE))
+                    pygame.draw.rect(screen, (0, 0, 0), (*pos, *CARD_SIZE), 2)
+        single_ms = (time.perf_counter() - start) * 1000 / frames
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            atlas.draw_hand(screen, hand, positions, hovered_index=2, lift=30)
+        atlas_ms = (time.perf_counter() - start) * 1000 / frames
+        print(f" - 손패 {hand_size:2d}장: 카드마다 blit {single_ms:.3f}ms / 아틀라스 blits {atlas_ms:.3f}ms (프레임당)")
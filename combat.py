@@ -1,137 +1,222 @@
-import os
-import sys
+import math
+from array import array
+
 import pygame
-from dotenv import load_dotenv
-from supabase import create_client, Client
-
-from entities import Deck, Player 
-
-load_dotenv()
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(url, key)
-
-def start_game_process(screen, user_id, user_nick, user_stage, user_hp):
-    """맵에서 노드를 클릭하면 이 함수가 실행되어 배틀 화면을 띄웁니다."""
-    
-    # ==========================================
-    # 1. 전투 준비 (DB 몬스터 정보 로드 & 카드 덱 세팅)
-    # ==========================================
-    monster = {"name": "Unknown", "hp": 100, "attack": 10} 
-    if supabase:
-        try:
-            monster_resp = supabase.table("monsters").select("*").eq("stage_code", str(user_stage)).execute()
-            if monster_resp.data:
-                monster = monster_resp.data[0]
-        except Exception as e:
-            print(f"DB 오류: {e}")
-
-    my_deck = Deck()
-    p1 = Player(max_hp=user_hp)
-    p1.fill_hand(my_deck) 
-    p1.sort_hand()
-
-    # ==========================================
-    # 2. 화면 이미지 로드 (배경 & 🌟몬스터🌟)
-    # ==========================================
-    font = pygame.font.SysFont("malgungothic", 30)
-    
-    # [배경 로드]
-    bg_path = "assets/battlemap_01.png" 
-    try:
-        bg_image = pygame.image.load(bg_path)
-        bg_image = pygame.transform.scale(bg_image, (1280, 720))
-    except:
-        bg_image = None
-
-    # 🌟 [몬스터 이미지 로드] 🌟
-    # user_stage(예: "11")를 이용해서 파일 이름("assets/monster1-1.png")을 만듭니다.
-    # 맵에서는 monster_icon 이었는데 배틀에서는 monster 라고 하셨으니 그에 맞춥니다!
-    world_num = str(user_stage)[0]
-    stage_num = str(user_stage)[1]
-    monster_img_path = f"assets/monster{world_num}-{stage_num}.png"
-    
-    monster_image = None
-    try:
-        raw_monster = pygame.image.load(monster_img_path)
-        # 배틀 화면이니 몬스터를 300x300 크기로 큼직하게 키웁니다!
-        monster_image = pygame.transform.scale(raw_monster, (300, 300))
-    except Exception as e:
-        print(f"⚠️ 몬스터 이미지({monster_img_path}) 로드 실패: {e}")
-
-    # ==========================================
-    # 3. 배틀 화면 메인 루프
-    # ==========================================
-    running = True
-    while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-                
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    print("🏃 전투에서 도망쳤습니다!")
-                    running = False 
-
-        # --- 화면 그리기 ---
-        
-        if bg_image:
-            screen.blit(bg_image, (0, 0))
-        else:
-            screen.fill((50, 20, 20)) 
 
+import assets as sprites
+import db
+import monster_cache
+import writeback
+from entities import Deck, Player, card_code
+from evaluation import evaluate_best_hand
+from scenes import Scene
+from battle_renderer import BattleRenderer, build_static_layer, get_card_rects, get_hovered_index
+
+# DB에서 못 가져왔을 때 쓰는 기본 몬스터 / 가져오는 중에 보여줄 값
+DEFAULT_MONSTER = {"name": "Unknown", "hp": 100, "attack": 10}
+LOADING_MONSTER = {"name": "", "hp": "-", "attack": "-"}
+# 손패에서 가장 좋은 5장으로 공격하는 키
+ATTACK_KEYS = (pygame.K_SPACE, pygame.K_RETURN)
+
+def load_stage_assets(assets, stage_code):
+    """스테이지의 (배경, 몬스터 이미지, 정적 레이어). 보관함에 한 번 만들어 두면 다시 만들지 않습니다."""
+    # 배경과 🌟몬스터🌟 (경로/크기는 assets.py 의 목록에 있음, 배틀 화면이니 몬스터는 300x300 으로 큼직하게)
+    bg_sprite, monster_sprite = sprites.battle_sprites(stage_code)
+    bg_image = assets.image(*bg_sprite)
+    monster_image = assets.image(*monster_sprite)
+
+    # 배경 + 몬스터를 합친 정적 레이어도 스테이지마다 한 번만 만듭니다.
+    static_layer = assets.get(
+        ("battle_layer", str(stage_code)),
+        lambda: build_static_layer(assets.screen.get_size(), bg_image, monster_image),
+    )
+    return bg_image, monster_image, static_layer
+
+def refill_deck(player: Player, deck: Deck):
+    """덱에 채울 만큼의 카드가 없으면 손패에 있는 카드를 뺀 새 덱으로 바꿉니다. (simulation._ensure_cards 와 같은 규칙)"""
+    if len(deck) >= player.get_draw_count():
+        return
+    held = {card_code(card) for card in player.hand}
+    deck.reset()
+    deck.codes = array("B", [code for code in deck.codes if code not in held])
+
+class CombatScene(Scene):
+    """
+    맵에서 노드를 클릭하면 이 화면이 맵 위에 올라와서(push) 배틀 화면을 띄웁니다.
+    전투가 끝나면 pop({"stage", "won", "hp"}) 으로 맵 화면에 결과를 돌려줍니다. (도망치면 won=None)
+    """
+    def __init__(self, user_id, user_nick, user_stage, user_hp, insignia_list=()):
+        self.user_id = user_id
+        self.user_nick = user_nick
+        self.user_stage = user_stage
+        self.user_hp = user_hp
+        self.insignia_list = list(insignia_list)  # 로그인 때 불러 둔 장착 인장
+
+    def enter(self):
         # ==========================================
-        # 🌟 2. 몬스터 이미지 & 스탯(공격력, 체력) 띄우기 🌟
+        # 1. 전투 준비 (DB 몬스터 정보 로드 & 카드 덱 세팅)
         # ==========================================
-        if monster_image:
-            # 💡 몬스터의 기준 좌표를 변수로 만듭니다. (유저님이 원하시는 중앙 위치로 숫자 조절 가능!)
-            monster_x = 490  # 가로 중앙쯤 (1280 - 300) / 2
-            monster_y = 120  # 위에서 살짝 떨어진 위치
-            
-            # 1) 몬스터 이미지 그리기
-            screen.blit(monster_image, (monster_x, monster_y)) 
-
-            # 2) 스탯 글씨용 폰트 (좀 더 두껍고 눈에 띄게)
-            stat_font = pygame.font.SysFont("malgungothic", 35, bold=True)
-            
-            atk_text = stat_font.render(f" {monster['attack']}", True, (255, 80, 80))
-            atk_x = monster_x
-            atk_y = monster_y + 250  # 몬스터 이미지 높이(300)보다 살짝 위쪽
-            screen.blit(atk_text, (atk_x, atk_y))
-
-            hp_text = stat_font.render(f"{monster['hp']}", True, (80, 255, 80))
-            hp_x = monster_x + 300 - hp_text.get_width() # 오른쪽 끝에 딱 맞추기 위해 글씨 폭만큼 빼줍니다.
-            hp_y = monster_y + 250
-            screen.blit(hp_text, (hp_x, hp_y))
-
-        # 🚨 (기존에 있던 enemy_text, player_text 등 글씨 띄우던 4줄은 싹 다 지워주세요!) 🚨
-        
-        # 3. 내 손패(카드) 그리기 & 호버 효과 (기존 코드 그대로 둠)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        
-        card_width = 100
-        card_height = 150
-        spacing = 20
-        total_width = len(p1.hand) * card_width + (len(p1.hand) - 1) * spacing
-        start_x = (1280 - total_width) // 2 
-        
-        base_y = 520 
-
-        for i, card in enumerate(p1.hand):
-            card_x = start_x + (i * (card_width + spacing))
-            card_y = base_y 
-            
-            card_rect = pygame.Rect(card_x, card_y, card_width, card_height)
-            
-            if card_rect.collidepoint(mouse_x, mouse_y):
-                card_y -= 30 
-                pygame.draw.rect(screen, (255, 255, 0), (card_x-2, card_y-2, card_width+4, card_height+4), 3)
-
-            if card.image:
-                screen.blit(card.image, (card_x, card_y))
+        # 몬스터 정보는 캐시(monster_cache)에서 바로 꺼냅니다.
+        # 캐시에 없을 때만 백그라운드에서 가져오고, 도착할 때까지 스탯 자리에 "-" 를 띄웁니다.
+        self.monster = monster_cache.get_monster(self.user_stage)
+        self.monster_job = None
+        if self.monster is None:
+            if db.is_configured():
+                self.monster = dict(LOADING_MONSTER)
+                self.monster_job = self.run_job(monster_cache.fetch_monster, self.user_stage, name="fetch_monster")
             else:
-                pygame.draw.rect(screen, (255, 255, 255), (card_x, card_y, card_width, card_height))
-                pygame.draw.rect(screen, (0, 0, 0), (card_x, card_y, card_width, card_height), 2) 
+                self.monster = dict(DEFAULT_MONSTER)
+
+        self.my_deck = Deck()
+        self.p1 = Player(max_hp=self.user_hp)
+        self.p1.insignia_list = list(self.insignia_list)  # (draw_plus 등은 첫 손패부터 적용)
+        self.p1.fill_hand(self.my_deck) 
+        self.p1.sort_hand()
+        self.result = None  # 맵 화면에 돌려줄 전투 결과
+
+        # 인장 효과 (전투 규칙은 simulation.play_battle 과 같음)
+        self.damage_multiplier = 1.0
+        self.heal_amount = 0
+        for item in self.p1.insignia_list:
+            if item.effect_type == "damage_multiplier":
+                self.damage_multiplier *= item.value
+            elif item.effect_type == "heal":
+                self.heal_amount += int(item.value)
+
+        # ==========================================
+        # 2. 화면 이미지 로드 (배경 & 🌟몬스터🌟)
+        # ==========================================
+        # 보관함(AssetContext)에 한 번 불러온 이미지는 두 번째 전투부터 바로 꺼내 씁니다.
+        # (맵 화면이 열릴 때 갈 수 있는 스테이지는 미리 불러 둡니다)
+        self.font = self.assets.font(30)
+        bg_image, monster_image, static_layer = load_stage_assets(self.assets, self.user_stage)
+
+        # ==========================================
+        # 3. 배틀 화면 준비
+        # ==========================================
+        self.renderer = BattleRenderer(self.screen, bg_image, monster_image, static_layer=static_layer)
+        self.hovered_index = get_hovered_index(get_card_rects(len(self.p1.hand)), pygame.mouse.get_pos())
 
-        pygame.display.flip()
\ No newline at end of file
+    def exit(self):
+        # 결과를 맵 화면에 넘기지 못하고 닫히면 (게임 종료) 바뀐 HP만 직접 저장 대기열에 넣습니다.
+        if self.result is None and self.p1.current_hp != self.user_hp:
+            writeback.queue.update_progress(self.user_id, user_hp=self.p1.current_hp)
+
+    def finish(self, won):
+        """전투 종료: 결과를 맵 화면으로 돌려줍니다. (진행 상황 저장은 맵 화면이 모아서 함)"""
+        # 지면 HP 0 으로 저장하지 않고 전투 전 HP 로 돌아갑니다.
+        hp = self.user_hp if won is False else self.p1.current_hp
+        self.result = {"stage": self.user_stage, "won": won, "hp": hp}
+        self.manager.pop(self.result)
+
+    def attack(self):
+        """🗡️ 손패에서 가장 좋은 5장으로 공격 -> 쓴 카드는 버리고 다시 채움 -> 몬스터 반격 -> 회복"""
+        if self.monster_job and self.monster_job.pending:
+            return  # 몬스터 정보를 받는 중
+        used_cards, hand_name, score = evaluate_best_hand(self.p1.hand)
+        damage = score * self.damage_multiplier
+        self.monster["hp"] = max(0, math.ceil(self.monster["hp"] - damage))
+        print(f"⚔️ {hand_name}! {damage:g} 피해 (몬스터 HP {self.monster['hp']})")
+        if self.monster["hp"] <= 0:
+            print("🏆 승리!")
+            self.finish(True)
+            return
+
+        for card in used_cards:
+            self.p1.hand.remove(card)
+        refill_deck(self.p1, self.my_deck)
+        self.p1.fill_hand(self.my_deck)
+        self.p1.sort_hand()
+
+        self.p1.take_damage(self.monster["attack"])
+        if not self.p1.is_alive():
+            print("💀 패배...")
+            self.finish(False)
+            return
+        self.p1.heal(self.heal_amount)
+        self.hovered_index = get_hovered_index(get_card_rects(len(self.p1.hand)), pygame.mouse.get_pos())
+        self.manager.loop.request_redraw()
+
+    def on_job(self, job):
+        if job is not self.monster_job:
+            return
+        if not job.ok:
+            print(f"DB 오류: {job.error}")
+        self.monster = dict((job.result if job.ok else None) or DEFAULT_MONSTER)
+
+    def invalidate(self):
+        self.renderer.invalidate()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                print("🏃 전투에서 도망쳤습니다!")
+                self.finish(None)
+                return
+            if event.key in ATTACK_KEYS:
+                self.attack()
+                return
+
+        # 창이 가려졌다 다시 보이면 화면 전체를 다시 그립니다.
+        if event.type == pygame.VIDEOEXPOSE:
+            self.invalidate()
+
+        # 마우스가 다른 카드로 옮겨갔을 때만 다시 그립니다.
+        if event.type == pygame.MOUSEMOTION:
+            new_index = get_hovered_index(get_card_rects(len(self.p1.hand)), event.pos)
+            if new_index != self.hovered_index:
+                self.hovered_index = new_index
+                self.manager.loop.request_redraw()
+
+    def draw(self, screen):
+        # --- 화면 그리기 (바뀐 영역만) ---
+        return self.renderer.render(self.p1.hand, self.hovered_index, self.monster)
+
+# ==========================================
+# 실행 테스트 코드 (전투가 끝나면 진행 상황이 저장소까지 가는지)
+# ==========================================
+if __name__ == "__main__":
+    import os
+    import shutil
+    import tempfile
+
+    import storage
+    from map import MapScene
+    from scenes import SceneManager
+
+    # 로컬 SQLite 저장소 (메모리) + 임시 폴더의 몬스터 스냅샷 / 저장 대기 기록
+    os.environ[db.STORAGE_ENV] = "sqlite"
+    os.environ[storage.SQLITE_PATH_ENV] = ":memory:"
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    temp_dir = tempfile.mkdtemp(prefix="dh_combat_")
+    monster_cache.monsters = monster_cache.MonsterCache(os.path.join(temp_dir, "monsters.json"))
+    writeback.queue = writeback.WriteBehindQueue(os.path.join(temp_dir, "writeback.jsonl"))
+
+    pygame.init()
+    screen = pygame.display.set_mode(sprites.SCREEN_SIZE)
+    store = db.get_storage()
+    store.import_rows("users", [{"user_id": "demo", "password": "x", "nickname": "demo",
+                                 "current_stage": "13", "user_hp": 100}])
+    store.import_rows("monsters", [{"stage_code": "13", "name": "Slime", "hp": 300, "attack": 7}])
+    monster_cache.monsters.refresh()
+
+    try:
+        manager = SceneManager(screen)
+        manager.push(MapScene("demo", "demo", "13", 100))
+        battle = CombatScene("demo", "demo", "13", 100)
+        manager.push(battle)
+        while battle.result is None:
+            battle.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        print(f"전투 결과: {battle.result} | 저장 대기: {writeback.queue.pending}")
+
+        writeback.queue.flush()
+        saved = db.fetch_user("demo")
+        print(f"저장된 진행 상황: current_stage={saved['current_stage']}, user_hp={saved['user_hp']}")
+        if battle.result["won"]:
+            assert saved["current_stage"] == "21" and saved["user_hp"] == battle.result["hp"]
+            assert isinstance(manager.top, MapScene) and manager.top.current_world == "2"  # 다음 월드 맵으로
+        else:
+            assert saved["current_stage"] == "13" and saved["user_hp"] == 100
+        manager.quit()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
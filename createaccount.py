@@ -1,14 +1,5 @@
-import os
-import bcrypt
-from dotenv import load_dotenv
-from supabase import create_client, Client
-
-load_dotenv()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+import db
+import passwords
 
 def register_user(input_id, input_pw, input_nickname):
     """
@@ -19,7 +10,14 @@ def register_user(input_id, input_pw, input_nickname):
     print("DB 저장 중...")
 
     try:
-        hashed_pw = bcrypt.hashpw(input_pw.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        # 해시(수백 ms)는 해시 전용 스레드에서 시작해 두고, 그동안 아이디 중복 확인을 같이 합니다.
+        # → 걸리는 시간이 (조회 + 해시)가 아니라 둘 중 긴 쪽
+        hash_future = passwords.hash_password_async(input_pw)
+        if db.fetch_user(input_id):
+            hash_future.cancel()
+            print(">> 회원가입 실패: 이미 있는 아이디입니다.")
+            return False, "이미 사용 중인 아이디입니다."
+        hashed_pw = hash_future.result()
         # 새로 가입할 유저의 데이터 세팅
         # (게임 시작 시 기본 체력을 100, 스테이지를 "00"으로 설정합니다)
         new_user_data = {
@@ -31,10 +29,10 @@ def register_user(input_id, input_pw, input_nickname):
         }
 
         # Supabase users 테이블에 데이터 삽입
-        response = supabase.table("users").insert(new_user_data).execute()
+        inserted = db.insert_user(new_user_data)
 
         # 데이터가 정상적으로 들어갔다면 반환
-        if len(response.data) > 0:
+        if len(inserted) > 0:
             print(">> 회원가입 성공!")
             return True, "회원가입이 완료되었습니다."
         else:
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional, TypedDict
+
+import httpx
+from dotenv import load_dotenv
+
+import dbtrace
+import perf
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 하나의 HTTP 연결 풀을 모든 테이블 요청이 같이 씁니다. (keep-alive 로 연결 재사용)
+MAX_CONNECTIONS = 8            # jobs.MAX_WORKERS 보다 넉넉하게
+MAX_KEEPALIVE_CONNECTIONS = 4
+KEEPALIVE_EXPIRY = 60.0        # 쉬고 있는 연결을 유지할 시간 (초)
+REQUEST_TIMEOUT = 10.0         # 요청 하나의 제한 시간 (초)
+# 연결 끊김/시간 초과 같은 네트워크 오류는 조회(select)/수정(update)만 이만큼 다시 시도합니다.
+# (insert 는 서버에는 들어갔는데 응답만 못 받은 경우 두 번 들어갈 수 있어서 다시 시도하지 않음. upsert 는 여러 번 보내도 같음)
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.2            # 재시도 전 대기 (초, 재시도 횟수만큼 늘어남)
+RETRYABLE_ACTIONS = ("select", "update", "upsert")
+# "sqlite" 면 Supabase 대신 로컬 SQLite 저장소를 씁니다. (storage.py)
+STORAGE_ENV = "DEMONS_HAND_STORAGE"
+
+_client = None
+_http = None
+_storage = None
+_lock = threading.Lock()
+
+# ==========================================
+# 2. 테이블 행 타입
+# ==========================================
+class UserRow(TypedDict, total=False):
+    user_id: str
+    password: str
+    nickname: str
+    current_stage: str
+    user_hp: int
+
+class MonsterRow(TypedDict, total=False):
+    stage_code: str
+    name: str
+    hp: int
+    attack: int
+
+class ItemRow(TypedDict, total=False):
+    id: int
+    name: str
+    rarity: str
+    price: int
+    description: str
+    effect_type: str
+    value: float
+
+class InventoryRow(TypedDict, total=False):
+    user_id_int: int
+    item_id: int
+    is_equipped: bool
+
+class InventoryItemRow(InventoryRow, total=False):
+    items: Optional[ItemRow]   # 연결된 아이템 정보 (fetch_inventory)
+
+# ==========================================
+# 3. Supabase 클라이언트 (처음 쓸 때 한 번만 생성)
+# ==========================================
+def _credentials():
+    load_dotenv()
+    return os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")
+
+def is_configured() -> bool:
+    """DB를 쓸 수 있는지 (로컬 SQLite 저장소이거나, .env 에 SUPABASE_URL / SUPABASE_KEY 가 있음. 연결은 하지 않음)"""
+    url, key = _credentials()
+    return os.getenv(STORAGE_ENV, "supabase").lower() == "sqlite" or bool(url and key)
+
+def get_client() -> "Client":
+    """
+    게임 전체가 같이 쓰는 Supabase 클라이언트.
+    import 할 때가 아니라 처음 DB를 쓸 때 만들고, 여러 스레드에서 동시에 불려도 하나만 만듭니다.
+    """
+    global _client, _http
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from supabase import ClientOptions, create_client
+
+                url, key = _credentials()
+                # 연결 확인 (실수 방지용)
+                if not url or not key:
+                    raise ValueError("❌ .env 파일에서 SUPABASE_URL 또는 SUPABASE_KEY를 찾을 수 없습니다.")
+
+                _http = httpx.Client(
+                    timeout=REQUEST_TIMEOUT,
+                    limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                                        keepalive_expiry=KEEPALIVE_EXPIRY),
+                )
+                options = ClientOptions(httpx_client=_http, postgrest_client_timeout=REQUEST_TIMEOUT)
+                _client = create_client(url, key, options=options)
+    return _client
+
+def close():
+    """연결 풀과 저장소를 닫습니다. (게임 종료 시, DEMONS_HAND_DB_TRACE 가 있으면 DB 호출 기록도 저장)"""
+    global _client, _http, _storage
+    if os.getenv(dbtrace.DUMP_ENV):
+        dbtrace.tracer.dump(os.getenv(dbtrace.DUMP_ENV))
+    with _lock:
+        if _http is not None:
+            _http.close()
+        if _storage is not None:
+            _storage.close()
+        _client = _http = _storage = None
+
+# ==========================================
+# 4. 저장소 선택 (storage.py)
+# ==========================================
+def get_storage():
+    """STORAGE_ENV(DEMONS_HAND_STORAGE) 환경 변수로 고른 저장소 (기본 Supabase, sqlite 면 로컬 파일)"""
+    global _storage
+    if _storage is None:
+        with _lock:
+            if _storage is None:
+                import storage
+                _storage = storage.create_storage()
+    return _storage
+
+def _call(op: str, *args):
+    """
+    저장소 함수 하나를 부릅니다. 모든 DB 호출이 여기를 지나갑니다.
+    - 걸린 시간, 요청/응답 크기, 재시도, 에러를 dbtrace 에 기록 (테이블/작업별 히스토그램)
+    - 성능 기록(perf)에도 I/O 한 번으로 남김 (화면 스레드에서 불렸으면 블로킹으로 셈)
+    - 네트워크 오류는 조회/수정만 MAX_RETRIES 번까지 다시 시도
+    """
+    action = dbtrace.OPERATIONS.get(op, ("", ""))[1]
+    retries = 0
+    start = time.perf_counter()
+    while True:
+        try:
+            result = getattr(get_storage(), op)(*args)
+        except httpx.TransportError as e:
+            if retries < MAX_RETRIES and action in RETRYABLE_ACTIONS:
+                retries += 1
+                time.sleep(RETRY_BACKOFF * retries)
+                continue
+            _record(op, start, args, error=e, retries=retries)
+            raise
+        except Exception as e:
+            _record(op, start, args, error=e, retries=retries)
+            raise
+        _record(op, start, args, result=result, retries=retries)
+        return result
+
+def _record(op: str, start: float, args, result=None, error=None, retries: int = 0):
+    ms = (time.perf_counter() - start) * 1000
+    dbtrace.tracer.record(op, ms, request=args, response=result, error=error, retries=retries)
+    perf.record_io("db", ms)
+
+# ==========================================
+# 5. 테이블별 조회 함수 (게임 코드는 이것만 씀)
+# ==========================================
+# users
+def fetch_user(user_id: str) -> Optional[UserRow]:
+    return _call("fetch_user", user_id)
+
+def insert_user(row: UserRow) -> List[UserRow]:
+    return _call("insert_user", row)
+
+def update_user(user_id: str, fields: UserRow) -> List[UserRow]:
+    """진행 상황(current_stage, user_hp 등) 저장"""
+    return _call("update_user", user_id, fields)
+
+# monsters
+def fetch_monster(stage_code: str) -> Optional[MonsterRow]:
+    return _call("fetch_monster", stage_code)
+
+def fetch_monsters() -> List[MonsterRow]:
+    return _call("fetch_monsters")
+
+# items
+def fetch_items_by_rarity(rarity: str) -> List[ItemRow]:
+    return _call("fetch_items_by_rarity", rarity)
+
+def fetch_items(rarities: Optional[List[str]] = None) -> List[ItemRow]:
+    """아이템 목록 전체 (rarities 가 있으면 그 등급들만) 한 번에"""
+    return _call("fetch_items", rarities)
+
+# inventory
+def fetch_inventory(user_id: int) -> List[InventoryItemRow]:
+    """유저의 인벤토리를 아이템 정보까지 붙여서 요청 한 번으로"""
+    return _call("fetch_inventory", user_id)
+
+def insert_inventory(user_id: int, item_id: int, is_equipped: bool = False) -> List[InventoryRow]:
+    return insert_inventory_rows([{"user_id_int": user_id, "item_id": item_id, "is_equipped": is_equipped}])
+
+def insert_inventory_rows(rows: List[InventoryRow]) -> List[InventoryRow]:
+    """여러 줄을 요청 한 번으로 추가"""
+    return _call("insert_inventory_rows", rows)
+
+def upsert_inventory_rows(rows: List[InventoryRow]) -> List[InventoryRow]:
+    """여러 줄을 요청 한 번으로 추가 ((유저, 아이템)이 이미 있으면 장착 여부만 덮어씀 - 다시 보내도 안전)"""
+    return _call("upsert_inventory_rows", rows)
+
+def update_equipped(user_id: int, item_ids: List[int], is_equipped: bool) -> List[InventoryRow]:
+    """한 유저의 여러 아이템 장착 상태를 요청 한 번으로 바꿉니다."""
+    return _call("update_equipped", user_id, item_ids, is_equipped)
@@ -0,0 +1,184 @@
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import jobs
+import perf
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 지연 시간 히스토그램 칸 (ms, 각 칸의 상한). 마지막 칸은 그보다 느린 전부
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+RECENT_CALLS = 200          # 파일에 같이 남길 최근 호출 수
+SAMPLES_PER_OP = 500        # p50/p99 계산에 쓰는 최근 지연 시간 수
+DUMP_PATH = os.path.join(".cache", "dbtrace.json")
+# 값이 있으면 게임을 끌 때(db.close) 그 경로로 기록을 저장합니다.
+DUMP_ENV = "DEMONS_HAND_DB_TRACE"
+
+# db.py 의 함수 이름 -> (테이블, 작업)
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "fetch_user": ("users", "select"),
+    "insert_user": ("users", "insert"),
+    "update_user": ("users", "update"),
+    "fetch_monster": ("monsters", "select"),
+    "fetch_monsters": ("monsters", "select"),
+    "fetch_items": ("items", "select"),
+    "fetch_items_by_rarity": ("items", "select"),
+    "fetch_inventory": ("inventory", "select"),
+    "insert_inventory_rows": ("inventory", "insert"),
+    "upsert_inventory_rows": ("inventory", "upsert"),
+    "update_equipped": ("inventory", "update"),
+}
+
+def payload_size(value) -> int:
+    """요청/응답을 JSON 으로 보냈을 때의 바이트 수 (대략적인 전송량)"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+def caller_context() -> str:
+    """DB 를 부른 곳: 작업(jobs) 이름, 아니면 스레드 이름 (화면 스레드면 "main")"""
+    job = jobs.current_job()
+    if job is not None:
+        return job.name
+    thread = threading.current_thread()
+    if thread is threading.main_thread():
+        return "main"
+    return thread.name.rsplit("_", 1)[0]   # "bootstrap_0" -> "bootstrap"
+
+# ==========================================
+# 2. (테이블, 작업) 하나의 통계
+# ==========================================
+class OpStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples: Deque[float] = deque(maxlen=SAMPLES_PER_OP)
+
+    def add(self, ms: float, request_bytes: int, response_bytes: int, error: bool, retries: int):
+        self.calls += 1
+        self.errors += int(error)
+        self.retries += retries
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.samples.append(ms)
+
+    def summary(self) -> dict:
+        samples = list(self.samples)
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 4) if self.calls else 0.0,
+            "retries": self.retries,
+            "total_ms": round(self.total_ms, 3),
+            "p50_ms": round(perf.percentile(samples, 50), 3),
+            "p99_ms": round(perf.percentile(samples, 99), 3),
+            "max_ms": round(self.max_ms, 3),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "histogram": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+# ==========================================
+# 3. DB 호출 기록기
+# ==========================================
+class DBTracer:
+    """
+    db.py 의 모든 저장소 호출이 여기에 기록됩니다.
+    - (테이블, 작업)별: 지연 시간 히스토그램, p50/p99, 요청/응답 크기, 재시도 수, 에러율
+    - 부른 곳(작업 이름)별: 걸린 시간 합 -> 로그인 / 전투 진입에서 어떤 조회가 오래 걸리는지
+    - 최근 호출 목록
+    dump() 로 파일에 남기고, perf 표시(F3)에 상위 몇 줄이 같이 나옵니다.
+    """
+    def __init__(self):
+        self.ops: Dict[Tuple[str, str], OpStats] = {}
+        self.contexts: Dict[str, Dict[str, float]] = {}   # 부른 곳 -> {"calls", "total_ms"}
+        self.recent: Deque[dict] = deque(maxlen=RECENT_CALLS)
+        self._lock = threading.Lock()
+
+    def record(self, op: str, ms: float, request=None, response=None, error: Optional[BaseException] = None,
+               retries: int = 0):
+        table, action = OPERATIONS.get(op, ("?", op))
+        context = caller_context()
+        request_bytes = payload_size(request)
+        response_bytes = payload_size(response) if error is None else 0
+        with self._lock:
+            self.ops.setdefault((table, action), OpStats()).add(ms, request_bytes, response_bytes,
+                                                                error is not None, retries)
+            ctx = self.contexts.setdefault(context, {"calls": 0, "total_ms": 0.0})
+            ctx["calls"] += 1
+            ctx["total_ms"] += ms
+            self.recent.append({"time": time.time(), "op": op, "table": table, "action": action,
+                                "context": context, "ms": round(ms, 3), "retries": retries,
+                                "request_bytes": request_bytes, "response_bytes": response_bytes,
+                                "error": repr(error) if error else None})
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "ops": {f"{table}.{action}": stats.summary() for (table, action), stats in self.ops.items()},
+                "contexts": {name: {"calls": ctx["calls"], "total_ms": round(ctx["total_ms"], 3)}
+                             for name, ctx in sorted(self.contexts.items(), key=lambda kv: -kv[1]["total_ms"])},
+                "recent": list(self.recent),
+            }
+
+    def overlay_lines(self, top: int = 3) -> List[str]:
+        """오래 걸린 (테이블.작업) 상위 top 개"""
+        with self._lock:
+            ranked = sorted(self.ops.items(), key=lambda kv: -kv[1].total_ms)[:top]
+            lines = []
+            for (table, action), stats in ranked:
+                samples = list(stats.samples)
+                lines.append(f"{table}.{action} x{stats.calls} p50 {perf.percentile(samples, 50):.0f} "
+                             f"p99 {perf.percentile(samples, 99):.0f}ms err {stats.errors} retry {stats.retries}")
+        return lines
+
+    def dump(self, path: str = DUMP_PATH) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        print(f"🗂️ DB 호출 기록 저장: {path}")
+        return path
+
+    def reset(self):
+        with self._lock:
+            self.ops.clear()
+            self.contexts.clear()
+            self.recent.clear()
+
+# 게임 전체가 같이 쓰는 기록기 (성능 표시/저장에도 붙음)
+tracer = DBTracer()
+perf.monitor.add_source("db_trace", tracer)
+
+# ==========================================
+# 4. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    import random
+
+    rng = random.Random(0)
+    for _ in range(300):
+        op = rng.choice(["fetch_user", "fetch_monsters", "fetch_inventory", "update_user"])
+        failed = rng.random() < 0.05
+        tracer.record(op, rng.lognormvariate(3, 0.6), request={"user_id": "demo"},
+                      response=None if failed else [{"stage_code": "11", "name": "Goblin"}],
+                      error=TimeoutError("timeout") if failed else None, retries=int(failed))
+
+    print("\n".join(tracer.overlay_lines(top=4)))
+    print(json.dumps(tracer.summary()["ops"]["users.select"], ensure_ascii=False, indent=2))
@@ -0,0 +1,186 @@
+import math
+import time
+from collections import OrderedDict
+from itertools import combinations
+from typing import List, Optional
+
+import numpy as np
+
+from batch_evaluation import best_score_of_suits_batch
+from entities import Deck, Player, card_code
+from evaluation import best_score_of_suits, suit_masks
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 뽑을 수 있는 경우의 수가 이 값 이하이면 전부 계산(정확한 기대값), 넘으면 샘플링
+# (꽉 찬 덱 44장에서 2장 뽑기 = 946가지까지 정확히 -> 1~2장 버리는 조합은 샘플링 오차가 없음)
+EXACT_LIMIT = 1024
+# 샘플링할 때 시뮬레이션할 드로우 횟수 (3장 이상 버리는 조합, 신뢰구간 약 ±10점)
+DEFAULT_SAMPLES = 256
+# 95% 신뢰구간용 z 값
+Z_95 = 1.96
+# (손패, 남은 덱) 이 같으면 다시 계산하지 않도록 최근 결과를 기억합니다. (UI 힌트가 매 프레임 호출해도 공짜)
+# 결과 하나가 객체 수백 개라 많이 쌓아 두면 GC 가 오래 걸리므로 최근 몇 개만
+CACHE_SIZE = 8
+
+_advice_cache = OrderedDict()
+
+class DiscardAdvice:
+    """버리는 조합 하나에 대한 추천 결과"""
+    def __init__(self, indices: List[int], expected_score: float, low: float, high: float, exact: bool, samples: int):
+        self.indices = indices                # 버릴 카드의 손패 인덱스 (빈 리스트 = 리롤 안 함)
+        self.expected_score = expected_score  # 버리고 다시 뽑은 뒤 최고 족보 점수의 기대값
+        self.low = low                        # 95% 신뢰구간 (정확히 계산했으면 기대값과 같음)
+        self.high = high
+        self.exact = exact                    # 전부 계산했는지 (False = 샘플링)
+        self.samples = samples                # 계산에 쓴 드로우 경우의 수
+
+    def __repr__(self):
+        kind = "exact" if self.exact else f"±{(self.high - self.low) / 2:.1f}"
+        return f"<DiscardAdvice: {self.indices} -> {self.expected_score:.1f} ({kind})>"
+
+# ==========================================
+# 2. 기대값 계산
+# ==========================================
+def _masks_of(codes: np.ndarray) -> np.ndarray:
+    """카드 code 행렬 (N, K) -> 행마다 문양별 숫자 마스크 (N, 4)"""
+    bits = np.left_shift(1, codes // 4).astype(np.int32)
+    suits = codes % 4
+    masks = np.zeros((len(codes), 4), dtype=np.int32)
+    for suit in range(4):
+        masks[:, suit] = np.bitwise_or.reduce(np.where(suits == suit, bits, 0), axis=1)
+    return masks
+
+def _summarize(scores: np.ndarray, exact: bool):
+    """조합마다의 점수 행렬 (M, D) -> (평균, 하한, 상한) 배열"""
+    mean = scores.mean(axis=1)
+    if exact or scores.shape[1] < 2:
+        return mean, mean, mean
+    margin = Z_95 * scores.std(axis=1, ddof=1) / math.sqrt(scores.shape[1])
+    return mean, mean - margin, mean + margin
+
+def advise_discards(player: Player, deck: Deck, samples: int = DEFAULT_SAMPLES,
+                    exact_limit: int = EXACT_LIMIT, rng: Optional[np.random.Generator] = None,
+                    top: Optional[int] = None) -> List[DiscardAdvice]:
+    """
+    현재 손패와 덱에 남은 카드로 '버릴 수 있는 모든 조합'(8장이면 256가지)의 기대 점수를 계산해서
+    좋은 순서대로 전부 돌려줍니다. (top 을 주면 상위 top 개만) 리롤 횟수가 남아있지 않으면 '리롤 안 함' 하나만 돌려줍니다.
+    """
+    hand_codes = [card_code(card) for card in player.hand]
+    deck_codes = deck.codes.tolist()
+    can_reroll = player.used_reroll_count < player.max_reroll_count
+    bonus = player.get_draw_count(8)  # 8장일 때 추가로 뽑는 장수 (draw_plus 인장)
+
+    key = (tuple(hand_codes), deck.remaining_mask(), can_reroll, bonus, samples, exact_limit, top)
+    if key in _advice_cache:
+        _advice_cache.move_to_end(key)
+        return _advice_cache[key]
+
+    # [A] 리롤 안 함 = 지금 손패 그대로
+    current = best_score_of_suits(*suit_masks(hand_codes))
+    advice = [DiscardAdvice([], current, current, current, True, 1)]
+
+    if can_reroll and hand_codes:
+        # [B] 버리는 조합 전부 (비트 i 가 1 = i번째 카드 버림). 0번(아무것도 안 버림)은 [A]에서 처리
+        n = len(hand_codes)
+        subsets = np.arange(1, 1 << n)
+        card_masks = _masks_of(np.array(hand_codes, dtype=np.int32)[:, None])
+        # 남기는 카드 조합별 문양 마스크: 카드 i 를 더한 조합 = i 보다 작은 카드들로 만든 조합(이미 계산됨) | 카드 i
+        # -> 카드마다 한 번씩, 앞에서 만든 절반을 그대로 재사용해서 2^n 개를 채웁니다.
+        keep_masks = np.zeros((1 << n, 4), dtype=np.int32)
+        for i in range(n):
+            keep_masks[1 << i:2 << i] = keep_masks[:1 << i] | card_masks[i]
+        kept_masks = keep_masks[((1 << n) - 1) ^ subsets]
+        kept_counts = n - ((subsets[:, None] >> np.arange(n)) & 1).sum(axis=1)
+        draw_table = [min(player.get_draw_count(size), len(deck_codes)) for size in range(n + 1)]
+        draw_counts = np.array(draw_table)[kept_counts]
+
+        # 샘플링용 드로우: 남은 덱을 samples 번 섞어 두고, k장 뽑기 = 앞에서 k장.
+        # 모든 조합이 같은 드로우를 공유하므로 (비교할 때 분산도 줄어듦) 섞기는 한 번만 합니다.
+        deck_array = np.array(deck_codes, dtype=np.int32)
+        rng = rng or np.random.default_rng()
+        shuffled = deck_array[np.argsort(rng.random((samples, len(deck_codes))), axis=1)]
+
+        # 뽑을 장수가 같은 조합끼리 묶어서, 모든 묶음의 최종 손패를 한 번에 판정합니다.
+        # (np.unique 는 첫 호출 때 numpy.ma 를 불러오느라 수십 ms 가 걸려서 set 으로 셉니다)
+        segments = []
+        draws = []
+        for draw_count in sorted(set(draw_counts.tolist())):
+            rows = np.nonzero(draw_counts == draw_count)[0]
+            if draw_count == 0:
+                # 덱이 비었거나 손패가 이미 꽉 찬 경우: 다시 뽑는 카드가 없으니 남긴 카드 그대로가 정확한 값
+                draw_masks, exact = np.zeros((1, 4), dtype=np.int32), True
+            elif math.comb(len(deck_codes), draw_count) <= exact_limit:
+                drawn = np.array(list(combinations(range(len(deck_codes)), draw_count)), dtype=np.int32)
+                draw_masks, exact = _masks_of(deck_array[drawn].reshape(-1, draw_count)), True
+            else:
+                draw_masks, exact = _masks_of(shuffled[:, :draw_count]), False
+            draws.append(draw_masks)
+            segments.append((rows, len(draw_masks), exact))
+
+        # 최종 손패 = 남긴 카드 | 뽑은 카드. 문양별로 연속된 배열 4개에 바로 채웁니다. (판정 함수가 복사 없이 읽음)
+        final = np.empty((4, sum(len(rows) * total for rows, total, _ in segments)), dtype=np.int32)
+        start = 0
+        for (rows, draw_total, _), draw_masks in zip(segments, draws):
+            stop = start + len(rows) * draw_total
+            for suit in range(4):
+                np.bitwise_or(kept_masks[rows, suit][:, None], draw_masks[None, :, suit],
+                              out=final[suit, start:stop].reshape(len(rows), draw_total))
+            start = stop
+        scores = best_score_of_suits_batch(*final)
+
+        # 조합별 (평균, 하한, 상한, 정확한지, 드로우 수) 를 배열에 모아 두고, 점수 순으로 (top 이 있으면 상위만) 객체로 만듭니다.
+        summary = np.zeros((len(subsets), 5))
+        start = 0
+        for rows, draw_total, exact in segments:
+            stop = start + len(rows) * draw_total
+            means, lows, highs = _summarize(scores[start:stop].reshape(len(rows), draw_total), exact)
+            summary[rows] = np.stack([means, lows, highs, np.full(len(rows), exact), np.full(len(rows), draw_total)], axis=1)
+            start = stop
+        for row in np.argsort(-summary[:, 0], kind="stable")[:top].tolist():
+            mean, low, high, exact, draw_total = summary[row].tolist()
+            indices = [i for i in range(n) if (row + 1) >> i & 1]   # row 번째 조합 = 비트마스크 row + 1
+            advice.append(DiscardAdvice(indices, mean, low, high, bool(exact), int(draw_total)))
+
+    advice.sort(key=lambda a: a.expected_score, reverse=True)
+    if top is not None:
+        del advice[top:]
+
+    _advice_cache[key] = advice
+    if len(_advice_cache) > CACHE_SIZE:
+        _advice_cache.popitem(last=False)
+    return advice
+
+def best_discard(player: Player, deck: Deck, **kwargs) -> Optional[List[int]]:
+    """가장 좋은 버릴 카드 인덱스 리스트. 리롤하지 않는 게 가장 좋으면 None (봇/UI 힌트용)"""
+    best = advise_discards(player, deck, **kwargs)[0]
+    return best.indices or None
+
+# ==========================================
+# 3. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    print("=== 💡 버릴 패 추천 테스트 ===")
+    my_deck = Deck()
+    p1 = Player()
+    p1.fill_hand(my_deck)
+    p1.sort_hand()
+    print(f"손패: {p1.hand}")
+
+    start = time.perf_counter()
+    result = advise_discards(p1, my_deck)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    advise_discards(p1, my_deck)
+    cached_ms = (time.perf_counter() - start) * 1000
+
+    for advice in result[:5]:
+        print(f" - 버릴 카드 {[p1.hand[i] for i in advice.indices]} -> 기대 점수 {advice}")
+    print(f"조합 {len(result)}개 계산: 첫 호출 {first_ms:.1f}ms / 캐시 {cached_ms:.3f}ms")
+
+    # 다시 뽑을 카드가 없을 때 (빈 덱) 는 '남긴 카드 그대로' 가 정확한 값
+    empty_deck = Deck(seed=0)
+    empty_deck.cards = []
+    print(f"빈 덱: {advise_discards(p1, empty_deck, top=3)}")
@@ -1,5 +1,6 @@
 import random
-from typing import List, Optional
+from array import array
+from typing import List, Optional, Union
 import pygame
 import os
 
@@ -22,62 +23,183 @@ ZODIAC_MAP = {
     13: "kbj"
 }
  
+# ==========================================
+# 카드 정수 인코딩 (족보 판정 / 시뮬레이션용)
+# ==========================================
+# code = (파워 - 1) * 4 + 문양 번호  ->  0 ~ 51
+# - 파워: 1 ~ 13 (0은 가장 높은 숫자 13으로 취급, evaluation.get_power 와 같은 규칙)
+# - 문양 번호: SUIT_SORT_ORDER 순서 (dia 0, moon 1, fire 2, sun 3)
+# 그래서 code 순서대로 정렬하면 sort_hand 와 같은 (숫자 -> 문양) 순서가 됩니다.
+SUIT_INDEX = {suit: order - 1 for suit, order in SUIT_SORT_ORDER.items()}
+INDEX_SUIT = {index: suit for suit, index in SUIT_INDEX.items()}
+
+def encode_card(value: int, suit: str) -> int:
+    """(숫자, 문양) -> 0~51 정수"""
+    power = 13 if value == 0 else value
+    return (power - 1) * 4 + SUIT_INDEX[suit]
+
+def decode_card(code: int):
+    """0~51 정수 -> (숫자, 문양)"""
+    return code // 4 + 1, INDEX_SUIT[code % 4]
+
+# 카드 이미지 크기 (전투 화면에 그려지는 크기)
+CARD_SIZE = (100, 150)
+
+# ==========================================
+# 2. 카드 이미지 캐시 (Sprite Cache)
+# ==========================================
+# (숫자, 문양, 크기) -> 크기 조절까지 끝난 Surface
+# 덱을 새로 만들 때마다 PNG 52장을 다시 읽지 않도록, 프로세스 전체에서 한 번만 로드해서 같이 씁니다.
+# 로드에 실패한 카드는 None 으로 기억해 두고 다시 시도하지 않습니다.
+_card_sprite_cache = {}
+
+def card_image_path(value: int, suit: str) -> str:
+    """파일 이름 규칙에 맞는 카드 이미지 경로 (예: "assets/card/1_mouse_dia.png")"""
+    return f"assets/card/{value}_{ZODIAC_MAP[value]}_{suit}.png"
+
+def load_card_sprite(value: int, suit: str, size=CARD_SIZE) -> Optional[pygame.Surface]:
+    """카드 앞면 이미지를 캐시에서 꺼내 줍니다. 처음 요청될 때만 디스크에서 읽고 크기를 조절합니다."""
+    key = (value, suit, tuple(size))
+    if key in _card_sprite_cache:
+        return _card_sprite_cache[key]
+
+    # 크기 조절은 assets.py 의 캐시가 맡습니다. (로그인 화면에서 미리 불러 둔 것 / 디스크에 저장된 것을 그대로 씀)
+    # assets.py 가 이 파일을 import 하므로 여기서 불러옵니다.
+    import assets
+    image = assets.load(card_image_path(value, suit), key[2])
+    # 화면이 아직 없으면 변환할 수 없으니 캐시에 넣지 않습니다. (assets.py 메모리 캐시에서 바로 나옴)
+    # set_mode 뒤 첫 요청 때 화면 픽셀 포맷으로 바꿔서 저장합니다. (blit 이 훨씬 빨라짐)
+    if pygame.display.get_surface() is None:
+        return image
+    if image is not None:
+        image = image.convert_alpha()
+
+    _card_sprite_cache[key] = image
+    return image
+
+def clear_card_sprite_cache():
+    """캐시를 비웁니다. (화면 모드를 바꿨을 때 다시 변환하고 싶을 때 사용)"""
+    _card_sprite_cache.clear()
+
 class Card:
-    """카드 한 장을 나타내는 클래스"""
-    def __init__(self, value: int, suit: str):
-        self.value = value       # 숫자 (1~13)
-        self.suit = suit         # 문양 ("dia", "fire" 등)
-        self.animal = ZODIAC_MAP[value]  # "mouse", "cow" 등
-        
-        # 🌟 핵심: 파일 이름 규칙에 맞게 경로 조립! (폴더 이름이 card 라고 하셨으므로)
-        # 예: "card/1_mouse_dia.png"
-        self.image_path = f"assets/card/{self.value}_{self.animal}_{self.suit}.png"
-        
-        # 파이게임용 이미지 로드 (실제 게임 화면에 띄우기 위함)
-        self.image = None
-        try:
-            # 카드를 만들 때 이미지를 미리 불러와서 가지고 있게 합니다.
-            # 원본 크기가 크다면 pygame.transform.scale 로 크기를 줄여주세요.
-            raw_image = pygame.image.load(self.image_path)
-            self.image = pygame.transform.scale(raw_image, (100, 150)) # 예: 카드 크기 조절
-        except:
-            print(f"⚠️ 이미지 로드 실패: {self.image_path}")
+    """
+    카드 한 장을 나타내는 클래스
+    플라이웨이트: 같은 (숫자, 문양) 카드는 프로세스 전체에서 객체 하나를 같이 씁니다.
+    (Card(7, "sun") is Card(7, "sun") -> True, 값은 바꾸면 안 됩니다!)
+    """
+    __slots__ = ("value", "suit", "code")
+    _pool = {}
+
+    def __new__(cls, value: int, suit: str):
+        card = cls._pool.get((value, suit))
+        if card is None:
+            card = super().__new__(cls)
+            card.value = value       # 숫자 (1~13)
+            card.suit = suit         # 문양 ("dia", "fire" 등)
+            card.code = encode_card(value, suit)  # 족보 판정용 정수 (0~51)
+            cls._pool[(value, suit)] = card
+        return card
+
+    @property
+    def animal(self) -> str:
+        return ZODIAC_MAP[self.value]  # "mouse", "cow" 등
+
+    @property
+    def image_path(self) -> str:
+        # 🌟 핵심: 파일 이름 규칙에 맞게 경로 조립! (예: "assets/card/1_mouse_dia.png")
+        return card_image_path(self.value, self.suit)
+
+    @property
+    def image(self) -> Optional[pygame.Surface]:
+        # 파이게임용 이미지 (실제 게임 화면에 띄우기 위함)
+        # 화면에 처음 그릴 때 캐시에서 가져오므로, 시뮬레이션처럼 그리지 않으면 이미지를 아예 읽지 않습니다.
+        return load_card_sprite(self.value, self.suit)
+
+    def __reduce__(self):
+        # 피클(저장/프로세스 전달)할 때도 code 하나만 보내고 받는 쪽 플라이웨이트를 씁니다.
+        return card_from_code, (self.code,)
 
     def __repr__(self):
         return f"[{self.animal}({self.value}) | {self.suit}]"
 
+# code(0~51) -> Card 플라이웨이트 표
+CARDS = [Card(*decode_card(code)) for code in range(52)]
+
+# 손패/덱은 Card 리스트 또는 code 정수 묶음(list, array('B')) 둘 다 쓸 수 있습니다.
+CardLike = Union[Card, int]
+
+def card_from_code(code: int) -> Card:
+    """0~51 정수 -> Card 플라이웨이트"""
+    return CARDS[code]
+
+def card_code(card: CardLike) -> int:
+    """Card 또는 정수 -> 0~51 정수"""
+    return card if isinstance(card, int) else card.code
+
+def pack_cards(cards: List[CardLike]) -> bytes:
+    """손패/덱 -> 카드 한 장당 1바이트 (저장/전송용)"""
+    return array("B", [card_code(card) for card in cards]).tobytes()
+
+def unpack_cards(data: bytes) -> List[Card]:
+    """pack_cards 로 만든 바이트 -> Card 리스트"""
+    return [CARDS[code] for code in array("B", data)]
+
 class Deck:
-    def __init__(self):
-        self.cards = []
+    """
+    카드 덱. 내부에는 카드 code 를 array('B') (카드 한 장당 1바이트)로 들고 있고,
+    뽑을 때만 Card 플라이웨이트로 바꿔서 돌려줍니다.
+    """
+    def __init__(self, seed: Optional[int] = None, rng: Optional[random.Random] = None):
+        # 덱 전용 난수 생성기 (seed 를 주면 같은 순서가 재현됩니다. 시뮬레이션/테스트용)
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.codes = array("B")
         self.reset()
 
     def reset(self):
-        self.cards = []
-        
-        # 1부터 13까지, 4개의 문양을 돌면서 카드를 생성합니다.
-        for rank in range(1, 14): # 1 ~ 13
-            for suit in CARD_SUITS: # "dia", "fire", "moon", "sun"
-                # Card 생성자에 숫자(rank)와 문양(suit)만 넘겨주면 알아서 이미지까지 찾아옵니다!
-                self.cards.append(Card(rank, suit))
+        # 1부터 13까지, 4개의 문양 -> code 0~51 (52장)
+        self.codes = array("B", range(52))
         
+        # 리셋할 때 한 번만 섞습니다. 남은 카드는 계속 무작위 순서이므로 뽑을 때마다 다시 섞을 필요가 없습니다.
         self.shuffle()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.codes)
+
+    @property
+    def cards(self) -> List[Card]:
+        """남은 카드 (Card 리스트, 호출할 때마다 새로 만듦 - 반복문 안에서는 codes 를 쓰세요)"""
+        return [CARDS[code] for code in self.codes]
+
+    @cards.setter
+    def cards(self, cards: List[CardLike]):
+        self.codes = array("B", [card_code(card) for card in cards])
+
+    def draw_codes(self, count: int) -> array:
+        """덱 맨 뒤에서 count 장을 code 로 꺼냅니다. (섞지 않으므로 O(count))"""
+        if count > len(self.codes):
+            print("더 이상 뽑을 카드가 없습니다!") 
+            count = len(self.codes)
+        if count <= 0:
+            return array("B")
+
+        drawn = self.codes[-count:]
+        del self.codes[-count:]
+        drawn.reverse()  # pop() 을 반복하던 때와 같은 순서
+        return drawn
 
     def draw(self, count: int) -> List[Card]:
-        self.shuffle()
-        drawn_cards = []
-        
-        for _ in range(count):
-            if len(self.cards) > 0:
-                card = self.cards.pop()
-                drawn_cards.append(card)
-            else:
-                print("더 이상 뽑을 카드가 없습니다!") 
-                break 
-                
-        return drawn_cards
+        """덱 맨 뒤에서 count 장을 Card 로 꺼냅니다."""
+        return [CARDS[code] for code in self.draw_codes(count)]
+
+    def remaining_mask(self) -> int:
+        """남은 카드를 52비트 정수로 (확률 계산용, evaluation.hand_mask 와 같은 규칙)"""
+        mask = 0
+        for code in self.codes:
+            mask |= 1 << code
+        return mask
+
+    def __len__(self):
+        return len(self.codes)
 
 class Insignia:
     """게임 내 파워업 아이템(인장) 클래스"""
@@ -92,10 +214,11 @@ class Insignia:
 
 class Player:
     """플레이어 정보를 관리하는 클래스"""
-    def __init__(self, max_hp: int = 100):
+    def __init__(self, max_hp: int = 100, compact: bool = False):
         self.max_hp = max_hp
         self.current_hp = max_hp
-        self.hand: List[Card] = [] 
+        # compact=True 이면 손패를 카드 code 의 array('B') 로 들고 있습니다. (시뮬레이션용)
+        self.hand: List[CardLike] = array("B") if compact else [] 
         self.insignia_list: List[Insignia] = [] # 아이템 목록
         self.used_reroll_count = 0     
         self.default_reroll_limit = 3  
@@ -125,8 +248,7 @@ class Player:
         draw_amount = self.get_draw_count()
 
         if draw_amount > 0:
-            new_cards = deck.draw(draw_amount)
-            self.hand.extend(new_cards)
+            self._draw_into_hand(deck, draw_amount)
         self.used_reroll_count += 1
 
     def fill_hand(self, deck):
@@ -134,15 +256,27 @@ class Player:
         draw_amount = self.get_draw_count() # 님이 만든 로직 (8 - 현재장수)
         
         if draw_amount > 0:
-            new_cards = deck.draw(draw_amount)
-            self.hand.extend(new_cards)
+            self._draw_into_hand(deck, draw_amount)
             # print(f"🎴 {draw_amount}장을 드로우하여 손패를 채웠습니다.")
         else:
             print("✋ 손패가 이미 가득 찼습니다.")  
 
+    def _draw_into_hand(self, deck, count: int):
+        """덱에서 count 장을 뽑아 손패에 추가 (정수 손패면 code 그대로)"""
+        if isinstance(self.hand, array):
+            self.hand.extend(deck.draw_codes(count))
+        else:
+            self.hand.extend(deck.draw(count))
+
     def sort_hand(self):
         """🌟 유저 요청대로 숫자 우선 정렬 + 같은 숫자면 문양 순서 정렬 🌟"""
         
+        if isinstance(self.hand, array) or (self.hand and isinstance(self.hand[0], int)):
+            # 정수(code) 손패: code 순서가 곧 (숫자 -> 문양) 순서입니다. (array 는 .sort() 가 없고, 비어 있어도 array)
+            codes = sorted(self.hand)
+            self.hand[:] = array("B", codes) if isinstance(self.hand, array) else codes
+            return
+
         # 1. 파이썬 sort()의 key에 tuple을 넘겨줘서 정렬 기준 순서를 정합니다!
         # key=lambda card: (1순위_정렬_기준, 2순위_정렬_기준)
         
@@ -157,10 +291,11 @@ class Player:
         # 유저님 헷갈리지 않게 메시지 업데이트!
         print("🗂️ 손패가 유저 요청대로 (숫자 -> 문양 순) 완벽하게 정렬되었습니다!")        
 
-    def get_draw_count(self) -> int:
+    def get_draw_count(self, hand_size: Optional[int] = None) -> int:
+        """뽑아야 할 장수. hand_size 를 주면 현재 손패 대신 그 장수를 기준으로 계산합니다. (버릴 패 추천용)"""
         # 1. 기본 장수 설정 (무조건 8장)
         target_hand_size = 8 
-        current_hand_size = len(self.hand)
+        current_hand_size = len(self.hand) if hand_size is None else hand_size
         draw_amount = target_hand_size - current_hand_size
 
         if draw_amount < 0:
@@ -222,4 +357,42 @@ if __name__ == "__main__":
     if len(p1.hand) == 9:
         print("✅ 성공! 시작부터 아이템 효과가 적용되어 9장을 뽑았습니다.")
     else:
-        print(f"❌ 실패... 기대값: 9, 실제값: {len(p1.hand)}")
\ No newline at end of file
+        print(f"❌ 실패... 기대값: 9, 실제값: {len(p1.hand)}")
+
+    # ========================================================
+    # 5. 덱 분포 검증: 섞기는 리셋 때 한 번뿐이어도 뽑히는 카드는 균등해야 함
+    # ========================================================
+    print("\n>> 🎲 드로우 분포 검증 (카이제곱, 52칸)")
+    trials = 20000
+    first_counts = [0] * 52   # 첫 드로우의 첫 장
+    later_counts = [0] * 52   # 8장을 뽑은 뒤 두 번째 드로우(3장)의 첫 장
+    test_deck = Deck(seed=1234)
+    for _ in range(trials):
+        test_deck.reset()
+        first_counts[test_deck.draw_codes(8)[0]] += 1
+        later_counts[test_deck.draw_codes(3)[0]] += 1
+
+    expected = trials / 52
+    for label, counts in (("첫 드로우", first_counts), ("두 번째 드로우", later_counts)):
+        chi2 = sum((count - expected) ** 2 / expected for count in counts)
+        # 자유도 51, 유의수준 0.001 의 임계값은 약 87.97
+        status = "✅ 균등" if chi2 < 87.97 else "❌ 치우침"
+        print(f"   {label}: 카이제곱 {chi2:.1f} -> {status}")
+
+    # ========================================================
+    # 6. 화면을 만들기 전에 꺼낸 카드 이미지도, 화면이 생긴 뒤엔 변환된 것으로 바뀌어야 함
+    # ========================================================
+    print("\n>> 🖼️ 카드 이미지 변환 검증 (set_mode 전/후)")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    clear_card_sprite_cache()
+    sample = Card(1, "moon")
+    early = sample.image
+    pygame.display.set_mode((200, 200))
+    late = sample.image
+    if early is None or late is None:
+        print("   ⚠️ 이미지 파일이 없어 건너뜁니다.")
+    elif late is not early and late is sample.image:
+        print("   ✅ 화면이 생긴 뒤 첫 요청에서 변환해 캐시에 넣었습니다.")
+    else:
+        print("   ❌ 화면을 만들기 전 이미지가 그대로 캐시에 남았습니다.")
@@ -1,6 +1,9 @@
-from typing import List, Tuple
+import random
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from typing import List, Sequence, Tuple
 from collections import Counter
-from entities import Card  # entities.py에서 Card 클래스 가져오기
+from entities import Card, CardLike, card_code  # entities.py에서 Card 클래스 가져오기
 
 # ==========================================
 # 1. 족보 점수 및 설정
@@ -18,6 +21,10 @@ HAND_SCORES = {
     "Solo": 10,               # 하이카드
 }
 
+# 족보 번호 (0 = Serious Punch ... 9 = Solo), 배치 판정 등에서 이름 대신 사용
+HAND_NAMES = list(HAND_SCORES)
+HAND_IDS = {name: i for i, name in enumerate(HAND_NAMES)}
+
 # ==========================================
 # 2. 판별 핵심 로직 (변수명 수정됨)
 # ==========================================
@@ -26,13 +33,12 @@ def get_power(value: int) -> int:
     return 13 if value == 0 else value
 
 def is_Type_Set(cards: List[Card]) -> bool:
-    """[Type Set] 무늬(card_type)가 모두 같은지 확인"""
+    """[Type Set] 무늬(suit)가 모두 같은지 확인"""
     if not cards: return False
-    
-    # [수정] card.suit -> card.card_type
-    first_type = cards[0].card_type
+
+    first_type = cards[0].suit
     for card in cards[1:]:
-        if card.card_type != first_type:
+        if card.suit != first_type:
             return False
     return True
 
@@ -40,101 +46,220 @@ def is_Sequence(values: List[int]) -> bool:
     """[sequence] 숫자가 연속적인지 확인 (Straight)"""
     powers = [get_power(v) for v in values]
     sorted_powers = sorted(powers)
-    
+
     # 중복이 없고, (최대값 - 최소값)이 4이면 연속된 숫자임
     if len(set(sorted_powers)) == 5 and (sorted_powers[-1] - sorted_powers[0] == 4):
         return True
     return False
 
-def evaluate_hand(hand: List[Card]) -> Tuple[str, int]:
-    """카드 5장을 받아 족보 이름과 점수를 반환"""
-    
-    if len(hand) != 5:
-        return "Solo", 10
-
-    # 1. 숫자(Value)만 추출 및 파워 변환
-    # [수정] card.rank -> card.value 사용
-    raw_values = [card.value for card in hand]
-    powers = [get_power(v) for v in raw_values]
-    
-    # 2. 같은 숫자 개수 세기
+def classify_hand(powers: List[int], check_type_set: bool) -> str:
+    """파워 5개와 플러시 여부로 족보 이름을 판정 (룩업 테이블을 만들 때 쓰는 기준 로직)"""
+    # 1. 같은 숫자 개수 세기
     counts = sorted(Counter(powers).values(), reverse=True)
 
-    # 3. 플러시(Type Set), 스트레이트(Sequence) 여부 미리 계산
-    check_type_set = is_Type_Set(hand)
-    check_sequence = is_Sequence(raw_values)
-
-    # 4. 족보 판별 (점수가 높은 순서대로)
-    hand_name = "Solo"
+    # 2. 스트레이트(Sequence) 여부 미리 계산
+    check_sequence = is_Sequence(powers)
 
+    # 3. 족보 판별 (점수가 높은 순서대로)
     # [2000] Serious Punch (0 포함 + 무늬같음 + 연속)
     if check_type_set and check_sequence and (13 in powers):
-        hand_name = "Serious Punch"
+        return "Serious Punch"
     elif check_type_set and check_sequence:
-        hand_name = "Type and sequence"
+        return "Type and sequence"
     elif counts == [3, 2]:
-        hand_name = "Triple and Couple"
+        return "Triple and Couple"
     elif check_type_set:
-        hand_name = "Type Set"
+        return "Type Set"
     elif check_sequence:
-        hand_name = "Sequence"
+        return "Sequence"
     elif counts == [4, 1]:
-        hand_name = "Family"
+        return "Family"
     elif counts == [3, 1, 1]:
-        hand_name = "Triple"
+        return "Triple"
     elif counts == [2, 2, 1]:
-        hand_name = "Couple Set"
+        return "Couple Set"
     elif counts == [2, 1, 1, 1]:
-        hand_name = "Couple"
+        return "Couple"
     else:
-        hand_name = "Solo"
+        return "Solo"
+
+# ==========================================
+# 3. 룩업 테이블 (시작할 때 한 번만 계산)
+# ==========================================
+# 족보는 "숫자 구성(중복 포함)"과 "플러시 여부"만으로 결정됩니다.
+# 그래서 52C5 = 2,598,960 가지 패 전체 대신, 숫자마다 소수(prime)를 붙여서
+# 곱한 값(숫자 구성마다 유일함)을 키로 쓰는 테이블 하나면 충분합니다. (6,188 x 2 칸)
+#
+# 카드 비트 구성: [문양 비트 4개 (12~15번 비트)] [숫자 소수 (0~7번 비트)]
+RANK_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+CARD_BITS = [RANK_PRIMES[code // 4] | (1 << (12 + code % 4)) for code in range(52)]
+
+def _build_hand_table() -> dict:
+    """소수 곱 -> (족보 이름, 점수) 테이블. 플러시는 음수 키로 구분합니다."""
+    table = {}
+    for ranks in combinations_with_replacement(range(13), 5):
+        product = 1
+        for rank in ranks:
+            product *= RANK_PRIMES[rank]
+        powers = [rank + 1 for rank in ranks]
+
+        for flush, key in ((False, product), (True, -product)):
+            name = classify_hand(powers, flush)
+            table[key] = (name, HAND_SCORES[name])
+    return table
+
+HAND_TABLE = _build_hand_table()
+
+def evaluate_codes(codes: Sequence[int]) -> Tuple[str, int]:
+    """정수로 인코딩된 카드 5장(0~51)을 받아 족보 이름과 점수를 반환 (테이블 조회 1번)"""
+    if len(codes) != 5:
+        return "Solo", 10
+
+    bits = CARD_BITS
+    a, b, c, d, e = bits[codes[0]], bits[codes[1]], bits[codes[2]], bits[codes[3]], bits[codes[4]]
+    key = (a & 0xFF) * (b & 0xFF) * (c & 0xFF) * (d & 0xFF) * (e & 0xFF)
+
+    # 다섯 장이 공통으로 가진 문양 비트가 있으면 플러시
+    if a & b & c & d & e & 0xF000:
+        key = -key
+    return HAND_TABLE[key]
+
+def evaluate_hand(hand: List[CardLike]) -> Tuple[str, int]:
+    """카드 5장(Card 또는 code 정수)을 받아 족보 이름과 점수를 반환"""
+    if len(hand) != 5:
+        return "Solo", 10
+
+    return evaluate_codes([card_code(card) for card in hand])
 
-    return hand_name, HAND_SCORES[hand_name]
+# ==========================================
+# 4. 손패 전체(8장 이상)에서 가장 좋은 5장 고르기
+# ==========================================
+BEST_SCORE = HAND_SCORES["Serious Punch"]
+
+def hand_mask(hand: List[CardLike]) -> int:
+    """손패를 52비트 정수로 변환 (카드 code 번째 비트가 1)"""
+    mask = 0
+    for card in hand:
+        mask |= 1 << card_code(card)
+    return mask
+
+def mask_codes(mask: int) -> List[int]:
+    """52비트 정수 -> 카드 code 리스트 (작은 순서)"""
+    codes = []
+    while mask:
+        low = mask & -mask
+        codes.append(low.bit_length() - 1)
+        mask ^= low
+    return codes
+
+@lru_cache(maxsize=4096)
+def best_of_mask(mask: int) -> Tuple[Tuple[int, ...], str, int]:
+    """손패 비트마스크 -> (가장 좋은 5장의 code, 족보 이름, 점수). 같은 손패는 캐시에서 바로 꺼냅니다."""
+    codes = mask_codes(mask)
+    if len(codes) < 5:
+        return tuple(codes), "Solo", HAND_SCORES["Solo"]
+
+    best = None
+    # 8장이면 56가지, 9장이면 126가지 조합을 테이블로 조회
+    for combo in combinations(codes, 5):
+        name, score = evaluate_codes(combo)
+        if best is None or score > best[2]:
+            best = (combo, name, score)
+            if score == BEST_SCORE:
+                break
+    return best
+
+def evaluate_best_hand(hand: List[CardLike]) -> Tuple[List[CardLike], str, int]:
+    """
+    손패 전체를 받아 (가장 좋은 5장, 족보 이름, 점수)를 반환 (호버 미리보기용으로 매 프레임 호출해도 됨)
+    5장은 손패에 들어있던 형태(Card 또는 code) 그대로 돌려줍니다.
+    """
+    combo, name, score = best_of_mask(hand_mask(hand))
+    by_code = {card_code(card): card for card in hand}
+    return [by_code[code] for code in combo], name, score
+
+# ==========================================
+# 5. 점수만 빠르게 계산 (버릴 패 추천 / 시뮬레이션용)
+# ==========================================
+# 문양별로 "가지고 있는 숫자" 13비트 마스크 4개만으로 최고 족보 점수를 계산합니다.
+# (조합을 하나씩 만들지 않으므로 best_of_mask 보다 훨씬 빠름, 결과 점수는 같음)
+STRAIGHT_TOP_BIT = 1 << 8  # 9~13 연속(Serious Punch)의 시작 비트
+
+def suit_masks(codes: Sequence[int]) -> List[int]:
+    """카드 code 리스트 -> 문양별 숫자 비트마스크 [dia, moon, fire, sun]"""
+    masks = [0, 0, 0, 0]
+    for code in codes:
+        masks[code % 4] |= 1 << (code // 4)
+    return masks
+
+def _straight_starts(m: int) -> int:
+    """5개 연속된 숫자가 시작하는 위치 비트 (없으면 0)"""
+    return m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4)
+
+def best_score_of_suits(s0: int, s1: int, s2: int, s3: int) -> int:
+    """문양별 숫자 마스크 4개 -> 그 손패에서 만들 수 있는 최고 족보 점수"""
+    total = s0.bit_count() + s1.bit_count() + s2.bit_count() + s3.bit_count()
+    if total < 5:
+        return HAND_SCORES["Solo"]
+
+    # 1. 스티플 / 플러시 (한 문양에 5장 이상)
+    flush = False
+    for s in (s0, s1, s2, s3):
+        if s.bit_count() >= 5:
+            flush = True
+            starts = _straight_starts(s)
+            if starts & STRAIGHT_TOP_BIT:
+                return HAND_SCORES["Serious Punch"]
+            if starts:
+                return HAND_SCORES["Type and sequence"]
+
+    # 2. 같은 숫자 개수 (2장 이상 / 3장 이상 / 4장)
+    pairs = (s0 & s1) | (s0 & s2) | (s0 & s3) | (s1 & s2) | (s1 & s3) | (s2 & s3)
+    trips = (s0 & s1 & s2) | (s0 & s1 & s3) | (s0 & s2 & s3) | (s1 & s2 & s3)
+
+    if trips and pairs.bit_count() >= 2:
+        return HAND_SCORES["Triple and Couple"]
+    if flush:
+        return HAND_SCORES["Type Set"]
+    if _straight_starts(s0 | s1 | s2 | s3):
+        return HAND_SCORES["Sequence"]
+    if s0 & s1 & s2 & s3:
+        return HAND_SCORES["Family"]
+    if trips:
+        return HAND_SCORES["Triple"]
+    if pairs.bit_count() >= 2:
+        return HAND_SCORES["Couple Set"]
+    if pairs:
+        return HAND_SCORES["Couple"]
+    return HAND_SCORES["Solo"]
 
 # ==========================================
-# 3. 실행 테스트 코드
+# 6. 실행 테스트 코드
 # ==========================================
+# (기대 족보, [(숫자, 문양), ...]) - 0 대신 가장 높은 숫자 13을 사용합니다.
+SAMPLE_HANDS = [
+    ("Serious Punch", [(13, "dia"), (12, "dia"), (11, "dia"), (10, "dia"), (9, "dia")]),
+    ("Type and sequence", [(1, "fire"), (2, "fire"), (3, "fire"), (4, "fire"), (5, "fire")]),
+    ("Triple and Couple", [(7, "moon"), (7, "sun"), (7, "dia"), (2, "moon"), (2, "fire")]),
+    ("Type Set", [(1, "sun"), (5, "sun"), (8, "sun"), (10, "sun"), (12, "sun")]),
+    ("Sequence", [(13, "dia"), (12, "fire"), (11, "moon"), (10, "sun"), (9, "dia")]),
+    ("Family", [(5, "dia"), (5, "fire"), (5, "moon"), (5, "sun"), (9, "dia")]),
+    ("Triple", [(3, "dia"), (3, "fire"), (3, "moon"), (8, "sun"), (1, "dia")]),
+    ("Couple Set", [(8, "dia"), (8, "fire"), (4, "moon"), (4, "sun"), (1, "dia")]),
+    ("Couple", [(11, "dia"), (11, "fire"), (1, "moon"), (2, "sun"), (9, "dia")]),
+    ("Solo", [(1, "dia"), (3, "fire"), (5, "moon"), (8, "sun"), (11, "dia")]),
+]
+
 if __name__ == "__main__":
     print("=== 🃏 entities.Card 연동 족보 테스트 시작 ===")
 
-    # [중요] Card 생성 시 (name, value, card_type) 순서를 지켜야 함
-    test_cases = [
-        ("Serious Punch", [
-            Card("T", 0, "♦"), Card("T", 12, "♦"), Card("T", 11, "♦"), Card("T", 10, "♦"), Card("T", 9, "♦")
-        ]),
-        ("Type and sequence", [
-            Card("T", 1, "🔥"), Card("T", 2, "🔥"), Card("T", 3, "🔥"), Card("T", 4, "🔥"), Card("T", 5, "🔥")
-        ]),
-        ("Triple and Couple", [
-            Card("T", 7, "🌙"), Card("T", 7, "☀"), Card("T", 7, "♦"), Card("T", 2, "🌙"), Card("T", 2, "🔥")
-        ]),
-        ("Type Set", [
-            Card("T", 1, "☀"), Card("T", 5, "☀"), Card("T", 8, "☀"), Card("T", 10, "☀"), Card("T", 12, "☀")
-        ]),
-        ("Sequence", [
-            Card("T", 0, "♦"), Card("T", 12, "🔥"), Card("T", 11, "🌙"), Card("T", 10, "☀"), Card("T", 9, "♦")
-        ]),
-        ("Family", [
-            Card("T", 5, "♦"), Card("T", 5, "🔥"), Card("T", 5, "🌙"), Card("T", 5, "☀"), Card("T", 9, "♦")
-        ]),
-        ("Triple", [
-            Card("T", 3, "♦"), Card("T", 3, "🔥"), Card("T", 3, "🌙"), Card("T", 8, "☀"), Card("T", 1, "♦")
-        ]),
-        ("Couple Set", [
-            Card("T", 8, "♦"), Card("T", 8, "🔥"), Card("T", 4, "🌙"), Card("T", 4, "☀"), Card("T", 1, "♦")
-        ]),
-        ("Couple", [
-            Card("T", 11, "♦"), Card("T", 11, "🔥"), Card("T", 1, "🌙"), Card("T", 1, "☀"), Card("T", 9, "♦")
-        ]),
-        ("Solo", [
-            Card("T", 1, "♦"), Card("T", 3, "🔥"), Card("T", 5, "🌙"), Card("T", 8, "☀"), Card("T", 11, "♦")
-        ]),
-    ]
+    test_cases = [(expected, [Card(value, suit) for value, suit in cards]) for expected, cards in SAMPLE_HANDS]
 
     success_cnt = 0
     for expected, hand in test_cases:
         result_name, score = evaluate_hand(hand)
-        
+
         if result_name == expected:
             print(f"✅ [성공] {expected:<17} | 점수: {score}")
             success_cnt += 1
@@ -143,4 +268,29 @@ if __name__ == "__main__":
             print(f"   패: {hand}")
 
     print("-" * 40)
-    print(f"총 {len(test_cases)}개 케이스 중 {success_cnt}개 통과")
\ No newline at end of file
+    print(f"총 {len(test_cases)}개 케이스 중 {success_cnt}개 통과")
+
+    # 테이블 결과가 기준 로직(classify_hand)과 같은지 랜덤 패로 교차 검증
+    mismatch = 0
+    for _ in range(20000):
+        codes = random.sample(range(52), 5)
+        powers = [code // 4 + 1 for code in codes]
+        flush = len({code % 4 for code in codes}) == 1
+        if evaluate_codes(codes)[0] != classify_hand(powers, flush):
+            mismatch += 1
+    print(f"랜덤 20000패 교차 검증: 불일치 {mismatch}개")
+
+    # 8장 손패에서 가장 좋은 5장 찾기
+    print("-" * 40)
+    eight = [Card(value, suit) for value, suit in SAMPLE_HANDS[5][1]]  # Family 5장
+    eight += [Card(2, "dia"), Card(2, "fire"), Card(6, "moon")]
+    best_cards, best_name, best_score = evaluate_best_hand(eight)
+    print(f"8장 손패 최고 족보: {best_name} ({best_score}) -> {best_cards}")
+
+    # 빠른 점수 계산이 조합 열거(best_of_mask)와 같은지 교차 검증
+    mismatch = 0
+    for _ in range(5000):
+        codes = random.sample(range(52), random.randint(5, 10))
+        if best_score_of_suits(*suit_masks(codes)) != best_of_mask(sum(1 << c for c in codes))[2]:
+            mismatch += 1
+    print(f"랜덤 5000손패 최고 점수 교차 검증: 불일치 {mismatch}개")
@@ -0,0 +1,74 @@
+import time
+
+import pygame
+
+import perf
+
+# ==========================================
+# 1. 설정
+# ==========================================
+TARGET_FPS = 60          # 최대 프레임 (애니메이션 중이거나 이벤트가 몰려올 때의 상한)
+IDLE_TIMEOUT_MS = 500    # 아무 입력이 없을 때 이벤트를 기다리는 최대 시간
+
+# ==========================================
+# 2. 공용 화면 루프 도우미
+# ==========================================
+class FrameLoop:
+    """
+    모든 화면(while running: 루프)이 같이 쓰는 프레임 제한기
+
+    - animating=False (기본): 이벤트가 올 때까지 pygame.event.wait 로 잠들어 있어서 CPU를 거의 안 씁니다.
+    - animating=True: 목표 FPS 로 계속 돌립니다. (움직이는 연출이 있을 때만 켜기)
+    - 화면은 dirty 일 때만 다시 그리고 flip 합니다. 마우스 이동은 기본으로 dirty 를 만들지 않으므로,
+      호버처럼 마우스 위치에 따라 바뀌는 화면은 직접 request_redraw() 를 불러 주세요.
+
+    사용법:
+        loop = FrameLoop()
+        while running:
+            for event in loop.poll():
+                ...
+            if loop.dirty:
+                ...그리기...
+            loop.present()
+    """
+    def __init__(self, fps: int = TARGET_FPS, idle_timeout_ms: int = IDLE_TIMEOUT_MS):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.animating = False
+        self.dirty = True  # 첫 프레임은 무조건 그림
+
+    def poll(self) -> list:
+        """이번 프레임의 이벤트 목록. 할 일이 없으면 입력이 올 때까지 기다립니다."""
+        if self.animating:
+            events = pygame.event.get()
+        else:
+            start = time.perf_counter()
+            first = pygame.event.wait(self.idle_timeout_ms)
+            perf.monitor.add("idle", (time.perf_counter() - start) * 1000)  # 입력을 기다린 시간은 일한 시간이 아님
+            events = [] if first.type == pygame.NOEVENT else [first]
+            events.extend(pygame.event.get())
+
+        for event in events:
+            if event.type != pygame.MOUSEMOTION:
+                self.dirty = True
+        return events
+
+    def request_redraw(self):
+        """다음 present() 때 화면을 다시 그리도록 표시"""
+        self.dirty = True
+
+    def present(self, rects=None):
+        """
+        그린 게 있으면 화면에 내보내고, 목표 FPS 를 넘지 않도록 쉽니다.
+        rects 를 주면 화면 전체(flip) 대신 그 영역만 내보냅니다. (pygame.display.update)
+        """
+        if self.dirty:
+            with perf.monitor.phase("flip"):
+                if rects is None:
+                    pygame.display.flip()
+                elif rects:
+                    pygame.display.update(rects)
+            self.dirty = False
+        with perf.monitor.phase("idle"):
+            self.clock.tick(self.fps)
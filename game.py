@@ -1,4 +1,14 @@
 import map
-def start_game(screen, user_id, user_nick,user_stage, user_hp):
-    print(f"환영합니다 {user_nick}님! 게임을 시작합니다.")
-    map.show_map_screen(screen, user_id, user_nick, user_stage, user_hp)
\ No newline at end of file
+def start_game(manager, session):
+    """로그인 후 준비(bootstrap)가 끝난 세션으로 맵 화면을 엽니다. (로그인 화면은 스택에서 빠짐)"""
+    user_data = session.user_data
+    print(f"환영합니다 {user_data['nickname']}님! 게임을 시작합니다.")
+    # 미리 읽어 둔 맵/전투 이미지를 보관함에 넣어 두면 맵 화면이 디스크를 기다리지 않습니다.
+    manager.assets.adopt(session.images)
+    manager.replace(map.MapScene(
+        user_data['user_id'], 
+        user_data['nickname'], 
+        user_data['current_stage'], 
+        user_data['user_hp'],
+        session.player,
+    ))
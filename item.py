@@ -1,37 +1,74 @@
-import os
 import random
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import threading
+from typing import Dict, Optional
+
+import db
+import writeback
 
 # ==========================================
-# 1. 환경 변수 로드 및 Supabase 설정
+# 1. Supabase 설정
 # ==========================================
+# 클라이언트는 db.py 가 처음 쓸 때 한 번만 만듭니다. (.env 확인도 그때)
 
-# .env 파일 내용을 불러옵니다.
-load_dotenv()
-
-# os.getenv로 비밀 값을 가져옵니다.
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
-
-# 연결 확인 (실수 방지용)
-if not url or not key:
-    raise ValueError("❌ .env 파일에서 SUPABASE_URL 또는 SUPABASE_KEY를 찾을 수 없습니다.")
-
-supabase: Client = create_client(url, key)
+# ==========================================
+# 2. 아이템 목록 캐시 (Catalog)
+# ==========================================
+# 상점에 나오는 등급 (낮은 등급부터)
+RARITIES = ["일반", "희귀", "전설"]
+# 등급별 기본 진열 개수
+SHOP_ITEMS_PER_RARITY = 3
+# 가중치 뽑기(roll_shop)에서 등급이 나올 비율
+RARITY_WEIGHTS = {"일반": 70, "희귀": 25, "전설": 5}
+
+class ItemCatalog:
+    """
+    items 테이블을 세션에 한 번만 (모든 등급을 요청 한 번으로) 받아서 등급별로 나눠 둡니다.
+    그 뒤의 상점 진열은 네트워크 없이 이 목록에서 랜덤으로 뽑습니다.
+    """
+    def __init__(self, rarities=RARITIES):
+        self.rarities = list(rarities)
+        self._by_rarity = None
+        self._lock = threading.Lock()
+
+    def load(self, force: bool = False):
+        """등급 -> 아이템 리스트. 처음 한 번만 DB에서 받습니다."""
+        with self._lock:
+            if self._by_rarity is None or force:
+                by_rarity = {rarity: [] for rarity in self.rarities}
+                for item in db.fetch_items(self.rarities):
+                    by_rarity.setdefault(item["rarity"], []).append(item)
+                self._by_rarity = by_rarity
+            return self._by_rarity
+
+    def items(self, rarity: str):
+        by_rarity = self.load()
+        if rarity not in by_rarity:
+            # 처음 받을 때 목록(rarities)에 없던 등급은 그 등급만 DB에서 따로 받아 같이 보관합니다.
+            fetched = db.fetch_items_by_rarity(rarity)
+            with self._lock:
+                by_rarity.setdefault(rarity, fetched)
+        return by_rarity[rarity]
+
+    def sample(self, rarity: str, count: int, rng=random):
+        """rarity 등급에서 중복 없이 최대 count개"""
+        items = self.items(rarity)
+        return rng.sample(items, min(count, len(items)))
+
+# 게임 전체가 같이 쓰는 아이템 목록
+catalog = ItemCatalog()
 
 # ==========================================
-# 2. 상점 아이템 뽑기 로직
+# 3. 상점 아이템 뽑기 로직
 # ==========================================
 
 def fetch_random_items_by_rarity(rarity: str, count: int = 3):
     """
-    특정 등급(rarity)의 아이템을 DB에서 가져와서 랜덤하게 count개 반환
+    특정 등급(rarity)의 아이템을 (캐시된 목록에서) 랜덤하게 count개 반환
+    (RARITIES 에 없는 등급은 처음 한 번 그 등급만 DB에서 받아 옴)
     """
     try:
-        # 1. DB에서 해당 등급의 모든 아이템 가져오기
-        response = supabase.table("items").select("*").eq("rarity", rarity).execute()
-        items = response.data
+        # 1. 해당 등급의 모든 아이템 (처음 한 번만 DB에서 전 등급을 같이 받아 옴)
+        items = catalog.items(rarity)
 
         # 2. 아이템이 없으면 빈 리스트 반환
         if not items:
@@ -41,7 +78,7 @@ def fetch_random_items_by_rarity(rarity: str, count: int = 3):
         # 3. 요청한 개수보다 아이템이 적으면, 있는 거 다 줌
         if len(items) < count:
             print(f"ℹ️ '{rarity}' 아이템이 부족하여 {len(items)}개만 가져옵니다.")
-            return items
+            return list(items)
         
         # 4. 랜덤하게 섞어서 count개 뽑기 (중복 없음)
         return random.sample(items, count)
@@ -49,6 +86,40 @@ def fetch_random_items_by_rarity(rarity: str, count: int = 3):
     except Exception as e:
         print(f"❌ 데이터 가져오기 실패: {e}")
         return []
+
+def stock_shop(counts: Optional[Dict[str, int]] = None, rng=random) -> Dict[str, list]:
+    """
+    상점 진열을 한 번에 채웁니다. counts: {등급: 개수} (기본: 모든 등급 3개씩)
+    DB 요청은 세션 첫 진열 때 한 번뿐이고, 그 뒤로는 0번입니다.
+    """
+    counts = counts or {rarity: SHOP_ITEMS_PER_RARITY for rarity in catalog.rarities}
+    try:
+        return {rarity: catalog.sample(rarity, count, rng) for rarity, count in counts.items()}
+    except Exception as e:
+        print(f"❌ 데이터 가져오기 실패: {e}")
+        return {rarity: [] for rarity in counts}
+
+def roll_shop(slots: int = SHOP_ITEMS_PER_RARITY * 3, weights: Optional[Dict[str, float]] = None, rng=random) -> list:
+    """
+    칸마다 등급을 가중치(기본 RARITY_WEIGHTS)로 굴려서 아이템을 뽑습니다. (같은 아이템은 한 번만)
+    어떤 등급이 다 떨어지면 남은 등급 중에서 다시 굴립니다.
+    """
+    weights = weights or RARITY_WEIGHTS
+    try:
+        remaining = {rarity: list(catalog.items(rarity)) for rarity in weights}
+    except Exception as e:
+        print(f"❌ 데이터 가져오기 실패: {e}")
+        return []
+
+    shop = []
+    for _ in range(slots):
+        available = [rarity for rarity in weights if remaining[rarity] and weights[rarity] > 0]
+        if not available:
+            break
+        rarity = rng.choices(available, [weights[r] for r in available])[0]
+        pool = remaining[rarity]
+        shop.append(pool.pop(rng.randrange(len(pool))))
+    return shop
     
     
 
@@ -70,15 +141,10 @@ def get_legendary_shop_items():
     return fetch_random_items_by_rarity("전설", 3)
 
 def add_to_inventory(user_id: int, item_id: int):
+    """인벤토리에 추가합니다. DB에는 바로 쓰지 않고 저장 대기열(writeback)이 모아서 보냅니다."""
     try:
-        data = {
-            "user_id_int": user_id,
-            "item_id": item_id,
-            "is_equipped": False  # 기본값은 장착 해제 상태
-        }
-        
-        # Supabase insert 실행
-        supabase.table("inventory").insert(data).execute()
+        # 기본값은 장착 해제 상태
+        writeback.queue.add_inventory(user_id, item_id, is_equipped=False)
         
         print(f"✅ 유저 {user_id}번의 인벤토리에 아이템 {item_id}번이 추가되었습니다.")
         return True
@@ -86,12 +152,22 @@ def add_to_inventory(user_id: int, item_id: int):
     except Exception as e:
         print(f"❌ 인벤토리 추가 실패: {e}")
         return False
+
+def set_equipped(user_id: int, item_id: int, is_equipped: bool):
+    """장착/해제. 여러 번 바꿔도 저장 대기열에서 마지막 값 하나로 합쳐집니다."""
+    writeback.queue.set_equipped(user_id, item_id, is_equipped)
 # ==========================================
-# 3. 테스트 실행
+# 4. 테스트 실행
 # ==========================================
 if __name__ == "__main__":
     print("=== 🛒 상점 시스템 테스트 ===")
     add_to_inventory(1, 3)
+    writeback.queue.flush()
+
+    # 0. 모든 등급 한 번에 (DB 요청 1번) + 가중치 뽑기 (DB 요청 0번)
+    for rarity, items in stock_shop().items():
+        print(f"[{rarity}] {[item['name'] for item in items]}")
+    print(f"가중치 진열: {[(item['name'], item['rarity']) for item in roll_shop()]}")
 
     # 1. 일반
     common_items = get_common_shop_items()
@@ -0,0 +1,176 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pygame
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 동시에 돌릴 네트워크 작업 수
+MAX_WORKERS = 4
+# 기본 제한 시간 (초). 넘으면 TimeoutError 로 끝난 것으로 처리합니다.
+DEFAULT_TIMEOUT = 10.0
+
+# 작업이 끝나면 이 타입의 pygame 이벤트가 올라옵니다. (event.job 에 Job 이 들어 있음)
+JOB_DONE = pygame.event.custom_type()
+
+# 지금 스레드에서 돌고 있는 작업 (DB 호출 기록에 "어느 작업에서 불렸는지" 남기는 용도)
+_local = threading.local()
+
+# ==========================================
+# 2. 작업 하나 (Job)
+# ==========================================
+class Job:
+    """
+    백그라운드에서 도는 함수 호출 하나.
+    status: "pending" -> "done" / "error" / "timeout" / "cancelled"
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, timeout: float):
+        self.id = next(self._ids)
+        self.name = name
+        self.status = "pending"
+        self.result = None
+        self.error = None
+        self.owner = None  # 이 작업을 맡긴 화면(Scene) - 결과는 이 화면에 전달됩니다
+        self.started = time.perf_counter()
+        self.deadline = self.started + timeout if timeout else None
+        self.future = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> bool:
+        return self.status == "pending"
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "done"
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def _finish(self, status: str, result=None, error=None) -> bool:
+        """처음 한 번만 결과를 기록합니다. (타임아웃/취소 뒤에 늦게 도착한 결과는 버림)"""
+        with self._lock:
+            if self.status != "pending":
+                return False
+            self.status, self.result, self.error = status, result, error
+            return True
+
+    def cancel(self):
+        """결과를 더 이상 받지 않습니다. (아직 시작 전이면 실행 자체를 취소)"""
+        if self._finish("cancelled") and self.future:
+            self.future.cancel()
+
+    def __repr__(self):
+        return f"<Job #{self.id} {self.name}: {self.status}>"
+
+# ==========================================
+# 3. 작업 실행기 (스레드 풀)
+# ==========================================
+class JobRunner:
+    """
+    DB 요청처럼 오래 걸리는 함수를 화면 스레드 밖(스레드 풀)에서 돌리고,
+    끝나면 JOB_DONE 이벤트로 결과를 돌려줍니다. 그동안 화면은 계속 그려집니다.
+    """
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.pending = {}  # id -> Job
+
+    def submit(self, fn, *args, name: str = None, timeout: float = DEFAULT_TIMEOUT, owner=None, **kwargs) -> Job:
+        job = Job(name or getattr(fn, "__name__", "job"), timeout)
+        job.owner = owner
+        self.pending[job.id] = job
+
+        def work():
+            if not job.pending:  # 시작 전에 취소/타임아웃 됨
+                return
+            _local.job = job
+            try:
+                finished = job._finish("done", result=fn(*args, **kwargs))
+            except Exception as e:
+                finished = job._finish("error", error=e)
+            finally:
+                _local.job = None
+            if finished:
+                self._post(job)
+
+        job.future = self.pool.submit(work)
+        return job
+
+    def _post(self, job: Job):
+        self.pending.pop(job.id, None)
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(JOB_DONE, job=job))
+
+    def check_timeouts(self):
+        """제한 시간을 넘긴 작업을 TimeoutError 로 끝냅니다. (화면 루프에서 매 프레임 호출)"""
+        now = time.perf_counter()
+        for job in list(self.pending.values()):
+            if not job.pending:
+                self.pending.pop(job.id, None)
+            elif job.deadline and now > job.deadline:
+                if job._finish("timeout", error=TimeoutError(f"{job.name}: {job.elapsed:.1f}초 초과")):
+                    job.future.cancel()
+                    self._post(job)
+
+    def cancel_owned(self, owner):
+        """화면이 닫힐 때, 그 화면이 맡긴 작업을 모두 취소합니다."""
+        for job in list(self.pending.values()):
+            if job.owner is owner:
+                job.cancel()
+                self.pending.pop(job.id, None)
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.pending)
+
+    def shutdown(self):
+        for job in list(self.pending.values()):
+            job.cancel()
+        self.pending.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+# 게임 전체가 같이 쓰는 실행기
+runner = JobRunner()
+
+def submit(fn, *args, **kwargs) -> Job:
+    return runner.submit(fn, *args, **kwargs)
+
+def current_job() -> Optional[Job]:
+    """이 스레드에서 지금 돌고 있는 작업 (작업 스레드가 아니면 None)"""
+    return getattr(_local, "job", None)
+
+# ==========================================
+# 4. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((100, 100))
+
+    fast = submit(lambda: 42, name="fast")
+    slow = submit(time.sleep, 2, name="slow", timeout=0.3)
+    broken = submit(lambda: 1 / 0, name="broken")
+    cancelled = submit(time.sleep, 1, name="cancelled")
+    cancelled.cancel()
+
+    frames = 0
+    finished = []
+    start = time.perf_counter()
+    while len(finished) < 3:
+        runner.check_timeouts()
+        for event in pygame.event.get():
+            if event.type == JOB_DONE:
+                finished.append(event.job)
+        frames += 1
+        time.sleep(1 / 60)
+
+    for job in finished:
+        print(f" - {job}: result={job.result} error={job.error!r}")
+    print(f"{cancelled}, 기다리는 동안 화면 프레임 {frames}번 ({time.perf_counter() - start:.2f}초)")
+    runner.shutdown()
@@ -1,13 +1,4 @@
-import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
-
-load_dotenv()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+import db
 
 def show_login_screen():
     print("\n=== 악마의 패(Demon's Hand) 로그인 ===")
@@ -17,17 +8,11 @@ def show_login_screen():
     print("로그인 확인 중...")
 
     try:
-        response = supabase.table("users") \
-            .select("*") \
-            .eq("user_id", input_id) \
-            .eq("password", input_pw) \
-            .execute()
-        
-        user_data = response.data
+        user = db.fetch_user(input_id)
 
-        if len(user_data) > 0:
+        if user and user['password'] == input_pw:
             print(">> 로그인 성공!")
-            return True, user_data[0]['user_id'], user_data[0]['nickname'], user_data[0]['current_stage'], user_data[0]['user_hp']
+            return True, user['user_id'], user['nickname'], user['current_stage'], user['user_hp']
         else:
             print(">> 로그인 실패: 아이디나 비밀번호를 확인하세요.")
             return False, None
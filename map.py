@@ -1,127 +1,240 @@
 import pygame
-import sys
+import assets
 import combat
+import monster_cache
+import writeback
+from scenes import Scene
+from text_cache import render_text
 
 # 색상 정의
 COLOR_TEXT = (255, 255, 255)
 
-def show_map_screen(screen, user_id, user_nick, user_stage, user_hp):
-    font = pygame.font.SysFont("malgungothic", 20)
-    
-    # 🌟 1. 유저의 현재 맵(월드) 번호 파악하기
-    # user_stage가 "10", "21" 같은 문자열이라고 가정합니다.
-    current_world = str(user_stage)[0] # 첫 번째 글자만 떼어냄 ('1', '2' 등)
-    
-    # --- [Step 1: 이미지 로드 영역] ---
-    
-    bg_image = None
-    # 🌟 변경점: 변수 여러 개 대신, 이미지를 모아둘 빈 바구니(딕셔너리)를 하나만 만듭니다!
-    monster_images = {} 
-    
-    try:
-        if current_world == "1": 
-            bg_image = pygame.image.load("assets/map_bg01.png")
-            
-            # 💡 [핵심] 노드 코드("11", "12")와 그에 맞는 파일 이름을 짝지어 줍니다.
-            files_to_load = {
-                "11": "assets/monster_icon1-1.png",
-                "12": "assets/monster_icon1-2.png"
-                # 나중에 1-3 몬스터가 생기면 여기에 "13": "assets/..." 한 줄만 추가하면 끝납니다!
-            }
-            
-            # for문을 돌면서 이미지를 한 번에 싹 불러와서 바구니에 담습니다.
-            for code, file_path in files_to_load.items():
-                try:
-                    raw_img = pygame.image.load(file_path)
-                    # 크기를 60x60으로 줄여서 노드 코드("11", "12")를 열쇠로 바구니에 저장!
-                    monster_images[code] = pygame.transform.scale(raw_img, (60, 60))
-                except Exception as e:
-                    print(f"⚠️ 몬스터 이미지 로드 실패 ({file_path}): {e}")
-                    
-        elif current_world == "2":
-            bg_image = pygame.image.load("assets/map_bg02.png")
-            # 2번 맵에 해당하는 몬스터 이미지가 있다면 여기에 추가 로드 로직 작성
-            
-        # ... (이하 맵 이미지 로드 로직 동일) ...
-        
-        if bg_image:
-            bg_image = pygame.transform.scale(bg_image, (1280, 720))
-    except Exception as e:
-        print(f"배경 로드 실패: {e}")
-
-    # 🌟 3. 맵 번호에 따라 노드(스테이지) 정보 다르게 세팅하기
-    if current_world == "1":
-        # 1번 맵 (Monster Forest)의 노드들
-        nodes = [
-            {"code": "11", "name": "",   "x": 250, "y": 550}, 
-            {"code": "12", "name": "",      "x": 550, "y": 550}, # 👈 여기에 몬스터를 띄울 겁니다.
-            {"code": "13", "name": "",      "x": 1000, "y": 250}, 
-        ]
-    # ... (이하 노드 세팅 로직 동일) ...
-    elif current_world == "2":
-        # 2번 맵 (Demon's Deep Lair)의 노드들 (방금 만든 지도 기준!)
-        nodes = [
-            {"code": "21", "name": "",     "x": 200, "y": 600}, 
-            {"code": "22", "name": "",   "x": 600, "y": 400}, 
-            {"code": "23", "name": "","x": 1100, "y": 200}, 
-        ]
+# 노드(동그라미) 반지름과, 클릭 판정용 격자 한 칸 크기
+NODE_RADIUS = 40
+GRID_CELL = 128
+
+MAP_NODES = {
+    # 1번 맵 (Monster Forest)의 노드들
+    "1": [
+        {"code": "11", "name": "",   "x": 250, "y": 550}, 
+        {"code": "12", "name": "",      "x": 550, "y": 550}, # 👈 여기에 몬스터를 띄울 겁니다.
+        {"code": "13", "name": "",      "x": 1000, "y": 250}, 
+    ],
+    # 2번 맵 (Demon's Deep Lair)의 노드들 (방금 만든 지도 기준!)
+    "2": [
+        {"code": "21", "name": "",     "x": 200, "y": 600}, 
+        {"code": "22", "name": "",   "x": 600, "y": 400}, 
+        {"code": "23", "name": "","x": 1100, "y": 200}, 
+    ],
+}
+
+def world_images(user_stage):
+    """맵 화면을 여는 데 필요한 이미지의 (경로, 크기) 목록 (배경, 몬스터 아이콘, 갈 수 있는 스테이지의 전투 이미지)"""
+    current_world = str(user_stage)[0]
+    images = []
+    if f"map/background/{current_world}" in assets.MANIFEST:
+        images.append(assets.MANIFEST[f"map/background/{current_world}"])
+    for node in MAP_NODES.get(current_world, []):
+        if f"map/icon/{node['code']}" in assets.MANIFEST:
+            images.append(assets.MANIFEST[f"map/icon/{node['code']}"])
+        if is_unlocked(user_stage, node["code"]):
+            images += assets.battle_sprites(node["code"])
+    return list(dict.fromkeys(images))  # 전투 배경처럼 여러 스테이지가 같이 쓰는 이미지는 한 번만
+
+def is_unlocked(user_stage, code) -> bool:
+    """🌟 잠금 해제 조건 (문자열 비교: 현재 스테이지 "12" 면 "11", "12" 가 열림)"""
+    return str(user_stage) >= code
+
+# 모든 스테이지를 진행 순서대로 ("11", "12", "13", "21", ...)
+STAGE_ORDER = [node["code"] for world in sorted(MAP_NODES) for node in MAP_NODES[world]]
+
+def next_stage(stage_code):
+    """stage_code 를 깨면 열리는 다음 스테이지 (마지막 스테이지면 None)"""
+    code = str(stage_code)
+    if code not in STAGE_ORDER or code == STAGE_ORDER[-1]:
+        return None
+    return STAGE_ORDER[STAGE_ORDER.index(code) + 1]
+
+# ==========================================
+# 클릭 판정용 격자 (Spatial Index)
+# ==========================================
+class NodeGrid:
+    """
+    노드들을 GRID_CELL 크기 칸에 나눠 담아 두고, 클릭한 칸(과 겹친 노드)만 거리 계산을 합니다.
+    노드가 아주 많은 월드여도 클릭 한 번에 확인하는 노드는 몇 개뿐입니다.
+    """
+    def __init__(self, nodes, radius: int = NODE_RADIUS, cell: int = GRID_CELL):
+        self.radius = radius
+        self.cell = cell
+        self.cells = {}
+        for node in nodes:
+            # 노드 동그라미가 걸쳐 있는 칸에 모두 넣어 둡니다.
+            for cx in range((node["x"] - radius) // cell, (node["x"] + radius) // cell + 1):
+                for cy in range((node["y"] - radius) // cell, (node["y"] + radius) // cell + 1):
+                    self.cells.setdefault((cx, cy), []).append(node)
+
+    def hit(self, pos):
+        """pos 에 있는 노드 (없으면 None). sqrt 없이 거리의 제곱으로 비교합니다."""
+        x, y = pos
+        for node in self.cells.get((x // self.cell, y // self.cell), ()):
+            if (x - node["x"]) ** 2 + (y - node["y"]) ** 2 <= self.radius ** 2:
+                return node
+        return None
+
+# ==========================================
+# 미리 합쳐 둔 맵 화면 (Static Layer)
+# ==========================================
+def build_map_layer(size, bg_image, nodes, unlocked, monster_images, font, locked_font) -> pygame.Surface:
+    """배경 + 노드(테두리, 아이콘, 잠금 덮개) + 이름을 한 장으로 그려 둡니다. (스테이지가 바뀔 때만 다시)"""
+    layer = pygame.Surface(size).convert()
+    # 1. 배경 그리기
+    if bg_image:
+        layer.blit(bg_image, (0, 0))
     else:
-        nodes = []
-
-    running = True
-    while running:
-        # ... (이하 이벤트 처리 로직 동일) ...
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = event.pos
-                for node in nodes:
-                    dist = ((mouse_pos[0] - node["x"])**2 + (mouse_pos[1] - node["y"])**2)**0.5
-                    if dist <= 40:
-                        # 🌟 4. 잠금 해제 조건 수정 (문자열 비교)
-                        if str(user_stage) >= node["code"]:
-                            combat.start_game_process(screen, user_id, user_nick, node["code"], user_hp)
-                        else:
-                            print(f"🔒 잠겨있습니다! (필요: {node['code']}, 현재: {user_stage})")
+        layer.fill((30, 30, 30))
 
-        # --- [Step 2: 화면 그리기 영역] ---
-        
-        # 1. 배경 그리기
-        if bg_image:
-            screen.blit(bg_image, (0, 0))
+    # 잠긴 노드의 회색 덮개는 한 장만 만들어서 같이 씁니다.
+    lock_overlay = pygame.Surface((NODE_RADIUS * 2, NODE_RADIUS * 2), pygame.SRCALPHA)
+    pygame.draw.circle(lock_overlay, (0, 0, 0, 150), (NODE_RADIUS, NODE_RADIUS), NODE_RADIUS)
+
+    # 2. 노드 위에 상태 및 몬스터 표시
+    for node in nodes:
+        if node["code"] in unlocked:
+            # [A] 열린 노드: 기본 노란 테두리 원 그리기
+            pygame.draw.circle(layer, (255, 255, 0), (node["x"], node["y"]), NODE_RADIUS, 3)
+
+            # 💡 [핵심] 몬스터 아이콘이 잘 로드된 노드라면 그립니다.
+            if node["code"] in monster_images:
+                layer.blit(monster_images[node["code"]], (node["x"] - 30, node["y"] - 30))
+
+            # 이름 표시
+            name_surf = render_text(font, node["name"], (255, 255, 255), background=(0, 0, 0))
         else:
-            screen.fill((30, 30, 30))
+            # [B] 잠긴 노드 처리 (회색 덮개)
+            layer.blit(lock_overlay, (node["x"] - NODE_RADIUS, node["y"] - NODE_RADIUS))
 
-        # 2. 노드 위에 상태 및 몬스터 표시
-        for node in nodes:
-            # 잠금 해제 조건 확인
-            is_unlocked = (str(user_stage) >= node["code"])
-            
-            if is_unlocked:
-                # [A] 열린 노드: 기본 노란 테두리 원 그리기
-                pygame.draw.circle(screen, (255, 255, 0), (node["x"], node["y"]), 40, 3) 
-                
-                # 💡 [핵심] 만약 이 노드가 "11"번(Goblin Trail)이고, 몬스터 이미지가 잘 로드되었다면 그립니다.
-                if node["code"] in monster_images:
-                    img_to_draw = monster_images[node["code"]]
-                    screen.blit(img_to_draw, (node["x"] - 30, node["y"] - 30))
-                
-                # 이름 표시
-                name_surf = font.render(node["name"], True, (255, 255, 255), (0, 0, 0))
-                screen.blit(name_surf, (node["x"] - name_surf.get_width()//2, node["y"] + 45))
-                
+            # 잠긴 곳 이름 (선택사항)
+            name_surf = render_text(locked_font, node["name"] + " (Locked)", (150, 150, 150))
+        layer.blit(name_surf, (node["x"] - name_surf.get_width()//2, node["y"] + 45))
+    return layer
+
+class MapScene(Scene):
+    """월드 맵 화면. 노드를 클릭하면 전투 화면을 위에 올리고(push), 전투가 끝나면 여기로 돌아옵니다."""
+    def __init__(self, user_id, user_nick, user_stage, user_hp, player=None):
+        self.user_id = user_id
+        self.user_nick = user_nick
+        self.user_stage = user_stage
+        self.user_hp = user_hp
+        self.player = player  # 로그인 때 준비해 둔 플레이어 (인장 목록)
+
+    def enter(self):
+        self.font = self.assets.font(20)
+        self.locked_font = self.assets.font(15)
+        
+        # 🌟 1. 유저의 현재 맵(월드) 번호 파악하기
+        # user_stage가 "10", "21" 같은 문자열이라고 가정합니다.
+        current_world = str(self.user_stage)[0] # 첫 번째 글자만 떼어냄 ('1', '2' 등)
+        
+        # --- [Step 1: 이미지 로드 영역] ---
+        # 보관함(AssetContext)에서 꺼내므로, 전투에서 돌아오거나 다시 열 때는 디스크를 읽지 않습니다.
+        # (경로와 크기는 assets.py 의 목록에 있습니다)
+        bg_name = f"map/background/{current_world}"
+        self.bg_image = self.assets.sprite(bg_name) if bg_name in assets.MANIFEST else None
+
+        # 60x60 아이콘을 노드 코드("11", "12")를 열쇠로 바구니에 저장!
+        self.monster_images = {}
+        for code in assets.MONSTER_ICONS.get(current_world, {}):
+            img = self.assets.sprite(f"map/icon/{code}")
+            if img:
+                self.monster_images[code] = img
+
+        # 🌟 3. 맵 번호에 따라 노드(스테이지) 정보 다르게 세팅하기 (클릭 판정 격자도 한 번만)
+        self.current_world = current_world
+        self.nodes = MAP_NODES.get(current_world, [])
+        self.grid = NodeGrid(self.nodes)
+        self.layer_stage = None  # 지금 맵 레이어를 만든 기준 스테이지
+
+        # 🌟 5. 전투 미리 준비: 몬스터 테이블을 백그라운드에서 받아 두고,
+        # 갈 수 있는 스테이지의 전투 배경/몬스터 이미지도 미리 불러 둡니다. (노드 클릭 즉시 전투 시작)
+        monster_cache.prefetch()
+        for node in self.nodes:
+            if is_unlocked(self.user_stage, node["code"]):
+                combat.load_stage_assets(self.assets, node["code"])
+
+    def resume(self, result=None):
+        """
+        전투에서 돌아오면 (CombatScene 의 결과) HP 와 진행 스테이지를 갱신하고 저장 대기열에 넣습니다.
+        DB에는 바로 쓰지 않고 화면 전환 / 주기 / 종료 때 다른 변경과 같이 모아서 저장됩니다.
+        """
+        if not result:
+            return
+        fields = {}
+        if result["hp"] != self.user_hp:
+            self.user_hp = fields["user_hp"] = result["hp"]
+        # 지금 도전 중인 (가장 마지막으로 열린) 스테이지를 깨야 다음 스테이지가 열립니다.
+        if result["won"] and str(result["stage"]) == str(self.user_stage):
+            following = next_stage(self.user_stage)
+            if following:
+                self.user_stage = fields["current_stage"] = following
+        if fields:
+            writeback.queue.update_progress(self.user_id, **fields)
+
+        # 다음 월드로 넘어갔으면 그 월드의 맵 화면으로 바꿉니다. (같은 월드면 draw 때 레이어만 다시 만듦)
+        if str(self.user_stage)[0] != self.current_world:
+            self.manager.replace(MapScene(self.user_id, self.user_nick, self.user_stage, self.user_hp, self.player))
+
+    def refresh_layer(self):
+        """user_stage 가 바뀌었을 때만 열린 노드 / 맵 레이어를 다시 만듭니다. (같은 스테이지면 보관함에서 꺼냄)"""
+        if self.layer_stage == self.user_stage:
+            return
+        self.layer_stage = self.user_stage
+        self.unlocked = {node["code"] for node in self.nodes if is_unlocked(self.user_stage, node["code"])}
+        self.layer = self.assets.get(
+            ("map_layer", self.current_world, str(self.user_stage)),
+            lambda: build_map_layer(self.screen.get_size(), self.bg_image, self.nodes, self.unlocked,
+                                    self.monster_images, self.font, self.locked_font),
+        )
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            node = self.grid.hit(event.pos)
+            if node is None:
+                return
+            self.refresh_layer()
+            # 🌟 4. 열린 노드만 전투 시작 (열림 여부는 레이어를 만들 때 한 번 계산해 둠)
+            if node["code"] in self.unlocked:
+                insignia_list = self.player.insignia_list if self.player else ()
+                self.manager.push(combat.CombatScene(self.user_id, self.user_nick, node["code"], self.user_hp,
+                                                     insignia_list))
             else:
-                # [B] 잠긴 노드 처리 (회색 덮개)
-                s = pygame.Surface((80, 80), pygame.SRCALPHA)   
-                pygame.draw.circle(s, (0, 0, 0, 150), (40, 40), 40) 
-                screen.blit(s, (node["x"]-40, node["y"]-40))
+                print(f"🔒 잠겨있습니다! (필요: {node['code']}, 현재: {self.user_stage})")
+
+    def draw(self, screen):
+        # --- [Step 2: 화면 그리기 영역] ---
+        # 배경/노드/이름은 미리 합쳐 둔 레이어라 화면 전체 blit 한 번이면 끝납니다.
+        self.refresh_layer()
+        screen.blit(self.layer, (0, 0))
+
+# ==========================================
+# 실행 테스트 코드 (클릭 판정: 전부 확인 vs 격자)
+# ==========================================
+if __name__ == "__main__":
+    import random
+    import time
+
+    rng = random.Random(0)
+    for count in (6, 200, 2000):
+        nodes = [{"code": str(i), "x": rng.randrange(1280), "y": rng.randrange(720)} for i in range(count)]
+        grid = NodeGrid(nodes)
+        clicks = [(rng.randrange(1280), rng.randrange(720)) for _ in range(2000)]
 
-                # 잠긴 곳 이름 (선택사항)
-                locked_font = pygame.font.SysFont("malgungothic", 15)
-                name_surf = locked_font.render(node["name"] + " (Locked)", True, (150, 150, 150))
-                screen.blit(name_surf, (node["x"] - name_surf.get_width()//2, node["y"] + 45))
+        start = time.perf_counter()
+        linear = [next((n for n in nodes if ((x - n["x"])**2 + (y - n["y"])**2)**0.5 <= NODE_RADIUS), None)
+                  for x, y in clicks]
+        linear_ms = (time.perf_counter() - start) * 1000
 
-        pygame.display.flip()
\ No newline at end of file
+        start = time.perf_counter()
+        indexed = [grid.hit(pos) for pos in clicks]
+        grid_ms = (time.perf_counter() - start) * 1000
+        same = all(a is b for a, b in zip(linear, indexed))
+        print(f"노드 {count:4d}개, 클릭 2000번: 전부 확인 {linear_ms:.1f}ms / 격자 {grid_ms:.1f}ms | 결과 일치 {same}")
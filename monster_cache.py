@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import db
+import jobs
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 지난 실행 때 받아 둔 monsters 테이블 (다음 실행에서 네트워크 없이 바로 사용)
+SNAPSHOT_PATH = os.path.join(".cache", "monsters.json")
+
+# ==========================================
+# 2. 몬스터 테이블 캐시
+# ==========================================
+class MonsterCache:
+    """
+    monsters 테이블 전체를 한 번에 받아서 stage_code 로 찾을 수 있게 들고 있습니다.
+    - 시작할 때는 디스크 스냅샷으로 바로 채우고 (전투 진입에 네트워크 대기 없음)
+    - 세션마다 한 번 백그라운드에서 테이블 전체를 다시 받고, 내용 해시(version)가 달라졌을 때만 교체/저장합니다.
+    해시는 받은 뒤에 계산하는 변경 감지용이라 다운로드 양은 줄지 않습니다.
+    (monsters 테이블에 updated_at 같은 가벼운 버전 컬럼이 없어서, 줄어드는 건 교체/스냅샷 쓰기뿐입니다)
+    """
+    def __init__(self, snapshot_path: str = SNAPSHOT_PATH):
+        self.snapshot_path = snapshot_path
+        self.version = None       # 현재 데이터의 내용 해시 (변경 감지용)
+        self.refreshed = False    # 이번 세션에 DB에서 최신 데이터를 받았는지
+        self._by_stage: Dict[str, dict] = {}
+        self._snapshot_loaded = False
+        self._refresh_job = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(rows: List[dict]) -> str:
+        return hashlib.sha256(json.dumps(rows, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _replace(self, rows: List[dict], version: str):
+        by_stage = {str(row["stage_code"]): row for row in rows}
+        with self._lock:
+            self._by_stage = by_stage
+            self.version = version
+
+    # ------------------------------------------
+    # 디스크 스냅샷
+    # ------------------------------------------
+    def _load_snapshot(self):
+        if self._snapshot_loaded:
+            return
+        self._snapshot_loaded = True
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if not self.version:  # 이미 DB에서 받은 게 있으면 덮어쓰지 않음
+                self._replace(snapshot["monsters"], snapshot["version"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ 몬스터 스냅샷 읽기 실패 ({self.snapshot_path}): {e}")
+
+    def _save_snapshot(self, rows: List[dict], version: str):
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": version, "monsters": rows}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"⚠️ 몬스터 스냅샷 저장 실패: {e}")
+
+    # ------------------------------------------
+    # DB 에서 다시 받기
+    # ------------------------------------------
+    def refresh(self) -> bool:
+        """
+        (백그라운드 스레드에서 실행) 테이블 전체를 받아 내용이 바뀌었으면 교체합니다. 바뀌었으면 True
+        매번 전체를 받은 뒤 해시로 비교하므로, 바뀌지 않았을 때 아끼는 건 교체와 스냅샷 쓰기입니다.
+        """
+        self._load_snapshot()
+        rows = db.fetch_monsters()
+        version = self.content_hash(rows)
+        changed = version != self.version
+        if changed:
+            self._replace(rows, version)
+            self._save_snapshot(rows, version)
+        self.refreshed = True
+        return changed
+
+    def prefetch(self):
+        """이번 세션에 아직 최신 데이터를 안 받았으면 백그라운드에서 받아 둡니다. (맵 화면을 열 때)"""
+        self._load_snapshot()
+        if self.refreshed or (self._refresh_job and self._refresh_job.pending) or not db.is_configured():
+            return
+        self._refresh_job = jobs.submit(self.refresh, name="monster_refresh")
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def get(self, stage_code) -> Optional[dict]:
+        """캐시에 있으면 몬스터 정보(복사본), 없으면 None. 네트워크를 쓰지 않습니다."""
+        self._load_snapshot()
+        row = self._by_stage.get(str(stage_code))
+        return dict(row) if row else None
+
+    def fetch(self, stage_code) -> Optional[dict]:
+        """(백그라운드 스레드에서 실행) 캐시에 없으면 이번 세션에 한 번만 DB에서 다시 받아 보고 찾습니다."""
+        monster = self.get(stage_code)
+        if monster is None and not self.refreshed:
+            self.refresh()
+            monster = self.get(stage_code)
+        return monster
+
+    def all(self) -> List[dict]:
+        self._load_snapshot()
+        return [dict(row) for _, row in sorted(self._by_stage.items())]
+
+# 게임 전체가 같이 쓰는 캐시
+monsters = MonsterCache()
+
+def get_monster(stage_code) -> Optional[dict]:
+    return monsters.get(stage_code)
+
+def fetch_monster(stage_code) -> Optional[dict]:
+    return monsters.fetch(stage_code)
+
+def prefetch():
+    monsters.prefetch()
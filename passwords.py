@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import bcrypt
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# bcrypt 작업량 (2^rounds 번 반복). 1 올릴 때마다 해시 시간이 2배가 됩니다. (bcrypt.gensalt 기본값 12)
+ROUNDS_ENV = "DEMONS_HAND_BCRYPT_ROUNDS"
+DEFAULT_ROUNDS = 12
+
+# 해시 전용 스레드 (bcrypt 는 계산 중에 GIL 을 놓아서 화면 스레드가 멈추지 않습니다)
+_hash_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bcrypt")
+
+def get_rounds() -> int:
+    try:
+        return int(os.getenv(ROUNDS_ENV, DEFAULT_ROUNDS))
+    except ValueError:
+        return DEFAULT_ROUNDS
+
+# ==========================================
+# 2. 해시 / 확인
+# ==========================================
+def hash_password(password: str, rounds: int = None) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds or get_rounds())).decode("utf-8")
+
+def verify_password(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:  # bcrypt 형식이 아닌 값 (예전 평문 비밀번호 등)
+        return False
+
+def hash_rounds(hashed: str) -> int:
+    """'$2b$12$...' -> 12"""
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+def needs_rehash(hashed: str, rounds: int = None) -> bool:
+    """저장된 해시의 작업량이 지금 설정과 다르면 True (로그인 성공 때 새 설정으로 다시 해시)"""
+    return hash_rounds(hashed) != (rounds or get_rounds())
+
+# ==========================================
+# 3. 백그라운드 실행
+# ==========================================
+def hash_password_async(password: str, rounds: int = None) -> Future:
+    """해시를 해시 전용 스레드에서 시작하고 Future 를 돌려줍니다. (그동안 다른 일 - DB 조회 등 - 을 같이 진행)"""
+    return _hash_pool.submit(hash_password, password, rounds)
+
+def verify_password_async(password: str, hashed: str) -> Future:
+    return _hash_pool.submit(verify_password, password, hashed)
+
+# ==========================================
+# 4. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    import time
+
+    print("=== 🔐 비밀번호 해시 테스트 ===")
+    for rounds in (10, 11, 12):
+        start = time.perf_counter()
+        hashed = hash_password("demon", rounds)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f" - rounds {rounds}: {elapsed:.0f}ms | 확인 {verify_password('demon', hashed)} | "
+              f"다시 해시 필요(설정 {get_rounds()}) {needs_rehash(hashed)}")
+
+    # DB 조회(가짜 0.3초)와 해시를 겹쳐서 실행하면 합이 아니라 둘 중 긴 쪽만큼만 걸립니다.
+    start = time.perf_counter()
+    future = hash_password_async("demon")
+    time.sleep(0.3)
+    future.result()
+    print(f"조회 0.3초 + 해시 동시 실행: {(time.perf_counter() - start) * 1000:.0f}ms")
@@ -0,0 +1,234 @@
+import csv
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+
+import pygame
+
+from text_cache import get_font
+
+# ==========================================
+# 1. 설정
+# ==========================================
+HISTORY_FRAMES = 600            # 통계(p50/p99)에 쓰는 최근 프레임 수
+PHASES = ("events", "update", "draw", "flip", "idle")   # idle: 입력 대기 + FPS 제한으로 쉰 시간
+OVERLAY_KEY = pygame.K_F3       # 성능 표시 켜기/끄기
+EXPORT_KEY = pygame.K_F4        # 지금까지의 기록을 CSV/JSON 으로 저장
+OVERLAY_REFRESH_MS = 250        # 표시를 켜 두었을 때 숫자를 새로 그리는 주기
+OVERLAY_SIZE = (360, 200)
+EXPORT_DIR = os.path.join(".cache", "perf")
+# 값이 있으면 게임을 끌 때 그 경로(.csv / .json)로 기록을 저장합니다.
+EXPORT_ENV = "DEMONS_HAND_PERF_EXPORT"
+
+def percentile(values: List[float], q: float) -> float:
+    """q: 0~100. (정렬해서 가장 가까운 순위의 값)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+# ==========================================
+# 2. 프레임 기록기
+# ==========================================
+class PerfMonitor:
+    """
+    화면 루프(SceneManager.run)가 프레임마다 단계별 시간(events / update / draw / flip / idle)을 보고합니다.
+    - 프레임 시간(work): idle 을 뺀 실제로 일한 시간. p50/p99 는 최근 HISTORY_FRAMES 프레임 기준
+    - 블로킹 I/O: DB 요청, 이미지 읽기처럼 기다리는 호출 수. 화면 스레드에서 불린 것(=프레임을 멈춘 것)은 따로 셉니다.
+    """
+    def __init__(self, history: int = HISTORY_FRAMES):
+        self.frames: Deque[dict] = deque(maxlen=history)
+        self.frame_count = 0
+        self.io_counts: Dict[str, int] = {}       # 종류 -> 전체 호출 수
+        self.io_blocking: Dict[str, int] = {}     # 종류 -> 화면 스레드에서 불린 수
+        self.io_ms: Dict[str, float] = {}         # 종류 -> 걸린 시간 합
+        self.overlay_visible = False
+        # 다른 모듈이 붙이는 추가 기록 (예: dbtrace). 이름 -> overlay_lines() / summary() 가 있는 객체
+        self.sources: Dict[str, object] = {}
+        self._current = self._new_frame()
+        self._frame_start = time.perf_counter()
+        self._last_overlay = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _new_frame() -> dict:
+        frame = {phase: 0.0 for phase in PHASES}
+        frame["io_blocking"] = 0
+        return frame
+
+    # ------------------------------------------
+    # 기록
+    # ------------------------------------------
+    def add(self, phase: str, ms: float):
+        self._current[phase] = self._current.get(phase, 0.0) + ms
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def record_io(self, kind: str, ms: float):
+        """DB 요청 / 파일 읽기 한 번 (어느 스레드에서 불러도 됨)"""
+        on_main = threading.current_thread() is threading.main_thread()
+        with self._lock:
+            self.io_counts[kind] = self.io_counts.get(kind, 0) + 1
+            self.io_ms[kind] = self.io_ms.get(kind, 0.0) + ms
+            if on_main:
+                self.io_blocking[kind] = self.io_blocking.get(kind, 0) + 1
+                self._current["io_blocking"] += 1
+
+    def end_frame(self):
+        now = time.perf_counter()
+        frame = self._current
+        frame["time"] = now
+        frame["total"] = (now - self._frame_start) * 1000
+        frame["work"] = sum(frame[phase] for phase in PHASES if phase != "idle")
+        self.frames.append(frame)
+        self.frame_count += 1
+        self._current = self._new_frame()
+        self._frame_start = now
+
+    # ------------------------------------------
+    # 통계
+    # ------------------------------------------
+    def fps(self) -> float:
+        """최근 1초 동안 돈 프레임 수"""
+        if not self.frames:
+            return 0.0
+        latest = self.frames[-1]["time"]
+        return float(sum(1 for frame in self.frames if latest - frame["time"] < 1.0))
+
+    def summary(self) -> dict:
+        work = [frame["work"] for frame in self.frames]
+        with self._lock:
+            io = {kind: {"count": count, "blocking": self.io_blocking.get(kind, 0),
+                         "avg_ms": round(self.io_ms[kind] / count, 3)}
+                  for kind, count in self.io_counts.items()}
+        return {
+            "frames": self.frame_count,
+            "fps": self.fps(),
+            "frame_ms": {"p50": round(percentile(work, 50), 3), "p99": round(percentile(work, 99), 3),
+                         "max": round(max(work, default=0.0), 3)},
+            "phase_avg_ms": {phase: round(sum(f[phase] for f in self.frames) / max(len(self.frames), 1), 3)
+                             for phase in PHASES},
+            "io": io,
+        }
+
+    # ------------------------------------------
+    # 화면 표시 (F3)
+    # ------------------------------------------
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+
+    def overlay_due(self) -> bool:
+        """표시가 켜져 있고 숫자를 새로 그릴 때가 됐으면 True"""
+        return self.overlay_visible and (time.perf_counter() - self._last_overlay) * 1000 >= OVERLAY_REFRESH_MS
+
+    def overlay_lines(self) -> List[str]:
+        stats = self.summary()
+        phases = stats["phase_avg_ms"]
+        lines = [
+            f"FPS {stats['fps']:.0f} | frame p50 {stats['frame_ms']['p50']:.2f} p99 {stats['frame_ms']['p99']:.2f} ms",
+            f"events {phases['events']:.2f} update {phases['update']:.2f}",
+            f"draw {phases['draw']:.2f} flip {phases['flip']:.2f} idle {phases['idle']:.0f}",
+        ]
+        for kind, io in sorted(stats["io"].items()):
+            lines.append(f"{kind}: {io['count']} calls ({io['blocking']} blocking) avg {io['avg_ms']:.1f}ms")
+        for source in self.sources.values():
+            lines += source.overlay_lines()
+        return lines
+
+    def add_source(self, name: str, source):
+        """표시(F3)와 JSON 저장(F4)에 같이 나올 기록을 붙입니다. source 는 overlay_lines(), summary() 를 가짐"""
+        self.sources[name] = source
+
+    def draw_overlay(self, screen: pygame.Surface, pos=(8, 8)) -> pygame.Rect:
+        """
+        왼쪽 위에 불투명한 고정 크기 패널로 그립니다. (크기가 늘 같아서 바뀐 부분만 그리는 화면에서도 흔적이 안 남음)
+        그린 영역을 반환합니다.
+        """
+        font = get_font(14)
+        panel = pygame.Rect(pos, OVERLAY_SIZE)
+        screen.fill((0, 0, 0), panel)
+        old_clip = screen.get_clip()
+        screen.set_clip(panel)  # 긴 줄이 패널 밖으로 나가지 않게
+        y = panel.y + 4
+        for line in self.overlay_lines():
+            if y + font.get_linesize() > panel.bottom:
+                break
+            # 매번 바뀌는 숫자라 글씨 캐시(render_text)에 넣지 않고 바로 그립니다.
+            screen.blit(font.render(line, True, (120, 255, 120)), (panel.x + 6, y))
+            y += font.get_linesize()
+        screen.set_clip(old_clip)
+        self._last_overlay = time.perf_counter()
+        return panel
+
+    # ------------------------------------------
+    # 저장 (실행끼리 비교용)
+    # ------------------------------------------
+    def export_csv(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        columns = ["frame", "total", "work", *PHASES, "io_blocking"]
+        first = self.frame_count - len(self.frames)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for i, frame in enumerate(self.frames):
+                writer.writerow([first + i] + [round(frame[c], 3) for c in columns[1:]])
+        return path
+
+    def export_json(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            summary = self.summary()
+            summary.update({name: source.summary() for name, source in self.sources.items()})
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        return path
+
+    def export(self, base: Optional[str] = None) -> List[str]:
+        """base.csv (프레임별) + base.json (요약). base 가 없으면 EXPORT_DIR 에 시각으로 이름을 붙입니다."""
+        base = base or os.path.join(EXPORT_DIR, time.strftime("perf-%Y%m%d-%H%M%S"))
+        base = os.path.splitext(base)[0]
+        paths = [self.export_csv(base + ".csv"), self.export_json(base + ".json")]
+        print(f"📊 성능 기록 저장: {', '.join(paths)}")
+        return paths
+
+# 게임 전체가 같이 쓰는 기록기
+monitor = PerfMonitor()
+
+def record_io(kind: str, ms: float):
+    monitor.record_io(kind, ms)
+
+# ==========================================
+# 3. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    import random
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((640, 360))
+
+    rng = random.Random(0)
+    for i in range(300):
+        with monitor.phase("events"):
+            pygame.event.pump()
+        with monitor.phase("draw"):
+            screen.fill((rng.randrange(255), 0, 0))
+            if i % 50 == 0:
+                time.sleep(0.02)   # 가끔 멈추는 프레임 (p99 에 보여야 함)
+        if i % 100 == 0:
+            record_io("db", 30.0)
+        with monitor.phase("flip"):
+            monitor.draw_overlay(screen)
+            pygame.display.flip()
+        monitor.end_frame()
+
+    print("\n".join(monitor.overlay_lines()))
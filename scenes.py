@@ -0,0 +1,232 @@
+import os
+
+import pygame
+
+import assets
+import db
+import jobs
+import perf
+import writeback
+from frame_loop import FrameLoop
+from text_cache import get_font
+
+# ==========================================
+# 1. 공용 에셋 보관함
+# ==========================================
+def image_key(path: str, size=None):
+    return (path, tuple(size) if size else None)
+
+def load_image(path: str, size=None):
+    """
+    크기를 맞춘 이미지 (assets.py 의 메모리/디스크 캐시를 거침). convert 전 상태라 백그라운드 스레드에서 불러도 됨
+    실패하면 None
+    """
+    return assets.load(path, size)
+
+class AssetContext:
+    """
+    모든 화면(Scene)이 같이 쓰는 이미지/폰트 보관함.
+    한 번 불러온 이미지는 화면을 오가도 다시 디스크에서 읽지 않습니다.
+    """
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self._images = {}
+        self._cache = {}
+
+    def image(self, path: str, size=None):
+        """이미지를 (size 가 있으면 그 크기로) 불러옵니다. 실패하면 None (실패도 기억해서 다시 시도하지 않음)"""
+        key = image_key(path, size)
+        if key not in self._images:
+            img = load_image(path, size)
+            self._images[key] = img.convert_alpha() if img else None
+        return self._images[key]
+
+    def sprite(self, name: str):
+        """assets.MANIFEST 에 등록된 이름으로 이미지 꺼내기 (예: "ui/background")"""
+        return self.image(*assets.MANIFEST[name])
+
+    def adopt(self, images: dict):
+        """
+        백그라운드에서 load_image() 로 미리 읽어 둔 {image_key: 이미지} 를 보관함에 넣습니다.
+        (convert_alpha 는 화면 스레드에서만 합니다)
+        """
+        for key, img in images.items():
+            if key not in self._images:
+                self._images[key] = img.convert_alpha() if img else None
+
+    def font(self, size: int, bold: bool = False):
+        return get_font(size, bold)
+
+    def get(self, key, factory):
+        """이미지가 아닌 것(합쳐 둔 배경 레이어 등)도 key 로 한 번만 만들어 둡니다."""
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+def pending_dots(period_ms: int = 300) -> str:
+    """작업을 기다리는 동안 메시지 뒤에 붙일 움직이는 점 (. -> .. -> ...)"""
+    return "." * (1 + pygame.time.get_ticks() // period_ms % 3)
+
+# ==========================================
+# 2. 화면(Scene) 기본 틀
+# ==========================================
+class Scene:
+    """
+    화면 하나 (로그인, 회원가입, 맵, 전투 ...)
+    - enter(): 스택에 처음 올라갈 때 한 번 (에셋 준비)
+    - exit(): 스택에서 빠질 때 한 번
+    - resume(result): 위에 올라갔던 화면이 pop(result) 로 닫혀서 다시 맨 위가 됐을 때
+    - handle_event / update / draw: 매 프레임 (맨 위 화면만)
+    - on_job(job): run_job() 으로 맡긴 백그라운드 작업이 끝났을 때
+    - invalidate(): 화면 위에 다른 것(성능 표시 등)이 그려졌다 지워져서 전체를 다시 그려야 할 때
+    draw() 가 rect 목록을 돌려주면 그 영역만, None 이면 화면 전체를 내보냅니다.
+    animating 이 True 인 동안은 입력이 없어도 목표 FPS 로 계속 돌립니다. (로딩 표시 등)
+    """
+    manager: "SceneManager" = None
+    animating = False
+
+    @property
+    def assets(self) -> AssetContext:
+        return self.manager.assets
+
+    @property
+    def screen(self) -> pygame.Surface:
+        return self.manager.screen
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def resume(self, result=None):
+        pass
+
+    def run_job(self, fn, *args, **kwargs) -> jobs.Job:
+        """fn 을 백그라운드 스레드에서 실행합니다. 끝나면 이 화면의 on_job(job) 이 불립니다."""
+        return jobs.submit(fn, *args, owner=self, **kwargs)
+
+    def on_job(self, job: jobs.Job):
+        pass
+
+    def invalidate(self):
+        """다음 draw() 때 화면 전체를 다시 그리도록 (바뀐 부분만 그리는 화면만 구현하면 됨)"""
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self, screen):
+        return None
+
+# ==========================================
+# 3. 화면 스택 관리자
+# ==========================================
+class SceneManager:
+    """
+    화면들을 스택으로 관리합니다. 맵 -> 전투는 push, 전투 -> 맵은 pop 이라서
+    전투를 몇 번 해도 함수 호출(while 루프)이 겹겹이 쌓이지 않습니다.
+    """
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.assets = AssetContext(screen)
+        self.loop = FrameLoop()
+        self.stack = []
+
+    @property
+    def top(self) -> Scene:
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene: Scene):
+        scene.manager = self
+        self.stack.append(scene)
+        scene.enter()
+        self.loop.request_redraw()
+
+    def _close(self, scene: Scene):
+        jobs.runner.cancel_owned(scene)  # 닫히는 화면이 기다리던 작업은 결과를 버림
+        scene.exit()
+        writeback.queue.flush_async()    # 화면이 바뀔 때 모아 둔 저장 내보내기
+
+    def pop(self, result=None):
+        scene = self.stack.pop()
+        self._close(scene)
+        if self.top:
+            self.top.resume(result)
+        self.loop.request_redraw()
+
+    def replace(self, scene: Scene):
+        """맨 위 화면을 다른 화면으로 바꿉니다. (로그인 -> 맵 처럼 돌아갈 일이 없을 때)"""
+        self._close(self.stack.pop())
+        self.push(scene)
+
+    def quit(self):
+        while self.stack:
+            self._close(self.stack.pop())
+        # 끝나기 전에 남은 저장은 기다렸다가 확실히 내보냅니다.
+        if writeback.queue.pending and db.is_configured():
+            writeback.queue.flush()
+        jobs.runner.shutdown()
+        if os.getenv(perf.EXPORT_ENV):
+            perf.monitor.export(os.getenv(perf.EXPORT_ENV))
+        # 연결 풀/저장소 닫기 (DEMONS_HAND_DB_TRACE 가 있으면 DB 호출 기록도 여기서 저장됨)
+        db.close()
+
+    def _handle_perf_key(self, event) -> bool:
+        """F3: 성능 표시 켜기/끄기, F4: 기록 저장. 처리했으면 True"""
+        if event.type != pygame.KEYDOWN or event.key not in (perf.OVERLAY_KEY, perf.EXPORT_KEY):
+            return False
+        if event.key == perf.OVERLAY_KEY:
+            perf.monitor.toggle_overlay()
+            # 표시를 끄면 그 자리를 화면이 다시 그려야 하므로 전체 다시 그리기
+            if self.top:
+                self.top.invalidate()
+        else:
+            perf.monitor.export()
+        return True
+
+    def run(self):
+        """
+        스택이 빌 때까지 (또는 창을 닫을 때까지) 맨 위 화면을 돌리고, 끝나면 quit() 으로 정리합니다.
+        프레임마다 단계별 시간을 perf.monitor 에 보고합니다.
+        """
+        monitor = perf.monitor
+        while self.stack:
+            events = self.loop.poll()
+            with monitor.phase("events"):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        # 여기서 sys.exit 하지 않고 돌아가야 main 의 종료 처리까지 이어집니다.
+                        self.quit()
+                        return
+                    if event.type == jobs.JOB_DONE:
+                        # 작업 결과는 맡긴 화면에 (아직 스택에 있을 때만) 전달
+                        if event.job.owner in self.stack:
+                            event.job.owner.on_job(event.job)
+                    elif self._handle_perf_key(event):
+                        pass
+                    elif self.top:
+                        self.top.handle_event(event)
+            if not self.top:
+                break
+
+            with monitor.phase("update"):
+                self.top.update()
+                jobs.runner.check_timeouts()
+                writeback.queue.tick()
+                if monitor.overlay_due():
+                    self.loop.request_redraw()
+            # 작업을 기다리는 동안에도 로딩 표시가 움직이도록 계속 돌립니다.
+            self.loop.animating = self.top.animating or jobs.runner.busy
+            with monitor.phase("draw"):
+                rects = self.top.draw(self.screen) if self.loop.dirty else []
+                if monitor.overlay_visible and self.loop.dirty:
+                    panel = monitor.draw_overlay(self.screen)
+                    if rects is not None:
+                        rects = list(rects) + [panel]
+            self.loop.present(rects)
+            monitor.end_frame()
+        self.quit()
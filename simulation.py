@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import random
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from entities import Deck, Insignia, Player
+from evaluation import evaluate_best_hand
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 한 전투의 최대 턴 수 (이 안에 몬스터를 못 잡으면 패배로 처리)
+MAX_TURNS = 30
+# 워커 하나가 한 번에 처리할 게임 수
+DEFAULT_CHUNK_SIZE = 2000
+
+# 정책(policy): (플레이어, 덱, rng) -> 버릴 카드 인덱스 리스트 (None/빈 리스트 = 리롤 안 함)
+# 워커 프로세스로 넘어가야 하므로 모듈 최상단에 정의된 함수여야 합니다.
+Policy = Callable[[Player, Deck, random.Random], Optional[List[int]]]
+
+# ==========================================
+# 2. 플레이어 정책 (Policy)
+# ==========================================
+def keep_policy(player: Player, deck: Deck, rng: random.Random) -> Optional[List[int]]:
+    """리롤하지 않고 처음 받은 패로만 싸웁니다."""
+    return None
+
+def random_policy(player: Player, deck: Deck, rng: random.Random) -> Optional[List[int]]:
+    """절반 확률로 아무 카드나 1~3장 버립니다."""
+    if rng.random() < 0.5:
+        return None
+    return rng.sample(range(len(player.hand)), rng.randint(1, min(3, len(player.hand))))
+
+def advisor_policy(player: Player, deck: Deck, rng: random.Random) -> Optional[List[int]]:
+    """discard_advisor 가 추천하는 기대 점수 최대 조합을 버립니다."""
+    from discard_advisor import best_discard
+    return best_discard(player, deck, rng=np.random.default_rng(rng.getrandbits(64)))
+
+POLICIES: Dict[str, Policy] = {
+    "keep": keep_policy,
+    "random": random_policy,
+    "advisor": advisor_policy,
+}
+# run_simulation 과 명령줄(--policy) 의 기본 정책
+DEFAULT_POLICY = "keep"
+
+# ==========================================
+# 3. 전투 한 판 (Headless Battle)
+# ==========================================
+# 전투 규칙 (combat.py 화면에는 아직 턴 진행이 없으므로 시뮬레이터에서 정의합니다)
+# 1) 턴 시작: 정책이 원하는 만큼 리롤 (Player.max_reroll_count 한도, 전투 전체 공유)
+# 2) 손패에서 가장 좋은 5장으로 공격: 족보 점수 x damage_multiplier 인장
+# 3) 사용한 5장은 버리고 덱에서 다시 채움 (덱이 모자라면 손패를 뺀 새 덱으로 교체)
+# 손패와 덱은 카드 code 배열(카드 한 장당 1바이트)로만 다루므로 게임 하나당 메모리가 아주 작습니다.
+# 4) 몬스터가 살아 있으면 몬스터 공격력만큼 피해, 그 다음 heal 인장만큼 회복
+def _ensure_cards(player: Player, deck: Deck, needed: int):
+    """덱에 needed 장이 없으면 손패에 있는 카드를 뺀 새 덱으로 바꿉니다."""
+    if len(deck) >= needed:
+        return
+    held = set(player.hand)
+    deck.reset()
+    deck.codes = array("B", [code for code in deck.codes if code not in held])
+
+def play_battle(monster: dict, policy: Policy, rng: random.Random, insignia_list: List[Insignia] = (),
+                player_hp: int = 100, max_turns: int = MAX_TURNS):
+    """전투 한 판을 끝까지 진행하고 (승리 여부, 진행한 턴 수, 남은 HP)를 반환합니다."""
+    deck = Deck(rng=rng)
+    player = Player(max_hp=player_hp, compact=True)  # 손패를 code 배열로 (Card 객체/이미지 없이)
+    player.insignia_list = list(insignia_list)
+
+    multiplier = 1.0
+    heal_amount = 0
+    for item in player.insignia_list:
+        if item.effect_type == "damage_multiplier":
+            multiplier *= item.value
+        elif item.effect_type == "heal":
+            heal_amount += int(item.value)
+
+    monster_hp = monster["hp"]
+    player.fill_hand(deck)
+
+    for turn in range(1, max_turns + 1):
+        # 1. 리롤
+        while player.used_reroll_count < player.max_reroll_count:
+            # 정책(advisor)이 보는 덱이 비어 있지 않도록, 손패를 전부 버려도 될 만큼 먼저 채워 둡니다.
+            _ensure_cards(player, deck, player.get_draw_count(0))
+            indices = policy(player, deck, rng)
+            if not indices:
+                break
+            player.discard_cards(list(indices), deck)
+
+        # 2. 공격
+        used_cards, _, score = evaluate_best_hand(player.hand)
+        monster_hp -= score * multiplier
+        if monster_hp <= 0:
+            return True, turn, player.current_hp
+
+        # 3. 사용한 카드 버리고 다시 채우기
+        for card in used_cards:
+            player.hand.remove(card)
+        _ensure_cards(player, deck, player.get_draw_count())
+        player.fill_hand(deck)
+
+        # 4. 몬스터 공격 & 회복
+        player.take_damage(monster["attack"])
+        if not player.is_alive():
+            return False, turn, 0
+        player.heal(heal_amount)
+
+    return False, max_turns, player.current_hp
+
+# ==========================================
+# 4. 통계 모으기
+# ==========================================
+class StageStats:
+    """스테이지 하나의 시뮬레이션 결과"""
+    def __init__(self, stage_code: str):
+        self.stage_code = stage_code
+        self.games = 0
+        self.wins = 0
+        self.turns = Counter()      # 승리한 판의 처치까지 걸린 턴 수 분포
+        self.hp_left = Counter()    # 승리한 판의 남은 HP 분포
+
+    def add(self, won: bool, turns: int, hp_left: int):
+        self.games += 1
+        if won:
+            self.wins += 1
+            self.turns[turns] += 1
+            self.hp_left[hp_left] += 1
+
+    def merge(self, other: "StageStats"):
+        self.games += other.games
+        self.wins += other.wins
+        self.turns.update(other.turns)
+        self.hp_left.update(other.hp_left)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @staticmethod
+    def _percentile(counter: Counter, q: float):
+        total = sum(counter.values())
+        if not total:
+            return None
+        seen = 0
+        for value in sorted(counter):
+            seen += counter[value]
+            if seen >= q * total:
+                return value
+
+    def summary(self) -> dict:
+        return {
+            "stage_code": self.stage_code,
+            "games": self.games,
+            "win_rate": round(self.win_rate, 4),
+            "turns_p50": self._percentile(self.turns, 0.5),
+            "turns_p90": self._percentile(self.turns, 0.9),
+            "hp_left_p10": self._percentile(self.hp_left, 0.1),
+            "hp_left_p50": self._percentile(self.hp_left, 0.5),
+            "turns": dict(sorted(self.turns.items())),
+            "hp_left": dict(sorted(self.hp_left.items())),
+        }
+
+    def __repr__(self):
+        return f"<StageStats: {self.stage_code} {self.wins}/{self.games}>"
+
+# ==========================================
+# 5. 병렬 실행 (ProcessPoolExecutor)
+# ==========================================
+def _run_chunk(monster: dict, policy_name: str, games: int, seed_state: List[int],
+               insignia_list: List[Insignia], player_hp: int) -> StageStats:
+    """워커 프로세스에서 실행: 자기만의 RNG 스트림으로 games 판을 진행합니다."""
+    seed = int(seed_state[0]) << 32 | int(seed_state[1])
+    rng = random.Random(seed)
+
+    policy = POLICIES[policy_name]
+    stats = StageStats(str(monster["stage_code"]))
+    for _ in range(games):
+        stats.add(*play_battle(monster, policy, rng, insignia_list, player_hp))
+    return stats
+
+def run_simulation(monsters: List[dict], games_per_stage: int, policy_name: str = DEFAULT_POLICY,
+                   workers: Optional[int] = None, seed: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   insignia_list: List[Insignia] = (), player_hp: int = 100):
+    """
+    몬스터(스테이지)마다 games_per_stage 판씩 시뮬레이션합니다.
+    반환값: ({stage_code: StageStats}, 걸린 시간(초))
+    """
+    tasks = []
+    for monster in monsters:
+        for start in range(0, games_per_stage, chunk_size):
+            tasks.append((monster, min(chunk_size, games_per_stage - start)))
+
+    # 작업마다 서로 겹치지 않는 RNG 스트림 (같은 seed 면 워커 수와 상관없이 같은 결과)
+    streams = np.random.SeedSequence(seed).spawn(len(tasks))
+
+    results: Dict[str, StageStats] = {}
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_chunk, monster, policy_name, games, stream.generate_state(2).tolist(),
+                        list(insignia_list), player_hp)
+            for (monster, games), stream in zip(tasks, streams)
+        ]
+        for future in futures:
+            stats = future.result()
+            results.setdefault(stats.stage_code, StageStats(stats.stage_code)).merge(stats)
+    return results, time.perf_counter() - start_time
+
+# ==========================================
+# 6. 몬스터 정보 불러오기
+# ==========================================
+def load_monsters(path: Optional[str] = None) -> List[dict]:
+    """JSON 파일(몬스터 리스트)이 있으면 그걸 쓰고, 없으면 Supabase monsters 테이블을 읽습니다."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    import db
+    return db.fetch_monsters()
+
+# ==========================================
+# 7. 실행
+# ==========================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="악마의 패 전투 몬테카를로 시뮬레이터")
+    parser.add_argument("--games", type=int, default=10000, help="스테이지마다 진행할 게임 수")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default=DEFAULT_POLICY)
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--monsters", help="몬스터 JSON 파일 (없으면 Supabase 에서 읽음)")
+    parser.add_argument("--out", help="결과를 저장할 JSON 파일")
+    args = parser.parse_args()
+
+    monsters = load_monsters(args.monsters)
+    print(f"=== ⚔️ 전투 시뮬레이션: 몬스터 {len(monsters)}종 x {args.games}판 (정책: {args.policy}) ===")
+
+    results, elapsed = run_simulation(monsters, args.games, args.policy, args.workers, args.seed)
+
+    for stage_code, stats in sorted(results.items()):
+        summary = stats.summary()
+        print(f" - 스테이지 {stage_code}: 승률 {summary['win_rate'] * 100:5.1f}% | "
+              f"처치 턴 p50 {summary['turns_p50']} / p90 {summary['turns_p90']} | "
+              f"남은 HP p10 {summary['hp_left_p10']} / p50 {summary['hp_left_p50']}")
+
+    total_games = sum(stats.games for stats in results.values())
+    print(f"총 {total_games}판, {elapsed:.2f}초 ({total_games / elapsed:,.0f} 판/초, 워커 {args.workers or os.cpu_count()}개)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump([stats.summary() for stats in results.values()], f, ensure_ascii=False, indent=2)
@@ -0,0 +1,317 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+import db
+from db import InventoryItemRow, InventoryRow, ItemRow, MonsterRow, UserRow
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# DEMONS_HAND_STORAGE=sqlite 이면 네트워크 없이 로컬 SQLite 파일을 씁니다. (기본: supabase)
+STORAGE_ENV = db.STORAGE_ENV
+SQLITE_PATH_ENV = "DEMONS_HAND_SQLITE_PATH"
+DEFAULT_SQLITE_PATH = os.path.join(".cache", "demons_hand.db")
+
+# ==========================================
+# 2. 저장소 인터페이스
+# ==========================================
+class Storage(ABC):
+    """users / monsters / items / inventory 를 다루는 저장소. 게임 코드는 이 함수들만 씁니다. (db.py 를 통해)"""
+
+    # users
+    @abstractmethod
+    def fetch_user(self, user_id: str) -> Optional[UserRow]: ...
+
+    @abstractmethod
+    def insert_user(self, row: UserRow) -> List[UserRow]: ...
+
+    @abstractmethod
+    def update_user(self, user_id: str, fields: UserRow) -> List[UserRow]: ...
+
+    # monsters
+    @abstractmethod
+    def fetch_monster(self, stage_code: str) -> Optional[MonsterRow]: ...
+
+    @abstractmethod
+    def fetch_monsters(self) -> List[MonsterRow]: ...
+
+    # items
+    @abstractmethod
+    def fetch_items(self, rarities: Optional[List[str]] = None) -> List[ItemRow]: ...
+
+    def fetch_items_by_rarity(self, rarity: str) -> List[ItemRow]:
+        return self.fetch_items([rarity])
+
+    # inventory
+    @abstractmethod
+    def fetch_inventory(self, user_id: int) -> List[InventoryItemRow]: ...
+
+    @abstractmethod
+    def insert_inventory_rows(self, rows: List[InventoryRow]) -> List[InventoryRow]: ...
+
+    @abstractmethod
+    def upsert_inventory_rows(self, rows: List[InventoryRow]) -> List[InventoryRow]:
+        """(user_id_int, item_id) 가 이미 있으면 is_equipped 만 바꿉니다. (같은 줄을 다시 보내도 한 줄)"""
+
+    @abstractmethod
+    def update_equipped(self, user_id: int, item_ids: List[int], is_equipped: bool) -> List[InventoryRow]: ...
+
+    def close(self):
+        pass
+
+# ==========================================
+# 3. Supabase 저장소 (실제 서버)
+# ==========================================
+class SupabaseStorage(Storage):
+    """db.get_client() 의 공용 클라이언트(연결 풀 하나)로 Supabase 테이블을 읽고 씁니다."""
+
+    def fetch_user(self, user_id):
+        data = db.get_client().table("users").select("*").eq("user_id", user_id).execute().data
+        return data[0] if data else None
+
+    def insert_user(self, row):
+        return db.get_client().table("users").insert(row).execute().data
+
+    def update_user(self, user_id, fields):
+        return db.get_client().table("users").update(fields).eq("user_id", user_id).execute().data
+
+    def fetch_monster(self, stage_code):
+        data = db.get_client().table("monsters").select("*").eq("stage_code", str(stage_code)).execute().data
+        return data[0] if data else None
+
+    def fetch_monsters(self):
+        return db.get_client().table("monsters").select("*").order("stage_code").execute().data
+
+    def fetch_items(self, rarities=None):
+        query = db.get_client().table("items").select("*")
+        if rarities:
+            query = query.in_("rarity", list(rarities))
+        return query.execute().data
+
+    def fetch_items_by_rarity(self, rarity):
+        return db.get_client().table("items").select("*").eq("rarity", rarity).execute().data
+
+    def fetch_inventory(self, user_id):
+        # items(*) : inventory.item_id 로 연결된 아이템 정보를 같은 요청에 붙여서 받음
+        return db.get_client().table("inventory").select("*, items(*)").eq("user_id_int", user_id).execute().data
+
+    def insert_inventory_rows(self, rows):
+        return db.get_client().table("inventory").insert(list(rows)).execute().data
+
+    def upsert_inventory_rows(self, rows):
+        # 서버의 inventory 에 (user_id_int, item_id) unique 제약이 있어야 합니다.
+        return (db.get_client().table("inventory")
+                .upsert(list(rows), on_conflict="user_id_int,item_id").execute().data)
+
+    def update_equipped(self, user_id, item_ids, is_equipped):
+        return (db.get_client().table("inventory").update({"is_equipped": is_equipped})
+                .eq("user_id_int", user_id).in_("item_id", list(item_ids)).execute().data)
+
+# ==========================================
+# 4. SQLite 저장소 (오프라인 / 벤치마크용)
+# ==========================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id       TEXT PRIMARY KEY,
+    password      TEXT NOT NULL,
+    nickname      TEXT,
+    current_stage TEXT DEFAULT '00',
+    user_hp       INTEGER DEFAULT 100
+);
+CREATE TABLE IF NOT EXISTS monsters (
+    stage_code TEXT NOT NULL,
+    name       TEXT,
+    hp         INTEGER,
+    attack     INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_monsters_stage_code ON monsters (stage_code);
+CREATE TABLE IF NOT EXISTS items (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT,
+    rarity      TEXT,
+    price       INTEGER,
+    description TEXT,
+    effect_type TEXT,
+    value       REAL
+);
+CREATE INDEX IF NOT EXISTS idx_items_rarity ON items (rarity);
+CREATE TABLE IF NOT EXISTS inventory (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id_int INTEGER NOT NULL,
+    item_id     INTEGER NOT NULL,
+    is_equipped INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_inventory_user_id ON inventory (user_id_int, item_id);
+"""
+
+class SQLiteStorage(Storage):
+    """
+    Supabase 와 같은 테이블/같은 함수를 로컬 SQLite 로 흉내 냅니다.
+    user_id, stage_code, rarity 에 인덱스가 있어서 조회가 전체 검색이 되지 않습니다.
+    백그라운드 작업(jobs) 스레드에서도 불리므로 연결 하나를 잠금으로 보호합니다.
+    """
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[dict]:
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, tuple(params)).fetchall()]
+
+    def _write(self, sql: str, rows: List[tuple]):
+        with self._lock, self.conn:
+            self.conn.executemany(sql, rows)
+
+    @staticmethod
+    def _placeholders(values) -> str:
+        return ", ".join("?" for _ in values)
+
+    # users
+    def fetch_user(self, user_id):
+        # Supabase users 의 숫자 id 대신 rowid 를 씁니다. (inventory.user_id_int 와 짝)
+        rows = self._query("SELECT rowid AS id, * FROM users WHERE user_id = ?", (user_id,))
+        return rows[0] if rows else None
+
+    def insert_user(self, row):
+        columns = list(row)
+        try:
+            self._write(f"INSERT INTO users ({', '.join(columns)}) VALUES ({self._placeholders(columns)})",
+                        [tuple(row[c] for c in columns)])
+        except sqlite3.IntegrityError as e:
+            # createaccount.register_user 가 Supabase 와 같은 문구로 중복 아이디를 알아봅니다.
+            raise ValueError(f"duplicate key value violates unique constraint: {e}") from e
+        return [dict(row)]
+
+    def update_user(self, user_id, fields):
+        columns = list(fields)
+        self._write(f"UPDATE users SET {', '.join(f'{c} = ?' for c in columns)} WHERE user_id = ?",
+                    [tuple(fields[c] for c in columns) + (user_id,)])
+        user = self.fetch_user(user_id)
+        return [user] if user else []
+
+    # monsters
+    def fetch_monster(self, stage_code):
+        rows = self._query("SELECT * FROM monsters WHERE stage_code = ? LIMIT 1", (str(stage_code),))
+        return rows[0] if rows else None
+
+    def fetch_monsters(self):
+        return self._query("SELECT * FROM monsters ORDER BY stage_code")
+
+    # items
+    def fetch_items(self, rarities=None):
+        if not rarities:
+            return self._query("SELECT * FROM items")
+        return self._query(f"SELECT * FROM items WHERE rarity IN ({self._placeholders(rarities)})", rarities)
+
+    # inventory
+    def fetch_inventory(self, user_id):
+        rows = self._query("SELECT inventory.*, items.id AS _item_id, items.name, items.rarity, items.price, "
+                           "items.description, items.effect_type, items.value "
+                           "FROM inventory LEFT JOIN items ON items.id = inventory.item_id "
+                           "WHERE inventory.user_id_int = ?", (user_id,))
+        inventory = []
+        for row in rows:
+            # Supabase 의 select("*, items(*)") 와 같은 모양 (아이템 정보는 "items" 안에)
+            item_keys = ("name", "rarity", "price", "description", "effect_type", "value")
+            item = {"id": row.pop("_item_id"), **{key: row.pop(key) for key in item_keys}}
+            row["is_equipped"] = bool(row["is_equipped"])
+            row["items"] = item if item["id"] is not None else None
+            inventory.append(row)
+        return inventory
+
+    def insert_inventory_rows(self, rows):
+        rows = list(rows)
+        self._write("INSERT INTO inventory (user_id_int, item_id, is_equipped) VALUES (?, ?, ?)",
+                    [(r["user_id_int"], r["item_id"], int(r.get("is_equipped", False))) for r in rows])
+        return rows
+
+    def upsert_inventory_rows(self, rows):
+        rows = list(rows)
+        # 있으면 UPDATE, 없으면 INSERT 를 한 트랜잭션으로 (idx_inventory_user_id 로 찾음)
+        with self._lock, self.conn:
+            for r in rows:
+                params = (int(r.get("is_equipped", False)), r["user_id_int"], r["item_id"])
+                updated = self.conn.execute("UPDATE inventory SET is_equipped = ? WHERE user_id_int = ? AND item_id = ?",
+                                            params).rowcount
+                if not updated:
+                    self.conn.execute("INSERT INTO inventory (is_equipped, user_id_int, item_id) VALUES (?, ?, ?)", params)
+        return rows
+
+    def update_equipped(self, user_id, item_ids, is_equipped):
+        item_ids = list(item_ids)
+        self._write(f"UPDATE inventory SET is_equipped = ? WHERE user_id_int = ? AND item_id IN ({self._placeholders(item_ids)})",
+                    [(int(is_equipped), user_id, *item_ids)])
+        return self._query(f"SELECT * FROM inventory WHERE user_id_int = ? AND item_id IN ({self._placeholders(item_ids)})",
+                           (user_id, *item_ids))
+
+    # 오프라인 데이터 채우기
+    def import_rows(self, table: str, rows: List[dict]):
+        """다른 저장소(예: Supabase)에서 받아 온 행들을 그대로 넣습니다. (모르는 칸은 무시)"""
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        for row in rows:
+            keys = [c for c in columns if c in row]
+            self._write(f"INSERT OR REPLACE INTO {table} ({', '.join(keys)}) VALUES ({self._placeholders(keys)})",
+                        [tuple(row[c] for c in keys)])
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# ==========================================
+# 5. 환경 변수로 저장소 고르기
+# ==========================================
+def backend_name() -> str:
+    return os.getenv(STORAGE_ENV, "supabase").lower()
+
+def create_storage(name: Optional[str] = None) -> Storage:
+    name = (name or backend_name()).lower()
+    if name == "sqlite":
+        return SQLiteStorage(os.getenv(SQLITE_PATH_ENV, DEFAULT_SQLITE_PATH))
+    if name == "supabase":
+        return SupabaseStorage()
+    raise ValueError(f"❌ 알 수 없는 저장소입니다: {name} (supabase 또는 sqlite)")
+
+# ==========================================
+# 6. 실행 테스트 코드 (조회 속도 비교)
+# ==========================================
+if __name__ == "__main__":
+    import argparse
+    import statistics
+
+    parser = argparse.ArgumentParser(description="저장소 조회 속도 측정")
+    parser.add_argument("--backend", choices=["sqlite", "supabase"], default="sqlite")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    store = SQLiteStorage(":memory:") if args.backend == "sqlite" else SupabaseStorage()
+    if args.backend == "sqlite":
+        # 가짜 데이터: 유저 1만 명, 스테이지 30개, 아이템 300개
+        store.import_rows("users", [{"user_id": f"user{i}", "password": "x", "nickname": f"n{i}"} for i in range(10_000)])
+        store.import_rows("monsters", [{"stage_code": f"{w}{s}", "name": f"m{w}{s}", "hp": 50 * w + s, "attack": w + s}
+                                       for w in range(1, 4) for s in range(1, 11)])
+        store.import_rows("items", [{"id": i, "name": f"item{i}", "rarity": ["일반", "희귀", "전설"][i % 3], "price": i}
+                                    for i in range(300)])
+
+    checks = {
+        "fetch_user": lambda: store.fetch_user("user5000"),
+        "fetch_monster": lambda: store.fetch_monster("25"),
+        "fetch_monsters": store.fetch_monsters,
+        "fetch_items(3 rarities)": lambda: store.fetch_items(["일반", "희귀", "전설"]),
+    }
+    print(f"=== 🗄️ 저장소 조회 속도 ({args.backend}, {args.repeat}회) ===")
+    for name, fn in checks.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f" - {name:24s} p50 {statistics.median(timings):.3f}ms | max {max(timings):.3f}ms")
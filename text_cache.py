@@ -0,0 +1,136 @@
+from collections import OrderedDict
+
+import pygame
+
+# ==========================================
+# 1. 설정
+# ==========================================
+DEFAULT_FONT_NAME = "malgungothic"
+# 기억해 둘 글씨 Surface 최대 개수 (넘으면 가장 오래 안 쓴 것부터 버림)
+TEXT_CACHE_SIZE = 256
+# 숫자 아틀라스에 미리 그려 둘 글자 (HP, 공격력처럼 자주 바뀌는 숫자용)
+NUMBER_GLYPHS = "0123456789 +-/%"
+
+_fonts = {}
+_text_cache = OrderedDict()
+_number_atlases = {}
+
+# ==========================================
+# 2. 폰트 레지스트리
+# ==========================================
+def get_font(size: int, bold: bool = False, name: str = DEFAULT_FONT_NAME) -> pygame.font.Font:
+    """같은 (이름, 크기, 굵기) 폰트는 한 번만 만들고 계속 재사용합니다. (SysFont 는 시스템 폰트 검색이라 느림)"""
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+# ==========================================
+# 3. 글씨 Surface 캐시 (LRU)
+# ==========================================
+def render_text(font: pygame.font.Font, text: str, color, antialias: bool = True, background=None) -> pygame.Surface:
+    """font.render 와 같지만, 한 번 그린 (폰트, 글자, 색, 안티앨리어싱, 배경색) 조합은 다시 그리지 않습니다."""
+    key = (font, text, tuple(color), antialias, tuple(background) if background else None)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _text_cache.move_to_end(key)
+        return surf
+
+    surf = font.render(text, antialias, color, background)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
+
+# ==========================================
+# 4. 숫자 글리프 아틀라스
+# ==========================================
+class NumberAtlas:
+    """
+    숫자 글자(0~9 등)를 한 장의 Surface 에 미리 그려 두고, 숫자를 표시할 때는 글자 조각만 이어 붙입니다.
+    HP처럼 값이 계속 바뀌어도 font.render 를 다시 부르지 않습니다.
+    """
+    def __init__(self, font: pygame.font.Font, color, antialias: bool = True):
+        glyphs = [font.render(ch, antialias, color) for ch in NUMBER_GLYPHS]
+        self.height = max(g.get_height() for g in glyphs)
+        self.surface = pygame.Surface((sum(g.get_width() for g in glyphs), self.height), pygame.SRCALPHA)
+
+        self.rects = {}  # 글자 -> 아틀라스 안의 영역
+        x = 0
+        for ch, glyph in zip(NUMBER_GLYPHS, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self.rects[ch] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()  # 화면 픽셀 형식에 맞춰 두면 blit 이 빨라짐
+
+    def width(self, text: str) -> int:
+        return sum(self.rects[ch].w for ch in text)
+
+    def draw(self, surface: pygame.Surface, text: str, pos) -> pygame.Rect:
+        """text 를 pos(왼쪽 위)부터 그리고, 그린 영역을 반환합니다."""
+        x, y = pos
+        pieces = []
+        for ch in text:
+            rect = self.rects[ch]
+            pieces.append((self.surface, (x, y), rect))
+            x += rect.w
+        surface.blits(pieces, doreturn=False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+def get_number_atlas(font: pygame.font.Font, color, antialias: bool = True) -> NumberAtlas:
+    key = (font, tuple(color), antialias)
+    atlas = _number_atlases.get(key)
+    if atlas is None:
+        atlas = _number_atlases[key] = NumberAtlas(font, color, antialias)
+    return atlas
+
+def blit_number(surface: pygame.Surface, font: pygame.font.Font, value, color, pos, align: str = "left") -> pygame.Rect:
+    """
+    숫자(또는 NUMBER_GLYPHS 로만 된 문자열)를 아틀라스로 그립니다.
+    align="right" 이면 pos 의 x 가 글씨의 오른쪽 끝이 됩니다.
+    아틀라스에 없는 글자가 섞여 있으면 (12.5, None 등) render_text 로 그립니다.
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # 80.0 -> "80"
+    text = str(value)
+    atlas = get_number_atlas(font, color)
+    x, y = pos
+    if not all(ch in atlas.rects for ch in text):
+        image = render_text(font, text, color)
+        if align == "right":
+            x -= image.get_width()
+        return surface.blit(image, (x, y))
+    if align == "right":
+        x -= atlas.width(text)
+    return atlas.draw(surface, text, (x, y))
+
+def clear_text_cache():
+    """글씨 캐시를 비웁니다. (폰트 레지스트리는 그대로)"""
+    _text_cache.clear()
+    _number_atlases.clear()
+
+# ==========================================
+# 5. 실행 테스트 코드
+# ==========================================
+if __name__ == "__main__":
+    import time
+
+    pygame.init()
+    screen = pygame.display.set_mode((400, 100))
+    font = get_font(35, bold=True)
+    print(f"폰트 재사용: {get_font(35, bold=True) is font}")
+    print(f"글씨 캐시 재사용: {render_text(font, 'LOGIN', (255, 255, 255)) is render_text(font, 'LOGIN', (255, 255, 255))}")
+
+    frames = 2000
+    start = time.perf_counter()
+    for hp in range(frames):
+        screen.blit(font.render(str(hp), True, (80, 255, 80)), (0, 0))
+    render_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for hp in range(frames):
+        blit_number(screen, font, hp, (80, 255, 80), (0, 0))
+    atlas_ms = (time.perf_counter() - start) * 1000
+    print(f"숫자 {frames}번 그리기: font.render {render_ms:.1f}ms / 아틀라스 {atlas_ms:.1f}ms")
@@ -1,8 +1,13 @@
 import pygame
-import sys
-import bcrypt
-from login import supabase 
+import assets
+import bootstrap
+import db
+import jobs
+import passwords
+import game
 import ui_createaccount
+from scenes import Scene, pending_dots
+from text_cache import render_text
 
 # ==========================================
 # 색상 및 폰트 설정 (전역 변수로 뺌)
@@ -14,116 +19,143 @@ COLOR_BTN = (100, 30, 30)
 COLOR_SIGNUP = (40, 60, 100)
 COLOR_ACTIVE = (180, 180, 200)
 
-def show_login_window(screen):
+def rehash_later(user_id, user_pw):
+    """bcrypt 작업량 설정이 바뀌었으면 로그인을 기다리게 하지 않고 뒤에서 다시 해시해 저장합니다."""
+    def save(future):
+        if future.exception() is None:
+            # 비밀번호 해시는 저장 대기열(journal 파일)에 남기지 않고 바로 DB에 씁니다.
+            jobs.submit(db.update_user, user_id, {"password": future.result()}, name="password_rehash")
+    passwords.hash_password_async(user_pw).add_done_callback(save)
+
+def check_login(user_id, user_pw):
     """
-    로그인 화면을 실행하고, 성공 시 유저 정보를 반환하는 함수
+    (백그라운드 스레드에서 실행) DB에서 유저를 찾고 비밀번호를 확인합니다.
+    성공하면 (유저 정보, ""), 실패하면 (None, 안내 메시지)를 반환합니다.
     """
-    # 폰트 설정 (함수 안에서 초기화)
-    font = pygame.font.SysFont("malgungothic", 30)
-    small_font = pygame.font.SysFont("malgungothic", 20)
-    
-    # 화면 크기 가져오기
-    WIDTH, HEIGHT = screen.get_size()
-
-    try:
-        bg_image = pygame.image.load("assets/DH_bg.png")
-        # 화면 크기에 딱 맞게 이미지 사이즈 조절
-        bg_image = pygame.transform.scale(bg_image, (WIDTH, HEIGHT))
-    except Exception as e:
-        print(f"배경 로드 실패: {e}")
-        bg_image = None
-
-    # 입력창 위치 설정
-    id_box = pygame.Rect(WIDTH//2 - 100, 300, 200, 45)
-    pw_box = pygame.Rect(WIDTH//2 - 100, 380, 200, 45)
-    login_btn = pygame.Rect(WIDTH//2 - 100, 450, 200, 50)
-    signup_btn = pygame.Rect(WIDTH//2 - 100, 530, 200, 50)
-
-    # 변수 초기화
-    user_id = ""
-    user_pw = ""
-    login_message = ""
-    active_field = "id"
-
-    # ==========================================
-    # 로그인 루프 시작
-    # ==========================================
-    running = True
-    while running:
-        # [A] 이벤트 체크
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if id_box.collidepoint(event.pos):
-                    active_field = "id"
-                elif pw_box.collidepoint(event.pos):
-                    active_field = "pw"
-                elif login_btn.collidepoint(event.pos):
-                    # --- 로그인 시도 ---
-                    login_message = "서버 연결 확인 중..."
-                    # 화면을 한번 그려서 메시지를 보여줌 (반응성 향상)
-                    draw_login_screen(screen, font, small_font, id_box, pw_box, login_btn, signup_btn, user_id, user_pw, login_message, active_field, bg_image)
-                    pygame.display.flip()
-
-                    try:
-                        response = supabase.table("users").select("*").eq("user_id", user_id).execute()
+    user_data = db.fetch_user(user_id)
+
+    if user_data:
+        stored_hashed_pw = user_data['password'] # DB에 저장된 암호화된 비밀번호
+
+        # 🌟 2. bcrypt 로 입력한 비번과 DB의 암호화된 비번이 맞는지 확인합니다.
+        # (확인에는 DB에 저장된 해시의 salt 가 필요해서 조회가 끝난 뒤에만 할 수 있습니다)
+        if passwords.verify_password(user_pw, stored_hashed_pw):
+            print(">> 로그인 성공!")
+            if passwords.needs_rehash(stored_hashed_pw):
+                rehash_later(user_id, user_pw)
+            del user_data['password']
+            return user_data, ""
+        else:
+            print(">> 로그인 실패: 비밀번호가 틀렸습니다.")
+            return None, "비밀번호가 틀렸습니다."
+    else:
+        print(">> 로그인 실패: 존재하지 않는 아이디입니다.")
+        return None, "존재하지 않는 아이디입니다."
+
+class LoginScene(Scene):
+    """
+    로그인 화면. 로그인에 성공하면 게임(맵) 화면으로 바뀝니다.
+    """
+    def enter(self):
+        # 폰트 설정 (공용 폰트 레지스트리에서 가져옴)
+        self.font = self.assets.font(30)
+        self.small_font = self.assets.font(20)
         
-                        if len(response.data) > 0:
-                            user_data = response.data[0]
-                            stored_hashed_pw = user_data['password'] # DB에 저장된 암호화된 비밀번호
-            
-            # 🌟 2. bcrypt.checkpw 로 입력한 비번과 DB의 암호화된 비번이 맞는지 확인합니다.
-                            if bcrypt.checkpw(user_pw.encode('utf-8'), stored_hashed_pw.encode('utf-8')):
-                                print(">> 로그인 성공!")
-                                del user_data['password']
-                                # 로그인 성공 시 유저 정보를 반환합니다 (비밀번호는 제외)
-                                return user_data
-                            else:
-                                print(">> 로그인 실패: 비밀번호가 틀렸습니다.")
-                                return False, None
-                        else:
-                            print(">> 로그인 실패: 존재하지 않는 아이디입니다.")
-                            return False, None
-                    except Exception as e:
-                        login_message = f"에러 발생: {e}"
-
-                elif signup_btn.collidepoint(event.pos):
-                    print(">> 회원가입 화면으로 이동합니다.")
-                    # createaccount.py 안에 있는 회원가입 화면 함수를 실행합니다.
-                    try:
-                        result =ui_createaccount.show_signup_window(screen)
-                        # 회원가입이 끝나고 돌아오면 안내 메시지 출력
-                        if result == "success":
-                            login_message = "✨ 회원가입 성공! 이제 로그인해 주세요."
-                        elif result == "cancel":
-                            login_message = "회원가입을 취소했습니다."
-                        else:
-                            login_message = ""
-                    except Exception as e:
-                        login_message = "회원가입 화면을 불러올 수 없습니다."
-                        print(f"회원가입 에러: {e}")    
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_BACKSPACE:
-                    if active_field == "id": user_id = user_id[:-1]
-                    else: user_pw = user_pw[:-1]
-                elif event.key == pygame.K_TAB:
-                    active_field = "pw" if active_field == "id" else "id"
-                elif event.key == pygame.K_RETURN: # 엔터키 치면 로그인 버튼 클릭과 동일 효과
-                     # (여기서 로그인 로직 중복이라 생략, 버튼 클릭 유도)
-                     pass
-                else:
-                    if active_field == "id": user_id += event.unicode
-                    else: user_pw += event.unicode
-
-        # [B] 화면 그리기 (별도 함수 혹은 여기서 처리)
-        draw_login_screen(screen, font, small_font, id_box, pw_box, login_btn, signup_btn, user_id, user_pw, login_message, active_field, bg_image)
-
-        # [C] 화면 업데이트
-        pygame.display.flip()
+        # 화면 크기 가져오기
+        WIDTH, HEIGHT = self.screen.get_size()
+
+        # 화면 크기에 맞춘 배경 (assets.py 목록의 "ui/background", 한 번 불러오면 보관함에 남아 있음)
+        self.bg_image = self.assets.sprite("ui/background")
+        # 아이디/비밀번호를 치는 동안 맵/전투/카드 이미지를 백그라운드에서 미리 불러 둡니다.
+        assets.preload_async()
+
+        # 입력창 위치 설정
+        self.id_box = pygame.Rect(WIDTH//2 - 100, 300, 200, 45)
+        self.pw_box = pygame.Rect(WIDTH//2 - 100, 380, 200, 45)
+        self.login_btn = pygame.Rect(WIDTH//2 - 100, 450, 200, 50)
+        self.signup_btn = pygame.Rect(WIDTH//2 - 100, 530, 200, 50)
+
+        # 변수 초기화
+        self.user_id = ""
+        self.user_pw = ""
+        self.login_message = ""
+        self.active_field = "id"
+        self.login_job = None
+        self.boot_job = None
+
+    def resume(self, result=None):
+        # 회원가입이 끝나고 돌아오면 안내 메시지 출력
+        if result == "success":
+            self.login_message = "✨ 회원가입 성공! 이제 로그인해 주세요."
+        elif result == "cancel":
+            self.login_message = "회원가입을 취소했습니다."
+        else:
+            self.login_message = ""
+
+    def try_login(self):
+        # --- 로그인 시도 (백그라운드에서 실행, 그동안 화면은 계속 그려짐) ---
+        if self.busy:
+            return
+        self.boot_job = None
+        self.login_job = self.run_job(check_login, self.user_id, self.user_pw, name="login")
+
+    @property
+    def busy(self):
+        return any(job and job.pending for job in (self.login_job, self.boot_job))
+
+    def update(self):
+        # 서버 응답을 기다리는 동안 "확인 중..." 의 점을 움직입니다.
+        if self.busy:
+            label = "게임 준비 중" if self.boot_job else "서버 연결 확인 중"
+            message = label + pending_dots()
+            if message != self.login_message:
+                self.login_message = message
+                self.manager.loop.request_redraw()
+
+    def on_job(self, job):
+        if job.ok and job is self.boot_job:
+            # 인벤토리/몬스터/맵 이미지가 모두 준비되면 게임을 시작합니다
+            game.start_game(self.manager, job.result)
+        elif job.ok:
+            user_data, self.login_message = job.result
+            if user_data:
+                # 로그인 성공 시 유저 정보(비밀번호 제외)로 게임 준비를 한 번에(동시에) 시작합니다
+                self.boot_job = self.run_job(bootstrap.bootstrap_session, user_data, name="bootstrap")
+        elif job.status == "timeout":
+            self.login_message = "서버 응답이 없습니다. 다시 시도해 주세요."
+        else:
+            self.login_message = f"에러 발생: {job.error}"
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self.id_box.collidepoint(event.pos):
+                self.active_field = "id"
+            elif self.pw_box.collidepoint(event.pos):
+                self.active_field = "pw"
+            elif self.login_btn.collidepoint(event.pos):
+                self.try_login()
+
+            elif self.signup_btn.collidepoint(event.pos):
+                print(">> 회원가입 화면으로 이동합니다.")
+                # 회원가입 화면을 위에 올립니다. 끝나면 resume() 으로 결과가 돌아옵니다.
+                self.manager.push(ui_createaccount.SignupScene())
+
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_BACKSPACE:
+                if self.active_field == "id": self.user_id = self.user_id[:-1]
+                else: self.user_pw = self.user_pw[:-1]
+            elif event.key == pygame.K_TAB:
+                self.active_field = "pw" if self.active_field == "id" else "id"
+            elif event.key == pygame.K_RETURN: # 엔터키 치면 로그인 버튼 클릭과 동일 효과
+                 # (여기서 로그인 로직 중복이라 생략, 버튼 클릭 유도)
+                 pass
+            else:
+                if self.active_field == "id": self.user_id += event.unicode
+                else: self.user_pw += event.unicode
+
+    def draw(self, screen):
+        draw_login_screen(screen, self.font, self.small_font, self.id_box, self.pw_box, self.login_btn, self.signup_btn,
+                          self.user_id, self.user_pw, self.login_message, self.active_field, self.bg_image)
 
 def draw_login_screen(screen, font, small_font, id_box, pw_box, login_btn, signup_btn, user_id, user_pw, login_message, active_field, bg_image):
     """화면 그리는 코드를 깔끔하게 분리"""
@@ -145,21 +177,21 @@ def draw_login_screen(screen, font, small_font, id_box, pw_box, login_btn, signu
 
     # 버튼
     pygame.draw.rect(screen, COLOR_BTN, login_btn, border_radius=10)
-    btn_text = font.render("LOGIN", True, COLOR_TEXT)
+    btn_text = render_text(font, "LOGIN", COLOR_TEXT)
     screen.blit(btn_text, (login_btn.centerx - btn_text.get_width()//2, login_btn.centery - btn_text.get_height()//2))
 
     pygame.draw.rect(screen, COLOR_SIGNUP, signup_btn, border_radius=10)
-    signup_text = font.render("SIGN UP", True, COLOR_TEXT)
+    signup_text = render_text(font, "SIGN UP", COLOR_TEXT)
     screen.blit(signup_text, (signup_btn.centerx - signup_text.get_width()//2, signup_btn.centery - signup_text.get_height()//2))
 
     # 텍스트 내용
-    id_surf = font.render(user_id, True, COLOR_TEXT)
+    id_surf = render_text(font, user_id, COLOR_TEXT)
     screen.blit(id_surf, (id_box.x + 10, id_box.y + 5))
     
     pw_display = "*" * len(user_pw)
-    pw_surf = font.render(pw_display, True, COLOR_TEXT)
+    pw_surf = render_text(font, pw_display, COLOR_TEXT)
     screen.blit(pw_surf, (pw_box.x + 10, pw_box.y + 5))
 
     # 메시지
-    msg_surf = small_font.render(login_message, True, (255, 200, 100))
+    msg_surf = render_text(small_font, login_message, (255, 200, 100))
     screen.blit(msg_surf, (WIDTH//2 - msg_surf.get_width()//2, 550))
\ No newline at end of file
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import db
+import jobs
+
+# ==========================================
+# 1. 설정
+# ==========================================
+# 아직 DB에 못 쓴 변경 사항 기록 (게임이 갑자기 꺼져도 다음 실행 때 이어서 저장)
+JOURNAL_PATH = os.path.join(".cache", "writeback.jsonl")
+# 모아 둔 변경 사항을 DB에 내보내는 주기 (초)
+FLUSH_INTERVAL = 5.0
+# journal 파일(평문)에 남기면 안 되는 users 칸 (이 칸들은 대기열을 거치지 않고 바로 DB에 씁니다)
+CREDENTIAL_FIELDS = ("password",)
+
+# ==========================================
+# 2. 나중에 모아서 쓰기 (Write-Behind)
+# ==========================================
+class WriteBehindQueue:
+    """
+    인벤토리 추가, 장착 변경, 진행 상황(스테이지/HP) 저장을 바로 DB에 쓰지 않고 모아 둡니다.
+    - 같은 대상에 대한 변경은 합쳐집니다. (HP를 10번 바꿔도 마지막 값 1번만 저장)
+    - flush() 때 종류별로 묶어서 요청 몇 번으로 내보냅니다. (인벤토리는 (유저, 아이템) 기준 upsert)
+    - 모든 변경은 먼저 journal 파일에 한 줄씩 적어 두므로, 저장 전에 꺼져도 recover() 로 살릴 수 있습니다.
+      저장 도중에 꺼져서 이미 서버에 들어간 줄을 다시 보내도 upsert 라서 두 번 들어가지 않습니다.
+    """
+    def __init__(self, journal_path: str = JOURNAL_PATH, flush_interval: float = FLUSH_INTERVAL):
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.flush_count = 0   # DB에 보낸 요청 수 (통계용)
+        self._inserts: List[dict] = []                        # 새 인벤토리 줄 ((유저, 아이템)마다 한 줄)
+        self._equips: Dict[Tuple[int, int], bool] = {}        # (유저, 아이템) -> 장착 여부
+        self._progress: Dict[str, dict] = {}                  # 유저 -> 바뀐 칸들
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_job = None
+
+    # ------------------------------------------
+    # 변경 사항 쌓기
+    # ------------------------------------------
+    def _apply(self, op: dict):
+        kind = op["op"]
+        if kind == "inventory":
+            # 같은 (유저, 아이템)이 이미 대기 중이면 그 줄을 덮어씀 (upsert 요청 한 번에 같은 키가 두 번 들어가면 안 됨)
+            for row in self._inserts:
+                if row["user_id_int"] == op["user_id"] and row["item_id"] == op["item_id"]:
+                    row["is_equipped"] = op["is_equipped"]
+                    return
+            self._inserts.append({"user_id_int": op["user_id"], "item_id": op["item_id"],
+                                  "is_equipped": op["is_equipped"]})
+        elif kind == "equip":
+            # 아직 안 보낸 새 아이템이면 그 줄의 값만 바꾸면 됨 (요청 0번)
+            for row in self._inserts:
+                if row["user_id_int"] == op["user_id"] and row["item_id"] == op["item_id"]:
+                    row["is_equipped"] = op["is_equipped"]
+                    return
+            self._equips[(op["user_id"], op["item_id"])] = op["is_equipped"]
+        elif kind == "progress":
+            # 예전 journal 에 남아 있던 비밀번호 해시는 버립니다. (다음 journal 정리 때 파일에서도 지워짐)
+            fields = {k: v for k, v in op["fields"].items() if k not in CREDENTIAL_FIELDS}
+            if fields:
+                self._progress.setdefault(op["user_id"], {}).update(fields)
+
+    def _record(self, op: dict):
+        with self._lock:
+            self._apply(op)
+            self._append_journal([op])
+
+    def add_inventory(self, user_id: int, item_id: int, is_equipped: bool = False):
+        self._record({"op": "inventory", "user_id": user_id, "item_id": item_id, "is_equipped": is_equipped})
+
+    def set_equipped(self, user_id: int, item_id: int, is_equipped: bool):
+        self._record({"op": "equip", "user_id": user_id, "item_id": item_id, "is_equipped": is_equipped})
+
+    def update_progress(self, user_id: str, **fields):
+        """예: update_progress(user_id, current_stage="12", user_hp=80)"""
+        if set(fields) & set(CREDENTIAL_FIELDS):
+            raise ValueError(f"{CREDENTIAL_FIELDS} 는 저장 대기열로 쓰지 말고 db.update_user 로 바로 쓰세요.")
+        self._record({"op": "progress", "user_id": user_id, "fields": fields})
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._inserts or self._equips or self._progress)
+
+    # ------------------------------------------
+    # journal 파일
+    # ------------------------------------------
+    def _append_journal(self, ops: List[dict]):
+        try:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                for op in ops:
+                    f.write(json.dumps(op, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️ 저장 대기 기록 실패: {e}")
+
+    def _pending_ops(self) -> List[dict]:
+        """지금 모여 있는 변경 사항을 journal 한 줄짜리들로 (정리된 형태)"""
+        ops = [{"op": "inventory", "user_id": row["user_id_int"], "item_id": row["item_id"],
+                "is_equipped": row["is_equipped"]} for row in self._inserts]
+        ops += [{"op": "equip", "user_id": user_id, "item_id": item_id, "is_equipped": value}
+                for (user_id, item_id), value in self._equips.items()]
+        ops += [{"op": "progress", "user_id": user_id, "fields": fields}
+                for user_id, fields in self._progress.items()]
+        return ops
+
+    def _rewrite_journal(self):
+        """저장이 끝난 뒤, 아직 남은 변경 사항만 journal 에 다시 씁니다."""
+        try:
+            if self.pending:
+                tmp_path = self.journal_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for op in self._pending_ops():
+                        f.write(json.dumps(op, ensure_ascii=False) + "\n")
+                os.replace(tmp_path, self.journal_path)
+            elif os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        except OSError as e:
+            print(f"⚠️ 저장 대기 기록 정리 실패: {e}")
+
+    def recover(self) -> int:
+        """지난번에 저장하지 못하고 꺼진 변경 사항을 journal 에서 다시 읽어 옵니다. 읽은 줄 수 반환"""
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+
+        count = 0
+        with self._lock:
+            for line in lines:
+                try:
+                    self._apply(json.loads(line))
+                    count += 1
+                except (ValueError, KeyError):
+                    pass  # 꺼지면서 반쯤 쓰인 마지막 줄
+            # 읽은 내용을 정리된 형태로 다시 씁니다. (버린 줄 - 비밀번호 해시 등 - 이 파일에 남지 않게)
+            self._rewrite_journal()
+        if count:
+            print(f"💾 저장하지 못한 변경 사항 {count}건을 복구했습니다.")
+        return count
+
+    # ------------------------------------------
+    # DB 로 내보내기
+    # ------------------------------------------
+    def flush(self) -> int:
+        """모아 둔 변경 사항을 묶어서 DB에 씁니다. 보낸 요청 수를 반환합니다. (실패하면 다음에 다시 시도)"""
+        with self._flush_lock:
+            with self._lock:
+                inserts, equips, progress = self._inserts, self._equips, self._progress
+                self._inserts, self._equips, self._progress = [], {}, {}
+            self.last_flush = time.monotonic()
+            if not (inserts or equips or progress):
+                return 0
+
+            # 장착 변경은 (유저, 장착 여부)가 같은 것끼리 묶어서 요청 1번
+            equip_groups: Dict[Tuple[int, bool], List[int]] = {}
+            for (user_id, item_id), value in equips.items():
+                equip_groups.setdefault((user_id, value), []).append(item_id)
+
+            requests = 0
+            try:
+                if inserts:
+                    db.upsert_inventory_rows(inserts)
+                    requests += 1
+                    inserts = []
+                for (user_id, value), item_ids in list(equip_groups.items()):
+                    db.update_equipped(user_id, item_ids, value)
+                    requests += 1
+                    for item_id in item_ids:
+                        equips.pop((user_id, item_id))
+                for user_id, fields in list(progress.items()):
+                    db.update_user(user_id, fields)
+                    requests += 1
+                    progress.pop(user_id)
+            except Exception as e:
+                print(f"❌ 저장 실패 (다음에 다시 시도): {e}")
+                with self._lock:
+                    # 못 보낸 것들을 되돌려 놓되, 그 사이에 들어온 더 새로운 값이 이깁니다.
+                    self._inserts = inserts + self._inserts
+                    self._equips = {**equips, **self._equips}
+                    for user_id, fields in progress.items():
+                        self._progress[user_id] = {**fields, **self._progress.get(user_id, {})}
+
+            self.flush_count += requests
+            with self._lock:
+                self._rewrite_journal()
+            return requests
+
+    def flush_async(self):
+        """화면 전환 때처럼 기다리지 않고 백그라운드에서 내보냅니다."""
+        if not self.pending or (self._flush_job and self._flush_job.pending):
+            return
+        if not db.is_configured():
+            # 오프라인이면 다음 주기까지 다시 확인하지 않습니다. (is_configured 는 .env 를 읽으므로 매 프레임 부르면 안 됨)
+            self.last_flush = time.monotonic()
+            return
+        self._flush_job = jobs.submit(self.flush, name="writeback_flush")
+
+    def tick(self):
+        """화면 루프에서 매 프레임 호출: 주기가 됐으면 백그라운드 저장"""
+        if self.pending and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush_async()
+
+# 게임 전체가 같이 쓰는 저장 대기열
+queue = WriteBehindQueue()